@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
-import statistics
 from dataclasses import dataclass
 from typing import Dict, Any, List, Tuple
 import os, yaml, requests  # <-- add requests here
 from fpl_client import FPLClient, SnapshotClient
+from cache import SharedCache
+import models
+import priors as tier_priors
+from features import POS_BASELINES, build_fixtures_index, compute_strength_means, get_current_event, strength_scalar
+from fixture_model import fit_outcomes
 
 # ---------- config ----------
 def load_config() -> dict:
@@ -23,6 +27,17 @@ config = load_config()
 TEAM_ID       = config["team_id"]
 HORIZON       = config["horizon"]
 SNAPSHOT_DIR  = config.get("snapshot_dir", None)
+CACHE_PATH    = config.get("cache_path", None)   # shared with planner.py runs
+CACHE_TTL     = config.get("cache_ttl", 900)
+# projection model(s) by name (see models.py) and the knobs they share with planner.py
+ADVISOR_MODELS = config.get("advisor_models", "form")
+PROJECTION_WORKERS = config.get("projection_workers", None)   # ensemble processes; default one per CPU
+REGRESSION_FACTOR = config.get("regression_factor", 0.5)
+MIN_BASELINE  = config.get("min_baseline", 2.0)
+MINUTES_WINDOW = config.get("minutes_window", 6)
+P60_FLOOR     = config.get("p60_floor", 0.4)
+FIXTURE_MODEL = config.get("fixture_model", "outcomes")
+PRIORS_PATH   = config.get("priors_path", None)   # read if planner.py has stored this season's priors
 
 # NEW: optional auth + headers from config (for pre-deadline access)
 AUTH_HEADER   = config.get("auth_header", "")   # put your "Bearer eyJ..." string in config.yaml
@@ -53,47 +68,26 @@ class PlayerProj:
     exp_points: float
     starter: bool
 
-def get_current_event(bootstrap: Dict[str, Any]) -> int:
-    for e in bootstrap["events"]:
-        if e.get("is_current") or (not e.get("is_finished") and not e.get("is_previous")):
-            return e["id"]
-    return max(e["id"] for e in bootstrap["events"] if not e.get("is_finished", False))
-
-def recent_points_ppA(history: List[Dict[str,Any]], n:int=6) -> float:
-    recent = [h for h in history[-n:] if h.get("minutes",0)>0]
-    if not recent: return 0.0
-    pts = [h.get("total_points",0) for h in recent]
-    return statistics.mean(pts)
-
-def fixture_difficulty_scalar(fixt: Dict[str,Any], player_team:int) -> float:
-    diff = fixt.get("team_h_difficulty",3) if fixt["team_h"]==player_team else fixt.get("team_a_difficulty",3)
-    return 1.1 if diff<=2 else (1.0 if diff==3 else 0.9)
-
-def chance_to_play_scalar(player: Dict[str,Any]) -> float:
-    if player.get("chance_of_playing_next_round") is not None:
-        return max(0.0, min(1.0, player["chance_of_playing_next_round"]/100.0))
-    status = player.get("status","a")
-    return 1.0 if status=="a" else (0.75 if status=="d" else (0.25 if status=="f" else 0.0))
-
-def build_team_fixture_index(fixtures:List[Dict[str,Any]])->Dict[int,List[Dict[str,Any]]]:
-    by_team={}
-    for f in fixtures:
-        for t in (f["team_h"], f["team_a"]):
-            by_team.setdefault(t, []).append(f)
-    for t in by_team:
-        by_team[t].sort(key=lambda x: (x.get("kickoff_time") or ""))
-    return by_team
-
-def project_player_points(client, player:Dict[str,Any], horizon:int, team_fixtures_by_team:Dict[int,List[Dict[str,Any]]]) -> float:
-    summ = client.element_summary(player["id"])
-    hist = summ.get("history", [])
-    base_ppA = recent_points_ppA(hist, n=6) or float(player.get("form") or 0.0)
-    minutes_s = chance_to_play_scalar(player)
-    upcoming = [f for f in team_fixtures_by_team.get(player["team"],[]) if f.get("event") is not None][:horizon] or []
-    exp=0.0
-    for f in upcoming:
-        exp += base_ppA * fixture_difficulty_scalar(f, player["team"]) * minutes_s
-    return exp or (base_ppA * minutes_s)
+def project_squad(client, bootstrap, squad:List[Dict[str,Any]], fixtures, gw_range:List[int]) -> List[float]:
+    """Horizon xPts per squad player from the configured model(s), one batch over the squad."""
+    teams = bootstrap["teams"]
+    teams_by_id, means = {t["id"]: t for t in teams}, compute_strength_means(teams)
+    outcomes = fit_outcomes(fixtures, teams) if FIXTURE_MODEL == "outcomes" else None
+    tiers, _ = tier_priors.load(PRIORS_PATH) if PRIORS_PATH else (None, None)
+    if tiers is not None and tiers.season != tier_priors.season_label(bootstrap):
+        tiers = None
+
+    def prior(e):
+        pos = e.get("element_type", 4)
+        if tiers is not None and pos in tiers.edges:
+            return tiers.lookup(pos, (e.get("now_cost") or 0) / 10.0)
+        return POS_BASELINES.get(pos, 3.5)
+
+    f = models.build_features(client, squad, build_fixtures_index(fixtures), gw_range,
+                              lambda fx, e: strength_scalar(fx, e, teams_by_id, means, outcomes),
+                              prior, MINUTES_WINDOW, P60_FLOOR)
+    ens = models.build(ADVISOR_MODELS, regression=REGRESSION_FACTOR, min_baseline=MIN_BASELINE)
+    return models.project(ens, f, PROJECTION_WORKERS).sum(1).tolist()
 
 def suggest_captain_and_bench(projs:List[PlayerProj]) -> Tuple[PlayerProj, List[PlayerProj]]:
     starters=[p for p in projs if p.starter]
@@ -103,51 +97,57 @@ def suggest_captain_and_bench(projs:List[PlayerProj]) -> Tuple[PlayerProj, List[
     return captain, bench
 
 # ---------- main ----------
+def build_client(snapshot_dir):
+    # BUILD THE CLIENT:
+    # - If you set snapshot_dir in config, we use offline snapshot data.
+    # - Otherwise we use live API, and (optionally) pass your auth token + headers.
+    if snapshot_dir:
+        return SnapshotClient(snapshot_dir)
+    return FPLClient(
+        auth_header=AUTH_HEADER,   # <-- carries your "x-api-authorization: Bearer …"
+        user_agent=USER_AGENT,
+        referer=REFERER,
+        cache=SharedCache(CACHE_PATH, ttl=CACHE_TTL) if CACHE_PATH else None,
+    )
+
 def main():
     # Use config values (no argparse)
     snapshot_dir = SNAPSHOT_DIR
     team_id = TEAM_ID
     horizon = HORIZON
 
-    # BUILD THE CLIENT:
-    # - If you set snapshot_dir in config, we use offline snapshot data.
-    # - Otherwise we use live API, and (optionally) pass your auth token + headers.
-    if snapshot_dir:
-        client = SnapshotClient(snapshot_dir)
-    else:
-        client = FPLClient(
-            auth_header=AUTH_HEADER,   # <-- carries your "x-api-authorization: Bearer …"
-            user_agent=USER_AGENT,
-            referer=REFERER,
-        )
+    client = build_client(snapshot_dir)
 
     bootstrap = client.bootstrap()
     fixtures = client.fixtures()
-    team_fixt_idx = build_team_fixture_index(fixtures)
     event_id = get_current_event(bootstrap)
     entry = client.entry(team_id)
 
     # FETCH PICKS with a PRE-DEADLINE FALLBACK:
     # Try public picks; if they 404/401/403 before the deadline and you provided an auth token,
     # fall back to your private /api/my-team/{entry}/ squad.
+    # (picks may come from the last finished GW; the projection stays on event_id)
     try:
-        event_id, picks = resolve_picks_with_fallback(client, bootstrap, team_id, event_id)
+        picks_event, picks = resolve_picks_with_fallback(client, bootstrap, team_id, event_id)
     except requests.HTTPError as e:
         status = getattr(e.response, "status_code", None)
         if AUTH_HEADER and status in (401, 403, 404):
             my = client.my_team(team_id)
-            picks = {"picks": my["picks"], "active_chip": my.get("active_chip")}
+            picks_event, picks = event_id, {"picks": my["picks"], "active_chip": my.get("active_chip")}
         else:
             raise
 
     elements={e["id"]:e for e in bootstrap["elements"]}
     team_by_id={t["id"]:t for t in bootstrap["teams"]}
 
+    events_sorted = sorted(e["id"] for e in bootstrap["events"])
+    gw_range = [ev for ev in events_sorted if ev >= event_id][:horizon]
+    squad = [elements[p["element"]] for p in picks["picks"]]
+    xpts = project_squad(client, bootstrap, squad, fixtures, gw_range)
+
     projs: List[PlayerProj]=[]
-    for p in picks["picks"]:
-        el=elements[p["element"]]
+    for p, el, exp in zip(picks["picks"], squad, xpts):
         is_starter = p.get("position",0)<=11
-        exp = project_player_points(client, el, horizon, team_fixt_idx)
         projs.append(PlayerProj(id=el["id"], name=el["web_name"], pos=el["element_type"], team=el["team"], cost=el["now_cost"]/10.0, exp_points=exp, starter=is_starter))
 
     captain, bench = suggest_captain_and_bench(projs)
@@ -157,7 +157,8 @@ def main():
         return f"{p.name:<20} {POS_INV[p.pos]:<3} £{p.cost:>4.1f}  xPts:{p.exp_points:>5.2f}  Club:{team_by_id[p.team]['short_name']}"
 
     print(f"\nFPL Bot Lite – Advisor for Team {team_id}")
-    print(f"Using GW {event_id} | Horizon {horizon} | Bank: £{bank:.1f}m\n")
+    picks_note = f" (picks from GW {picks_event})" if picks_event != event_id else ""
+    print(f"Using GW {event_id}{picks_note} | Horizon {horizon} | Bank: £{bank:.1f}m\n")
 
     starters = sorted([p for p in projs if p.starter], key=lambda x: x.exp_points, reverse=True)
     print("Starters (sorted by projected points):")
@@ -0,0 +1,144 @@
+"""
+Shared on-disk response cache for FPLClient.
+
+One SQLite file (WAL mode) is shared by every process on the machine, so an
+advisor run, a planner run and any number of what-if runs reuse the same
+bootstrap-static / fixtures / element-summary responses.
+
+Fetches are single-flight: the first caller for a URL takes a lease row in
+`inflight` and performs the request; every other caller (thread or process)
+polls until the response lands instead of issuing its own. If the leader
+fails, its lease is dropped and a waiter takes over; if the leader dies, the
+lease expires after `lease` seconds. A leader whose fetch retries (see
+FPLClient) calls `renew` before each retry, so `lease` only has to cover
+one attempt and its wait, not the whole retry budget.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    body       TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inflight (
+    key        TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    started_at REAL NOT NULL
+);
+"""
+
+
+def _owner_prefix() -> str:
+    return f"{os.getpid()}:{threading.get_ident()}:"
+
+
+class SharedCache:
+    def __init__(self, path: str, ttl: float = 900.0, lease: float = 60.0, poll: float = 0.05):
+        self.path = path
+        self.ttl = ttl
+        self.lease = lease
+        self.poll = poll
+        self._local = threading.local()
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        with self._conn() as c:
+            c.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared across threads (or forks)
+        c = getattr(self._local, "conn", None)
+        if c is None or getattr(self._local, "pid", None) != os.getpid():
+            c = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = c, os.getpid()
+        return c
+
+    # ---------- reads ----------
+    def _lookup(self, key: str, ttl: float):
+        row = self._conn().execute(
+            "SELECT body, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row and time.time() - row[1] <= ttl:
+            return True, json.loads(row[0])
+        return False, None
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Cached body if younger than ttl, else None."""
+        return self._lookup(key, self.ttl if ttl is None else ttl)[1]
+
+    def put(self, key: str, value: Any) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO responses (key, body, fetched_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time()),
+        )
+
+    # ---------- single-flight ----------
+    def _claim(self, key: str, owner: str, ttl: float) -> Optional[bool]:
+        """
+        Atomically: if a fresh response exists -> None (caller re-reads);
+        if nobody (or a stale owner) holds the lease -> take it, True;
+        otherwise someone else is fetching -> False.
+        """
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = c.execute("SELECT fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[0] <= ttl:
+                return None
+            lease = c.execute("SELECT started_at FROM inflight WHERE key = ?", (key,)).fetchone()
+            if lease and now - lease[0] <= self.lease:
+                return False
+            c.execute("INSERT OR REPLACE INTO inflight (key, owner, started_at) VALUES (?, ?, ?)",
+                      (key, owner, now))
+            return True
+        finally:
+            c.execute("COMMIT")
+
+    def _release(self, key: str, owner: str, value: Any = None, ok: bool = False) -> None:
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            if ok:
+                c.execute("INSERT OR REPLACE INTO responses (key, body, fetched_at) VALUES (?, ?, ?)",
+                          (key, json.dumps(value), time.time()))
+            c.execute("DELETE FROM inflight WHERE key = ? AND owner = ?", (key, owner))
+        finally:
+            c.execute("COMMIT")
+
+    def renew(self, key: str) -> None:
+        """Restart the lease the calling thread holds on key (a leader still retrying its fetch)."""
+        prefix = _owner_prefix()
+        self._conn().execute(
+            "UPDATE inflight SET started_at = ? WHERE key = ? AND substr(owner, 1, ?) = ?",
+            (time.time(), key, len(prefix), prefix),
+        )
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return a fresh cached body for key, fetching it at most once across processes."""
+        ttl = self.ttl if ttl is None else ttl
+        owner = f"{_owner_prefix()}{uuid.uuid4().hex[:8]}"
+        while True:
+            found, value = self._lookup(key, ttl)
+            if found:
+                return value
+            claimed = self._claim(key, owner, ttl)
+            if claimed is None:
+                continue
+            if claimed:
+                try:
+                    value = fetch()
+                except BaseException:
+                    self._release(key, owner)
+                    raise
+                self._release(key, owner, value, ok=True)
+                return value
+            time.sleep(self.poll)
@@ -0,0 +1,192 @@
+"""
+Whole-season chip timing.
+
+Builds a team x GW fixture-count matrix once, values each chip in every
+remaining GW from per-GW projections, then searches the assignment of
+Wildcard / Free Hit / Bench Boost / Triple Captain to distinct weeks that
+maximises total expected gain.
+
+Chip values per GW (g):
+  BB(g) = bench xPts of the squad that week
+  TC(g) = the captain's xPts (the extra multiplier)
+  FH(g) = best affordable one-week XI from the player pool - squad XI
+  WC(g) = XI gain over `wc_horizon` weeks from a squad rebuilt at g;
+          BB/TC/FH in those weeks are then valued against the new squad
+
+Search: for a fixed WC week, the optimal distinct-week assignment of the
+other three chips only ever uses each chip's top-3 weeks, so it is brute
+forced over 4^3 combinations (top weeks or unplayed). Every allowed WC week
+is tried (one greedy squad per week; G <= 38), so the best WC week is never
+cut off and all of them are ranked in best_weeks.
+"""
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lineup import xi_values
+
+CHIPS = ("wildcard", "freehit", "bboost", "3xc")
+CHIP_LABELS = {"wildcard": "Wildcard", "freehit": "Free Hit", "bboost": "Bench Boost", "3xc": "Triple Captain"}
+SQUAD_QUOTA = {1: 2, 2: 5, 3: 5, 4: 3}
+MAX_PER_CLUB = 3
+
+
+def fixture_count_matrix(fixtures: List[dict], team_ids: Sequence[int], events: Sequence[int]) -> np.ndarray:
+    """teams x GWs matrix of fixture counts (0 = blank, 2+ = double)."""
+    t_idx = {t: i for i, t in enumerate(team_ids)}
+    e_idx = {e: j for j, e in enumerate(events)}
+    counts = np.zeros((len(team_ids), len(events)), dtype=np.int16)
+    for f in fixtures:
+        j = e_idx.get(f.get("event"))
+        if j is None:
+            continue
+        for t in (f["team_h"], f["team_a"]):
+            i = t_idx.get(t)
+            if i is not None:
+                counts[i, j] += 1
+    return counts
+
+
+def pick_squad(score: np.ndarray, pos: np.ndarray, team: np.ndarray, cost: np.ndarray,
+               budget: float) -> np.ndarray:
+    """Greedy 15-man squad by score under budget, quotas and the 3-per-club rule."""
+    left = dict(SQUAD_QUOTA)
+    cheapest = {p: float(cost[pos == p].min()) if np.any(pos == p) else 0.0 for p in left}
+    clubs: Dict[int, int] = {}
+    spent = 0.0
+    chosen = []
+    for i in np.argsort(-score, kind="stable"):
+        p = int(pos[i])
+        if left.get(p, 0) == 0 or clubs.get(int(team[i]), 0) >= MAX_PER_CLUB:
+            continue
+        reserve = sum(n * cheapest[q] for q, n in left.items()) - cheapest[p]
+        if spent + cost[i] + reserve > budget + 1e-6:
+            continue
+        chosen.append(i)
+        spent += float(cost[i])
+        left[p] -= 1
+        clubs[int(team[i])] = clubs.get(int(team[i]), 0) + 1
+        if not any(left.values()):
+            break
+    return np.array(chosen, dtype=np.int64)
+
+
+@dataclass
+class ChipPlan:
+    events: List[int]
+    assignments: Dict[str, Tuple[int, float]]          # chip -> (GW, EV gain)
+    total_ev: float
+    best_weeks: Dict[str, List[Tuple[int, float]]]    # chip -> top weeks (no interactions)
+    dgw_teams: Dict[int, List[int]] = field(default_factory=dict)
+    bgw_teams: Dict[int, List[int]] = field(default_factory=dict)
+
+
+def _top_weeks(v: np.ndarray, k: int) -> List[int]:
+    return [int(j) for j in np.argsort(-v, kind="stable")[:k]]
+
+
+def _assign_rest(values: Dict[str, np.ndarray], blocked: Optional[int], min_ev: float) -> Tuple[float, Dict[str, int]]:
+    """Best distinct-week assignment for non-WC chips (each may stay unplayed)."""
+    chips = list(values)
+    k = len(chips)
+    options = []
+    for c in chips:
+        v = values[c]
+        opts = [j for j in _top_weeks(v, k + 1) if j != blocked and v[j] >= min_ev][:k]
+        options.append([None] + opts)
+    best, best_map = 0.0, {}
+    for combo in product(*options):
+        used = [j for j in combo if j is not None]
+        if len(used) != len(set(used)):
+            continue
+        total = sum(values[c][j] for c, j in zip(chips, combo) if j is not None)
+        if total > best:
+            best, best_map = total, {c: j for c, j in zip(chips, combo) if j is not None}
+    return best, best_map
+
+
+def plan_chips(
+    events: Sequence[int],
+    squad_x: np.ndarray, squad_pos: np.ndarray, squad_cost: np.ndarray, bank: float,
+    pool_x: np.ndarray, pool_pos: np.ndarray, pool_team: np.ndarray, pool_cost: np.ndarray,
+    chips: Iterable[str] = CHIPS,
+    wc_horizon: int = 6,
+    min_ev: float = 0.0,
+    blacklist: Iterable[int] = (),
+    counts: Optional[np.ndarray] = None,
+    team_ids: Optional[Sequence[int]] = None,
+) -> ChipPlan:
+    """
+    events: remaining GW ids (columns of squad_x / pool_x)
+    squad_*: the current 15 (xPts matrix, positions, prices in £m)
+    pool_*: candidate players for Free Hit / Wildcard squads
+    counts/team_ids: optional fixture-count matrix for DGW/BGW annotation
+    """
+    events = list(events)
+    G = len(events)
+    chips = [c for c in chips if c in CHIPS]
+    budget = float(squad_cost.sum()) + bank
+    allowed = np.ones(G, dtype=bool)
+    for gw in blacklist:
+        if gw in events:
+            allowed[events.index(gw)] = False
+
+    xi, bench, cap = xi_values(squad_x, squad_pos)
+
+    # Free Hit: best one-week squad per GW
+    fh_xi = np.zeros(G)
+    for j in range(G):
+        sq = pick_squad(pool_x[:, j], pool_pos, pool_team, pool_cost, budget)
+        fh_xi[j] = xi_values(pool_x[sq][:, [j]], pool_pos[sq])[0][0]
+
+    def masked(v):
+        return np.where(allowed, v, -np.inf)
+
+    rest_chips = [c for c in chips if c != "wildcard"]
+    base_vals = {"freehit": fh_xi - xi, "bboost": bench, "3xc": cap}
+    best_weeks = {c: [(events[j], float(base_vals[c][j])) for j in _top_weeks(masked(base_vals[c]), 3)]
+                  for c in rest_chips}
+
+    def assign(vals, blocked):
+        total, picks = _assign_rest({c: masked(v) for c, v in vals.items()}, blocked, min_ev)
+        return total, {c: (events[g], float(vals[c][g])) for c, g in picks.items()}
+
+    # No wildcard
+    best_total, assignments = assign(base_vals, None)
+
+    if "wildcard" in chips:
+        wc_vals = []
+        for j in np.flatnonzero(allowed):
+            w = slice(j, min(G, j + wc_horizon))
+            sq = pick_squad(pool_x[:, w].sum(1), pool_pos, pool_team, pool_cost, budget)
+            wxi, wbench, wcap = xi_values(pool_x[sq][:, w], pool_pos[sq])
+            wc_gain = float(np.sum(wxi - xi[w]))
+            wc_vals.append((events[j], wc_gain))
+            if wc_gain < min_ev:
+                continue
+            vals = {c: base_vals[c].copy() for c in rest_chips}
+            if "freehit" in vals:
+                vals["freehit"][w] = fh_xi[w] - wxi
+            if "bboost" in vals:
+                vals["bboost"][w] = wbench
+            if "3xc" in vals:
+                vals["3xc"][w] = wcap
+            rest, rest_map = assign(vals, j)
+            if wc_gain + rest > best_total:
+                best_total = wc_gain + rest
+                assignments = dict(rest_map, wildcard=(events[j], wc_gain))
+        best_weeks["wildcard"] = sorted(wc_vals, key=lambda t: -t[1])[:3]
+
+    dgw, bgw = {}, {}
+    if counts is not None and team_ids is not None:
+        for j, gw in enumerate(events):
+            d = [int(team_ids[i]) for i in np.nonzero(counts[:, j] > 1)[0]]
+            b = [int(team_ids[i]) for i in np.nonzero(counts[:, j] == 0)[0]]
+            if d:
+                dgw[gw] = d
+            if b:
+                bgw[gw] = b
+
+    return ChipPlan(events, assignments, float(best_total), best_weeks, dgw, bgw)
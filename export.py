@@ -0,0 +1,164 @@
+"""
+Columnar export of a planner run.
+
+Layout (one directory per export, schema version in schema.json):
+
+  <dir>/schema.json              version, event, gw range, rows + column dtypes
+  <dir>/players/<column>.npy     one row per element; `xpts`, `fixture_scalar`,
+                                 `p60`, `p_play`, `minutes_scalar` are players x GWs
+  <dir>/gws/gw.npy
+  <dir>/transfers/<column>.npy   the suggested moves, in order
+
+Every column is a plain .npy array with a fixed dtype (SCHEMA), written in
+one pass into a new version directory (<dir>.versions/<stamp>/); <dir>
+itself is a symlink that is then swapped to it in one os.replace, so <dir>
+always resolves to a complete run, even for a reader active during the
+swap. The previous version is kept until the next export, so a reader
+that resolved the link just before a swap can finish (`read_export`
+resolves it once). `read_export` memory-maps the columns (np.load
+mmap_mode="r"): nothing is copied or parsed until a slice is touched, and
+any numpy/Arrow consumer can wrap the buffers zero-copy.
+"""
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+SCHEMA_VERSION = 2     # 2: p60 / p_play / minutes_scalar per GW
+KEEP_VERSIONS = 2      # the live export and the one before it
+
+# table -> [(column, dtype, per-GW?)]
+SCHEMA: Dict[str, List[Tuple[str, str, bool]]] = {
+    "players": [
+        ("id", "int32", False),
+        ("name", "U32", False),
+        ("pos", "int8", False),
+        ("team", "int16", False),
+        ("cost", "float32", False),
+        ("p60", "float32", True),
+        ("p_play", "float32", True),
+        ("minutes_scalar", "float32", True),
+        ("xpts", "float32", True),
+        ("fixture_scalar", "float32", True),
+        ("xpts_total", "float32", False),
+        ("in_squad", "bool", False),
+        ("starter", "bool", False),
+    ],
+    "gws": [
+        ("gw", "int16", False),
+    ],
+    "transfers": [
+        ("sell_id", "int32", False),
+        ("buy_id", "int32", False),
+        ("raw_gain", "float32", False),
+        ("net_gain", "float32", False),
+        ("uses_hit", "bool", False),
+    ],
+}
+
+
+def projection_tables(bootstrap: Dict[str, Any], proj: Dict[str, np.ndarray], squad: Iterable,
+                      transfers: Sequence[Tuple]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Export tables from planner.projection_table output (`proj`), the squad
+    (PlayerProj list, starters flagged) and propose_transfers output.
+    """
+    els = {e["id"]: e for e in bootstrap["elements"]}
+    ids = proj["id"]
+    squad = list(squad)
+    in_squad = {p.id for p in squad}
+    starters = {p.id for p in squad if p.starter}
+    col = lambda key, default=0: [els[int(i)].get(key, default) for i in ids]
+    return {
+        "players": {
+            "id": ids,
+            "name": col("web_name", ""),
+            "pos": col("element_type"),
+            "team": col("team"),
+            "cost": np.array(col("now_cost"), dtype=float) / 10.0,
+            "p60": proj["p60"],
+            "p_play": proj["p_play"],
+            "minutes_scalar": proj["minutes_scalar"],
+            "xpts": proj["xpts"],
+            "fixture_scalar": proj["fixture_scalar"],
+            "xpts_total": proj["xpts"].sum(1),
+            "in_squad": [int(i) in in_squad for i in ids],
+            "starter": [int(i) in starters for i in ids],
+        },
+        "gws": {"gw": proj["gw"]},
+        "transfers": {
+            "sell_id": [t[0].id for t in transfers],
+            "buy_id": [t[1].id for t in transfers],
+            "raw_gain": [t[2] for t in transfers],
+            "net_gain": [t[3] for t in transfers],
+            "uses_hit": [bool(t[4]) for t in transfers],
+        },
+    }
+
+
+def write_export(path: str, tables: Dict[str, Dict[str, Any]], meta: Dict[str, Any] = None) -> str:
+    """Cast every column to its SCHEMA dtype, write the export in one pass and point `path` at it."""
+    path = os.path.abspath(path)
+    versions = f"{path}.versions"
+    os.makedirs(versions, exist_ok=True)
+    tmp = os.path.join(versions, f"{time.time_ns()}-{os.getpid()}")
+    n_gw = len(tables["gws"]["gw"])
+    info = {"version": SCHEMA_VERSION, "written_at": time.time(), **(meta or {}), "tables": {}}
+
+    try:
+        for table, columns in SCHEMA.items():
+            os.makedirs(os.path.join(tmp, table))
+            data = tables.get(table, {})
+            rows = None
+            cols = {}
+            for name, dtype, per_gw in columns:
+                arr = np.asarray(data.get(name, []), dtype=dtype)
+                if per_gw:
+                    arr = arr.reshape(-1, n_gw)
+                if rows is None:
+                    rows = len(arr)
+                elif len(arr) != rows:
+                    raise ValueError(f"{table}.{name}: {len(arr)} rows, expected {rows}")
+                np.save(os.path.join(tmp, table, f"{name}.npy"), np.ascontiguousarray(arr))
+                cols[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape)}
+            info["tables"][table] = {"rows": rows or 0, "columns": cols}
+
+        with open(os.path.join(tmp, "schema.json"), "w") as f:
+            json.dump(info, f, indent=2)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.listdir(versions):
+            os.rmdir(versions)
+        raise
+
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)              # a plain-directory export from before versioning
+    link = f"{path}.link-{os.getpid()}"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.relpath(tmp, os.path.dirname(path)), link)
+    os.replace(link, path)
+    # complete versions only: another writer may still be filling an older one
+    done = [v for v in os.listdir(versions) if os.path.exists(os.path.join(versions, v, "schema.json"))]
+    for old in sorted(done, key=lambda v: int(v.split("-")[0]))[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(versions, old), ignore_errors=True)
+    return path
+
+
+def read_export(path: str) -> Tuple[Dict[str, Any], Dict[str, Dict[str, np.ndarray]]]:
+    """(schema.json, {table: {column: read-only memory-mapped array}})."""
+    path = os.path.realpath(path)        # one version throughout, even if a new export lands meanwhile
+    with open(os.path.join(path, "schema.json"), "r") as f:
+        info = json.load(f)
+    if info.get("version") != SCHEMA_VERSION:
+        raise ValueError(f"export schema v{info.get('version')}, reader expects v{SCHEMA_VERSION}")
+    tables = {}
+    for table, spec in info["tables"].items():
+        tables[table] = {
+            name: np.load(os.path.join(path, table, f"{name}.npy"), mmap_mode="r")
+            for name in spec["columns"]
+        }
+    return info, tables
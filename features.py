@@ -0,0 +1,174 @@
+"""
+Per-player projection features and the batched projection formula.
+
+The planner's projection is separable into features that don't depend on
+the model knobs and a cheap formula that does:
+
+  features   rppa    decayed recent points per appearance      (P,)
+             prior   position (x price-tier) regression target (P,)
+             ms      minutes scalar from minutes_model         (P, G) or (P,)
+             S, mask fixture strength scalar per fixture       (P, G, F)
+                     (F = most fixtures any team has in a GW)
+
+  formula    base    = (1 - regression) * rppa + regression * prior
+             xpts_pg = sum_f max(base * ms_pg * S_pgf, min_baseline)   (masked)
+
+`project_features` evaluates the formula for one knob setting or a whole
+grid of them at once (leading K axis); it is the regression model's
+projection (models.Regression).
+
+The bootstrap / fixture helpers the features are scored with (current GW,
+per-team fixture index, strength scalar, fixture difficulty, flat position
+baselines) live here too, so planner.py and advisor.py build the same
+inputs without one entry point importing the other.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Baselines per position (per-game, rough FPL reality)
+# 1=GK, 2=DEF, 3=MID, 4=FWD
+POS_BASELINES = {
+    1: 3.5,
+    2: 3.0,
+    3: 4.8,
+    4: 5.2,
+}
+
+
+def get_current_event(bootstrap: Dict[str, Any]) -> int:
+    events = bootstrap["events"]
+
+    # Prefer the next gameweek when the site marks one
+    nxt = [e for e in events if e.get("is_next")]
+    if nxt:
+        return nxt[0]["id"]
+
+    # Otherwise use the current GW (bump if already finished)
+    cur = [e for e in events if e.get("is_current")]
+    if cur:
+        e = cur[0]
+        if e.get("is_finished", False):
+            return e["id"] + 1
+        return e["id"]
+
+    # Fallbacks
+    unfinished = [ev for ev in events if not ev.get("is_finished", False)]
+    if unfinished:
+        return min(unfinished, key=lambda x: x["id"])["id"]
+    return max(ev["id"] for ev in events)
+
+
+def build_fixtures_index(fixtures: List[Dict[str, Any]]):
+    """{team: {gw: [fixtures]}} (blank GWs absent, DGWs two long)."""
+    idx = {}
+    for f in fixtures:
+        ev = f.get("event")
+        if ev is None:
+            continue
+        for t in (f["team_h"], f["team_a"]):
+            idx.setdefault(t, {}).setdefault(ev, []).append(f)
+    return idx
+
+
+def _clamp(x: float, lo: float, hi: float) -> float:
+    return lo if x < lo else hi if x > hi else x
+
+
+def compute_strength_means(teams: list[dict]) -> dict:
+    # League means to normalize opponent strengths into ~1.0
+    n = len(teams) or 1
+    get = lambda k: sum(float(t.get(k, 0) or 0) for t in teams) / n
+    return {
+        "att_home": get("strength_attack_home"),
+        "att_away": get("strength_attack_away"),
+        "def_home": get("strength_defence_home"),
+        "def_away": get("strength_defence_away"),
+    }
+
+
+def strength_scalar(fixt: dict, player: dict, teams_by_id: dict, strength_means: dict,
+                    outcomes: Optional[Any] = None) -> float:
+    """
+    Returns a single multiplicative scalar for the fixture based on:
+      - opponent attack/defence strength (home/away)
+      - player's position (attackers face opp DEF; GK/DEF face opp ATT)
+      - small home/away bump for the player's team
+    With a fitted fixture-outcome model (`outcomes`), its per-fixture team
+    xG / clean-sheet scalar is used instead (see fixture_model.py).
+    """
+    if outcomes is not None:
+        s = outcomes.scalar(fixt, player)
+        if s is not None:
+            return s
+
+    player_team = player["team"]
+    pos = player.get("element_type", 4)  # 1 GK, 2 DEF, 3 MID, 4 FWD
+    player_is_home = (fixt["team_h"] == player_team)
+
+    opp_id = fixt["team_a"] if player_is_home else fixt["team_h"]
+    opp = teams_by_id.get(opp_id, {})
+
+    # opponent strength fields
+    if player_is_home:
+        # opponent is away
+        opp_att = float(opp.get("strength_attack_away", 0) or 0)
+        opp_def = float(opp.get("strength_defence_away", 0) or 0)
+        mean_att = float(strength_means.get("att_away", 1.0) or 1.0)
+        mean_def = float(strength_means.get("def_away", 1.0) or 1.0)
+    else:
+        # opponent is home
+        opp_att = float(opp.get("strength_attack_home", 0) or 0)
+        opp_def = float(opp.get("strength_defence_home", 0) or 0)
+        mean_att = float(strength_means.get("att_home", 1.0) or 1.0)
+        mean_def = float(strength_means.get("def_home", 1.0) or 1.0)
+
+    # normalize: stronger opp → scalar < 1; weaker opp → scalar > 1
+    if pos in (3, 4):  # attacker faces opponent DEF
+        base = (mean_def / opp_def) if opp_def > 0 else 1.0
+    else:              # GK/DEF face opponent ATT
+        base = (mean_att / opp_att) if opp_att > 0 else 1.0
+
+    base = _clamp(base, 0.6, 1.4)  # keep within sane bounds
+    ha = 1.05 if player_is_home else 0.95  # small home/away edge for the player's team
+
+    return base * ha
+
+
+def fixture_difficulty(fixt: dict, player: dict) -> float:
+    return fixt.get("team_h_difficulty", 3) if fixt["team_h"] == player["team"] else fixt.get("team_a_difficulty", 3)
+
+
+def fixture_tensor(elements: Sequence[Dict[str, Any]], fixtures_idx, gw_range: Sequence[int],
+                   scalar_fn: Callable[[Dict[str, Any], Dict[str, Any]], float]) -> Tuple[np.ndarray, np.ndarray]:
+    """(S, mask): scalar_fn(fixture, element) for every element's fixtures per GW."""
+    f_max = 1
+    for e in elements:
+        team_fx = fixtures_idx.get(e["team"], {})
+        for ev in gw_range:
+            f_max = max(f_max, len(team_fx.get(ev, [])))
+    S = np.zeros((len(elements), len(gw_range), f_max))
+    mask = np.zeros(S.shape, dtype=bool)
+    for k, e in enumerate(elements):
+        team_fx = fixtures_idx.get(e["team"], {})
+        for j, ev in enumerate(gw_range):
+            for i, f in enumerate(team_fx.get(ev, [])):
+                S[k, j, i] = scalar_fn(f, e)
+                mask[k, j, i] = True
+    return S, mask
+
+
+def project_features(rppa: np.ndarray, prior: np.ndarray, ms: np.ndarray, S: np.ndarray, mask: np.ndarray,
+                     regression, min_baseline) -> np.ndarray:
+    """
+    xPts per player per GW. `regression` / `min_baseline` are scalars
+    (-> P x G) or equal-length arrays of grid points (-> K x P x G).
+    """
+    r = np.asarray(regression, dtype=float)
+    mb = np.asarray(min_baseline, dtype=float)
+    base = (1.0 - r)[..., None] * rppa + r[..., None] * prior                 # (K,) P
+    ms = ms if ms.ndim == 2 else ms[:, None]
+    contrib = base[..., None, None] * ms[:, :, None] * S                       # (K,) P G F
+    contrib = np.maximum(contrib, mb[..., None, None, None])
+    out = np.where(mask, contrib, 0.0).sum(-1)
+    return out if r.ndim else out.reshape(out.shape[-2:])
@@ -0,0 +1,91 @@
+"""
+Team-level fixture outcomes shared by every player in the fixture.
+
+Once per fixture (vectorized over all of them), from bootstrap team
+strengths normalized by the league means:
+
+  xg_home = LEAGUE_GOALS * HOME_EDGE * (att_home[h] / def_away[a]) ** SPREAD
+  xg_away = LEAGUE_GOALS / HOME_EDGE * (att_away[a] / def_home[h]) ** SPREAD
+  cs_home = exp(-xg_away)      (Poisson: P(opponent scores 0))
+  cs_away = exp(-xg_home)
+
+A player's fixture scalar mixes the two team quantities by position,
+each relative to its league-wide mean over the modeled fixtures:
+
+  scalar = (1 - w_cs - w_att) + w_cs * cs / mean(cs) + w_att * xg / mean(xg)
+
+with CS_WEIGHT / ATTACK_WEIGHT per position (clean sheets drive GK/DEF,
+attacking returns MID/FWD). The fixture x side x position table is built
+up front, so a player lookup is an index; cost scales with fixtures, not
+players.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+LEAGUE_GOALS = 1.35    # mean goals per team per match
+HOME_EDGE = 1.12       # xG multiplier at home (divides away)
+SPREAD = 2.0           # sharpens strength ratios into realistic xG ranges
+CLAMP = (0.6, 1.4)     # same bounds as the strength-ratio scalar
+
+# share of a per-appearance average tied to each team outcome (rest is fixture-neutral)
+CS_WEIGHT = {1: 0.45, 2: 0.40, 3: 0.10, 4: 0.0}
+ATTACK_WEIGHT = {1: 0.0, 2: 0.15, 3: 0.55, 4: 0.70}
+
+
+@dataclass
+class FixtureOutcomes:
+    fixture_ids: np.ndarray       # (N,)
+    team_h: np.ndarray            # (N,)
+    team_a: np.ndarray            # (N,)
+    xg: np.ndarray                # (N, 2) expected goals for home, away
+    cs: np.ndarray                # (N, 2) clean-sheet probability for home, away
+    scalars: np.ndarray           # (N, 2, 5) per side and position (column 0 unused)
+
+    def __post_init__(self):
+        self._row = {int(f): k for k, f in enumerate(self.fixture_ids)}
+
+    def scalar(self, fixture: Dict[str, Any], player: Dict[str, Any]) -> Optional[float]:
+        """Scalar for the player's side of the fixture; None when the fixture wasn't modeled."""
+        k = self._row.get(fixture.get("id"))
+        pos = player.get("element_type", 4)
+        if k is None or pos not in CS_WEIGHT:
+            return None
+        side = 0 if player["team"] == self.team_h[k] else 1
+        return float(self.scalars[k, side, pos])
+
+
+def fit_outcomes(fixtures: Sequence[Dict[str, Any]], teams: Sequence[Dict[str, Any]]) -> FixtureOutcomes:
+    fx = [f for f in fixtures if f.get("id") is not None and f.get("team_h") and f.get("team_a")]
+    ids = np.array([f["id"] for f in fx], dtype=np.int64)
+    h = np.array([f["team_h"] for f in fx], dtype=np.int64)
+    a = np.array([f["team_a"] for f in fx], dtype=np.int64)
+
+    size = max([t["id"] for t in teams] + [0]) + 1
+
+    def rel(key):
+        # team id -> strength / league mean (1.0 where unknown)
+        out = np.ones(size)
+        vals = np.array([float(t.get(key, 0) or 0) for t in teams])
+        mean = vals[vals > 0].mean() if (vals > 0).any() else 1.0
+        for t, v in zip(teams, vals):
+            if v > 0:
+                out[t["id"]] = v / mean
+        return out
+
+    att_h, att_a = rel("strength_attack_home"), rel("strength_attack_away")
+    def_h, def_a = rel("strength_defence_home"), rel("strength_defence_away")
+
+    xg = np.empty((len(fx), 2))
+    xg[:, 0] = LEAGUE_GOALS * HOME_EDGE * (att_h[h] / def_a[a]) ** SPREAD
+    xg[:, 1] = LEAGUE_GOALS / HOME_EDGE * (att_a[a] / def_h[h]) ** SPREAD
+    cs = np.exp(-xg[:, ::-1])
+
+    w_cs = np.array([0.0] + [CS_WEIGHT[p] for p in (1, 2, 3, 4)])
+    w_att = np.array([0.0] + [ATTACK_WEIGHT[p] for p in (1, 2, 3, 4)])
+    xg_rel = xg / (xg.mean() if len(fx) else 1.0)
+    cs_rel = cs / (cs.mean() if len(fx) else 1.0)
+    scalars = (1.0 - w_cs - w_att) + w_cs * cs_rel[..., None] + w_att * xg_rel[..., None]   # N x 2 x 5
+    scalars = np.clip(scalars, *CLAMP)
+    return FixtureOutcomes(ids, h, a, xg, cs, scalars)
@@ -1,69 +1,127 @@
-import json, os
+import json, os, time
 import requests
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 
 API = "https://fantasy.premierleague.com/api"
 
+# Shared-cache freshness per URL pattern (seconds), first match wins;
+# private endpoints are never cached
+CACHE_TTLS = [
+    ("/live/", 15),
+    ("/fixtures/?event=", 15),
+    ("/bootstrap-static/", 300),
+    ("/fixtures/", 900),
+    ("/element-summary/", 3600),
+    ("/entry/", 300),
+    ("/leagues-classic/", 300),
+]
+UNCACHED = ("/me/", "/my-team/")
+
+# Transient failures worth another try (rate limit, upstream hiccups)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRY_AFTER = 30.0   # cap on a server-requested wait (s)
+
 class FPLClient:
-    def __init__(self, session=None, auth_header=None, user_agent=None, referer=None):
+    def __init__(self, session=None, auth_header=None, user_agent=None, referer=None, cache=None,
+                 base_url=None, retries=3, backoff=0.5, timeout=20):
+        """
+        cache: optional cache.SharedCache shared with other processes (single-flight).
+        base_url: API root, e.g. a local stand-in server (defaults to the real API).
+        retries / backoff: 429, 5xx, timeouts and dropped connections are retried
+          with exponential backoff (backoff * 2**attempt s, or the server's
+          Retry-After when sent); timeout is per request (s). The cache lease
+          is renewed before each retry, so it needs to outlast one attempt
+          plus its wait (timeout + MAX_RETRY_AFTER), not all of them.
+        """
         self.sess = session or requests.Session()
         self.auth_header = auth_header or ""
         self.user_agent = user_agent or "Mozilla/5.0"
         self.referer = referer or "https://fantasy.premierleague.com/"
-
-    def bootstrap(self) -> Dict[str, Any]:
-        return self._get_json(f"{API}/bootstrap-static/")
-
-    def entry(self, team_id: int) -> Dict[str, Any]:
-        return self._get_json(f"{API}/entry/{team_id}/")
-
-    def entry_picks(self, team_id: int, event: int) -> Dict[str, Any]:
-        return self._get_json(f"{API}/entry/{team_id}/event/{event}/picks/")
-
-    def element_summary(self, element_id: int) -> Dict[str, Any]:
-        return self._get_json(f"{API}/element-summary/{element_id}/")
-
-    def fixtures(self) -> List[Dict[str, Any]]:
-        return self._get_json(f"{API}/fixtures/")
+        self.cache = cache
+        self.api = (base_url or API).rstrip("/")
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
 
     def _get_json(self, url: str):
+        if self.cache is not None and not any(p in url for p in UNCACHED):
+            return self.cache.get_or_fetch(url, lambda: self._fetch_json(url, lambda: self.cache.renew(url)),
+                                           self._ttl_for(url))
+        return self._fetch_json(url)
+
+    def _ttl_for(self, url: str) -> Optional[float]:
+        for part, ttl in CACHE_TTLS:
+            if part in url:
+                return ttl
+        return None   # cache default
+
+    def _fetch_json(self, url: str, before_retry: Optional[Callable[[], None]] = None):
         headers = {"User-Agent": self.user_agent, "Referer": self.referer}
         if self.auth_header:
             headers["x-api-authorization"] = self.auth_header
-        r = self.sess.get(url, headers=headers, timeout=20)
-        r.raise_for_status()
-        return r.json()
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                r = self.sess.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+                wait = self.backoff * 2 ** attempt
+            else:
+                if getattr(r, "status_code", 200) not in RETRY_STATUSES or last:
+                    r.raise_for_status()
+                    return r.json()
+                wait = self._retry_wait(r, attempt)
+            if before_retry is not None:
+                before_retry()
+            time.sleep(wait)
+
+    def _retry_wait(self, r, attempt: int) -> float:
+        try:
+            return min(float(r.headers["Retry-After"]), MAX_RETRY_AFTER)
+        except (KeyError, ValueError):
+            return self.backoff * 2 ** attempt
     
     # Public endpoints
     def bootstrap(self) -> Dict[str, Any]:
-        return self._get_json(f"{API}/bootstrap-static/")
+        return self._get_json(f"{self.api}/bootstrap-static/")
 
     def entry(self, team_id: int) -> Dict[str, Any]:
-        return self._get_json(f"{API}/entry/{team_id}/")
+        return self._get_json(f"{self.api}/entry/{team_id}/")
 
     def entry_picks(self, team_id: int, event: int) -> Dict[str, Any]:
-        return self._get_json(f"{API}/entry/{team_id}/event/{event}/picks/")
+        return self._get_json(f"{self.api}/entry/{team_id}/event/{event}/picks/")
 
     def element_summary(self, element_id: int) -> Dict[str, Any]:
-        return self._get_json(f"{API}/element-summary/{element_id}/")
+        return self._get_json(f"{self.api}/element-summary/{element_id}/")
+
+    def fixtures(self, event: Optional[int] = None) -> List[Dict[str, Any]]:
+        if event is not None:
+            return self._get_json(f"{self.api}/fixtures/?event={event}")
+        return self._get_json(f"{self.api}/fixtures/")
 
-    def fixtures(self) -> List[Dict[str, Any]]:
-        return self._get_json(f"{API}/fixtures/")
+    def event_live(self, event: int) -> Dict[str, Any]:
+        return self._get_json(f"{self.api}/event/{event}/live/")
+
+    def league_standings(self, league_id: int, page: int = 1) -> Dict[str, Any]:
+        return self._get_json(f"{self.api}/leagues-classic/{league_id}/standings/?page_standings={page}")
 
     # Private (requires auth_header)
     def me(self) -> Dict[str, Any]:
-        return self._get_json(f"{API}/me/")
+        return self._get_json(f"{self.api}/me/")
 
     def my_team(self, team_id: int) -> Dict[str, Any]:
-        return self._get_json(f"{API}/my-team/{team_id}/")
+        return self._get_json(f"{self.api}/my-team/{team_id}/")
 
 class SnapshotClient:
     """Offline client that reads JSON files from a local directory:
     - bootstrap-static.json
     - fixtures.json
     - entry.json
-    - picks.json
+    - picks.json (or picks/<entry>.json per league rival)
     - element_summaries/<id>.json (optional)
+    - live/<event>.json (optional, for live.py)
+    - leagues/<id>.json (optional, one standings page)
     """
     def __init__(self, snapshot_dir: str):
         self.dir = snapshot_dir
@@ -75,6 +133,8 @@ class SnapshotClient:
         return self._load("entry.json")
 
     def entry_picks(self, team_id: int, event: int) -> Dict[str, Any]:
+        if os.path.exists(os.path.join(self.dir, "picks", f"{team_id}.json")):
+            return self._load(os.path.join("picks", f"{team_id}.json"))
         return self._load("picks.json")
 
     def element_summary(self, element_id: int) -> Dict[str, Any]:
@@ -83,8 +143,17 @@ class SnapshotClient:
             return self._load(os.path.join("element_summaries", f"{element_id}.json"))
         return {"history": [{"minutes":90,"total_points":6},{"minutes":90,"total_points":2},{"minutes":75,"total_points":5},{"minutes":30,"total_points":1}]}
 
-    def fixtures(self) -> List[Dict[str, Any]]:
-        return self._load("fixtures.json")
+    def fixtures(self, event: Optional[int] = None) -> List[Dict[str, Any]]:
+        fixtures = self._load("fixtures.json")
+        if event is not None:
+            return [f for f in fixtures if f.get("event") == event]
+        return fixtures
+
+    def event_live(self, event: int) -> Dict[str, Any]:
+        return self._load(os.path.join("live", f"{event}.json"))
+
+    def league_standings(self, league_id: int, page: int = 1) -> Dict[str, Any]:
+        return self._load(os.path.join("leagues", f"{league_id}.json"))
 
     def _load(self, name: str):
         with open(os.path.join(self.dir, name), "r") as f:
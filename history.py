@@ -0,0 +1,116 @@
+"""
+Packed element-summary histories.
+
+A raw element-summary is three lists of ~30-field dicts (`fixtures`,
+`history`, `history_past`). The planner reads a handful of numeric fields
+from them, yet the pipeline holds a summary for every element for the
+whole run. `pack_summary` keeps only the fields it is asked for, as one
+float32 matrix per list (rows = matches / seasons, columns = fields, NaN =
+missing), and drops the rest of the JSON:
+
+  HISTORY_FIELDS   round, minutes, starts, total_points, was_home, opponent_team
+  PAST_FIELDS      start_cost, total_points, minutes, starts
+
+Extra fields (e.g. "expected_goals", "goals_conceded") can be appended per
+run; numeric strings are parsed, anything else non-numeric is dropped.
+
+`PackedHistory` reads like the list of dicts it replaces: len(), slicing,
+iteration and `row.get(field, default)` (a missing / NaN cell gives the
+default), so history consumers don't care which one they get. Whole
+columns are available as arrays via `column(field)`.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+HISTORY_FIELDS = ("round", "minutes", "starts", "total_points", "was_home", "opponent_team")
+PAST_FIELDS = ("start_cost", "total_points", "minutes", "starts")
+_COLUMNS: Dict[tuple, Dict[str, int]] = {}   # one field index per field list
+
+
+def _num(v) -> float:
+    if v is None or isinstance(v, (list, dict)):
+        return np.nan
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class PackedRow:
+    __slots__ = ("_fields", "_values")
+
+    def __init__(self, fields: Dict[str, int], values: np.ndarray):
+        self._fields = fields
+        self._values = values
+
+    def get(self, key: str, default=None):
+        k = self._fields.get(key)
+        if k is None:
+            return default
+        v = float(self._values[k])
+        if v != v:                       # NaN: missing in the source
+            return default
+        return int(v) if v.is_integer() else v
+
+    def __getitem__(self, key: str):
+        v = self.get(key)
+        if v is None:
+            raise KeyError(key)
+        return v
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+class PackedHistory:
+    __slots__ = ("fields", "data")
+
+    def __init__(self, fields: Dict[str, int], data: np.ndarray):
+        self.fields = fields             # field -> column, shared by every player
+        self.data = data                 # (rows, len(fields)) float32
+
+    @classmethod
+    def pack(cls, rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> "PackedHistory":
+        fields = tuple(fields)
+        cols = _COLUMNS.setdefault(fields, {f: k for k, f in enumerate(fields)})
+        data = np.array([[_num(r.get(f)) for f in fields] for r in rows], dtype=np.float32)
+        return cls(cols, data.reshape(-1, len(fields)))
+
+    def column(self, field: str) -> np.ndarray:
+        k = self.fields.get(field)
+        if k is None:
+            return np.full(len(self.data), np.nan, dtype=np.float32)
+        return self.data[:, k]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __bool__(self) -> bool:
+        return len(self.data) > 0
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return PackedHistory(self.fields, self.data[idx])
+        return PackedRow(self.fields, self.data[idx])
+
+    def __iter__(self):
+        for row in self.data:
+            yield PackedRow(self.fields, row)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+
+def pack_summary(summary: Dict[str, Any], extra: Sequence[str] = (),
+                 past_extra: Sequence[str] = ()) -> Dict[str, PackedHistory]:
+    """element-summary -> {"history", "history_past"} as PackedHistory; everything else dropped."""
+    return {
+        "history": PackedHistory.pack(summary.get("history") or [], _fields(HISTORY_FIELDS, extra)),
+        "history_past": PackedHistory.pack(summary.get("history_past") or [], _fields(PAST_FIELDS, past_extra)),
+    }
+
+
+def _fields(base: Sequence[str], extra: Optional[Sequence[str]]) -> List[str]:
+    return list(base) + [f for f in (extra or ()) if f not in base]
@@ -0,0 +1,191 @@
+"""
+Formation-valid starting XI, captaincy and bench order.
+
+A legal XI is 1 GK, 3-5 DEF, 2-5 MID and 1-3 FWD, which leaves eight
+outfield formations. Within a formation the best XI is simply the top-k of
+each position, so the exact optimum is found by sorting each position once
+and scoring the eight prefix sums. Scoring includes:
+  - the captain's extra multiplier, with the armband falling to the vice
+    when the captain does not play
+  - autosub expected value: bench outfielder k comes on when at least k
+    outfield starters blank (Poisson-binomial over the starters' p_play),
+    the backup GK when the starting GK blanks
+
+Formation minimums are ignored when valuing autosubs (a blank is assumed
+always replaceable), which only matters for 3-at-the-back / 1-up-top XIs.
+
+Formations are visited best-XI-first and cut off once the XI gap exceeds
+the largest possible armband + autosub value, so a 15-man squad/GW costs
+~25us in pure Python (~100us when every starter carries blank risk).
+`xi_values` scores many squads or GWs at once with numpy.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMATIONS = [
+    (d, m, f)
+    for d in range(3, 6)
+    for m in range(2, 6)
+    for f in range(1, 4)
+    if d + m + f == 10
+]
+
+
+@dataclass
+class Lineup:
+    xi: List[int]          # indices into the squad, GK first then DEF/MID/FWD
+    bench: List[int]       # autosub order: backup GK, then outfield priority
+    captain: int
+    vice: int
+    formation: Tuple[int, int, int]
+    xpts: float            # XI + captain bonus + autosub EV
+    autosub_ev: float
+
+
+def _absences(q: Sequence[float], k_max: int, dist: Optional[List[float]] = None) -> List[float]:
+    """
+    Poisson-binomial count of blanks among independent players with blank
+    probs q, capped at k_max: dist[k] = P(exactly k), dist[k_max] = P(>= k_max).
+    Pass `dist` to extend an existing distribution with more players.
+    """
+    dist = list(dist) if dist is not None else [1.0] + [0.0] * k_max
+    for qi in q:
+        if qi <= 0.0:
+            continue
+        dist[k_max] += dist[k_max - 1] * qi
+        for k in range(k_max - 1, 0, -1):
+            dist[k] = dist[k] * (1.0 - qi) + dist[k - 1] * qi
+        dist[0] *= (1.0 - qi)
+    return dist
+
+
+def _at_least(dist: List[float]) -> List[float]:
+    """P(at least k blanks), k = 1..k_max, from an _absences distribution."""
+    out, tail = [], 1.0
+    for k in range(1, len(dist)):
+        tail -= dist[k - 1]
+        out.append(tail)
+    return out
+
+
+def _captaincy(top: List[int], x: Sequence[float], p: Sequence[float]) -> Tuple[int, int, float]:
+    """Best (captain, vice) pair among the XI's top three and the armband's expected bonus."""
+    if len(top) == 1:
+        return top[0], top[0], x[top[0]]
+    best = (top[0], top[1], x[top[0]] + (1.0 - p[top[0]]) * x[top[1]])
+    for c in top:
+        if p[c] >= 1.0 and c != top[0]:
+            continue   # a nailed non-top pick can never beat the top pick's bonus
+        for v in top:
+            if v == c:
+                continue
+            bonus = x[c] + (1.0 - p[c]) * x[v]
+            if bonus > best[2] + 1e-12:
+                best = (c, v, bonus)
+    return best
+
+
+def optimize_lineup(x: Sequence[float], pos: Sequence[int], p_play: Optional[Sequence[float]] = None) -> Lineup:
+    """
+    x: expected points per squad member for one GW
+    pos: element_type per squad member (1 GK, 2 DEF, 3 MID, 4 FWD)
+    p_play: probability each member plays at all (default 1.0 -> no autosub EV)
+    """
+    x = list(x)
+    n = len(x)
+    p = list(p_play) if p_play is not None else [1.0] * n
+    order = sorted(range(n), key=x.__getitem__, reverse=True)
+    by_pos = {1: [], 2: [], 3: [], 4: []}
+    rank = [0] * n                      # rank within own position
+    for i in order:
+        lst = by_pos[pos[i]]
+        rank[i] = len(lst)
+        lst.append(i)
+    gks, dfs, mds, fws = by_pos[1], by_pos[2], by_pos[3], by_pos[4]
+
+    # XI sums per formation from per-position prefix sums, best first
+    def prefix(idx):
+        out, acc = [0.0], 0.0
+        for i in idx:
+            acc += x[i]
+            out.append(acc)
+        return out + [acc] * 5
+    pd, pm, pf = prefix(dfs), prefix(mds), prefix(fws)
+    gk_x = x[gks[0]] if gks else 0.0
+    shapes = sorted(((gk_x + pd[d] + pm[m] + pf[f], (d, m, f)) for d, m, f in FORMATIONS), reverse=True)
+
+    # Ceiling on armband + autosub value, valid for every formation
+    nailed = 1.0
+    for i in dfs + mds + fws:
+        nailed *= p[i]
+    q_any = 1.0 - nailed
+    extra_ub = (x[order[0]] + x[order[1]] if n > 1 else 0.0) + q_any * sum(x) \
+        + (x[gks[1]] if len(gks) > 1 else 0.0)
+
+    # blanks among the starters every shape shares (3 DEF, 2 MID, 1 FWD)
+    n_bench = max(0, len(dfs) + len(mds) + len(fws) - 10)
+    core = None
+    if n_bench and q_any > 0.0:
+        core = _absences([1.0 - p[i] for i in dfs[:3] + mds[:2] + fws[:1]], n_bench)
+
+    best = None
+    armbands = {}
+    for base, (d, m, f) in shapes:
+        if best is not None and base + extra_ub <= best.xpts:
+            break   # shapes are sorted by base, so no later shape can win either
+        quota = (0, 1, d, m, f)
+        top = []
+        for i in order:
+            if rank[i] < quota[pos[i]]:
+                top.append(i)
+                if len(top) == 3:
+                    break
+        if not top:
+            continue
+        key = tuple(top)
+        if key not in armbands:
+            armbands[key] = _captaincy(top, x, p)
+        c, v, bonus = armbands[key]
+
+        outfield_bench = sorted(dfs[d:] + mds[m:] + fws[f:], key=x.__getitem__, reverse=True)
+        ev = 0.0
+        if len(gks) > 1:
+            ev += (1.0 - p[gks[0]]) * x[gks[1]]
+        if core is not None and outfield_bench:
+            flex = dfs[3:d] + mds[2:m] + fws[1:f]
+            need = _at_least(_absences([1.0 - p[i] for i in flex], n_bench, core))
+            ev += sum(pr * x[i] for pr, i in zip(need, outfield_bench))
+        total = base + bonus + ev
+        if best is None or total > best.xpts + 1e-12:
+            xi = gks[:1] + dfs[:d] + mds[:m] + fws[:f]
+            best = Lineup(xi, gks[1:] + outfield_bench, c, v, (d, m, f), total, ev)
+    return best
+
+
+def xi_values(x: np.ndarray, pos: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batch form for 15-man (2/5/5/3) squads: best XI, bench and captain xPts for
+    every column of x (GWs, or candidate squads sharing positions) at once.
+    With that squad shape the formation maxima never bind, so the XI is the
+    mandatory 1 GK / 3 DEF / 2 MID / 1 FWD plus the best four remaining outfielders.
+    """
+    gk = _sorted_block(x, pos == 1, 2)
+    df = _sorted_block(x, pos == 2, 5)
+    md = _sorted_block(x, pos == 3, 5)
+    fw = _sorted_block(x, pos == 4, 3)
+    must = gk[0] + df[:3].sum(0) + md[:2].sum(0) + fw[:1].sum(0)
+    rest = np.vstack([df[3:], md[2:], fw[1:]])
+    xi = must + np.sort(rest, axis=0)[-4:].sum(0)
+    captain = np.max(np.vstack([gk[:1], df[:1], md[:1], fw[:1]]), axis=0)
+    bench = x.sum(0) - xi
+    return xi, bench, captain
+
+
+def _sorted_block(x: np.ndarray, mask: np.ndarray, rows: int) -> np.ndarray:
+    """Rows of x for one position, sorted desc per column and zero-padded to `rows`."""
+    b = -np.sort(-x[mask], axis=0)
+    if b.shape[0] < rows:
+        b = np.vstack([b, np.zeros((rows - b.shape[0], x.shape[1]))])
+    return b[:rows]
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Live gameweek tracker.
+
+Polls /event/{id}/live/ and this GW's fixtures on an interval. Each poll is
+diffed against the previous one: only squad members whose live stats moved,
+or whose team's fixtures changed state, are recomputed, and autosubs and
+captaincy are re-resolved only when one of those inputs changed. Updates go
+to stdout and/or a local UDP socket as JSON lines.
+
+Autosubs/captaincy are provisional, the way FPL settles them after the GW:
+  - a starter with 0 minutes once all his team's fixtures are finished is
+    replaced by the first bench player (in bench order) who has played,
+    keeping 1 GK and at least 3 DEF / 2 MID / 1 FWD
+  - if the captain blanks the same way, the vice takes the armband
+  - with Bench Boost active all 15 score and nobody is subbed
+"""
+import json
+import os
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+MIN_OUTFIELD = {2: 3, 3: 2, 4: 1}
+
+
+@dataclass
+class Member:
+    id: int
+    name: str
+    pos: int
+    team: int
+    slot: int             # 1-11 starters, 12-15 bench order
+    multiplier: int       # from picks: 0 bench, 1 starter, 2/3 captain
+    is_captain: bool
+    is_vice: bool
+    minutes: int = 0
+    points: int = 0
+    done: bool = False    # every fixture of his team this GW has finished
+
+
+def _live_elements(live: Dict[str, Any]) -> Iterable[Tuple[int, Dict[str, Any]]]:
+    els = live.get("elements", [])
+    if isinstance(els, dict):          # older payloads were keyed by id
+        return ((int(k), v.get("stats", {})) for k, v in els.items())
+    return ((e["id"], e.get("stats", {})) for e in els)
+
+
+def _fixture_state(f: Dict[str, Any]) -> Tuple:
+    done = bool(f.get("finished") or f.get("finished_provisional"))
+    return (bool(f.get("started")), done, f.get("team_h_score"), f.get("team_a_score"))
+
+
+class LiveTracker:
+    def __init__(self, client, event: int, bootstrap: Dict[str, Any], picks: Dict[str, Any]):
+        self.client = client
+        self.event = event
+        self.chip = picks.get("active_chip")
+        elements = {e["id"]: e for e in bootstrap["elements"]}
+        self.members: Dict[int, Member] = {}
+        for p in picks["picks"]:
+            el = elements[p["element"]]
+            self.members[el["id"]] = Member(
+                id=el["id"], name=el["web_name"], pos=el["element_type"], team=el["team"],
+                slot=p.get("position", 0), multiplier=p.get("multiplier", 1 if p.get("position", 0) <= 11 else 0),
+                is_captain=bool(p.get("is_captain")), is_vice=bool(p.get("is_vice_captain")),
+            )
+        self._by_team: Dict[int, List[Member]] = {}
+        for m in self.members.values():
+            self._by_team.setdefault(m.team, []).append(m)
+        self._stats: Dict[int, Tuple[int, int]] = {}
+        self._fixtures: Dict[int, Tuple] = {}
+        self._team_fixtures: Dict[int, List[int]] = {}
+        self.total: Optional[int] = None
+        self.autosubs: List[Tuple[int, int]] = []
+        self.captain_id: Optional[int] = None
+        self.polls = 0
+
+    # ---------- polling ----------
+    def poll(self) -> Optional[Dict[str, Any]]:
+        live = self.client.event_live(self.event)
+        fixtures = self.client.fixtures(self.event)
+        return self.update(live, fixtures)
+
+    def update(self, live: Dict[str, Any], fixtures: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Apply one poll; returns an update dict, or None if nothing relevant moved."""
+        self.polls += 1
+        first = self.total is None
+
+        # fixtures: which of our teams changed state?
+        changed_teams = set()
+        for f in fixtures:
+            if f.get("event") != self.event:
+                continue
+            st = _fixture_state(f)
+            if self._fixtures.get(f["id"]) != st:
+                self._fixtures[f["id"]] = st
+                for t in (f["team_h"], f["team_a"]):
+                    changed_teams.add(t)
+                    ids = self._team_fixtures.setdefault(t, [])
+                    if f["id"] not in ids:
+                        ids.append(f["id"])
+
+        # live stats: only squad members, only if they moved
+        changed: Dict[int, int] = {}
+        for eid, stats in _live_elements(live):
+            m = self.members.get(eid)
+            if m is None:
+                continue
+            st = (int(stats.get("minutes", 0) or 0), int(stats.get("total_points", 0) or 0))
+            if self._stats.get(eid) != st:
+                prev = self._stats.get(eid, (0, 0))
+                self._stats[eid] = st
+                m.minutes, m.points = st
+                changed[eid] = st[1] - prev[1]
+
+        teams = changed_teams | ({m.team for m in self.members.values()} if first else set())
+        done_changed = []
+        for t in teams:
+            for m in self._by_team.get(t, []):
+                done = all(self._fixtures[fid][1] for fid in self._team_fixtures.get(t, []))
+                if done != m.done:
+                    m.done = done
+                    done_changed.append(m.id)
+
+        if not first and not changed and not done_changed:
+            return None
+
+        prev_total = self.total or 0
+        self._resolve()
+        return {
+            "event": self.event,
+            "poll": self.polls,
+            "total": self.total,
+            "delta": self.total - prev_total,
+            "changes": [
+                {"id": eid, "name": self.members[eid].name, "points": self.members[eid].points,
+                 "minutes": self.members[eid].minutes, "delta": d}
+                for eid, d in changed.items() if not first or d
+            ],
+            "autosubs": [{"out": self.members[o].name, "in": self.members[i].name} for o, i in self.autosubs],
+            "captain": self.members[self.captain_id].name if self.captain_id else None,
+            "captain_points": self._captain_return(),
+        }
+
+    # ---------- scoring ----------
+    def _resolve(self) -> None:
+        """Provisional autosubs + armband, then the squad total."""
+        squad = sorted(self.members.values(), key=lambda m: m.slot)
+        mult = {m.id: m.multiplier for m in squad}
+        self.autosubs = []
+
+        captain = next((m for m in squad if m.is_captain), None)
+        vice = next((m for m in squad if m.is_vice), None)
+        cap_mult = captain.multiplier if captain else 2
+        self.captain_id = captain.id if captain else None
+        if captain and captain.minutes == 0 and captain.done and vice and vice.minutes > 0:
+            mult[captain.id] = 1 if captain.slot <= 11 else 0
+            mult[vice.id] = cap_mult
+            self.captain_id = vice.id
+
+        if self.chip != "bboost":
+            xi = [m for m in squad if m.slot <= 11]
+            bench = [m for m in squad if m.slot > 11]
+            for out in list(xi):
+                if out.minutes > 0 or not out.done:
+                    continue
+                for sub in bench:
+                    if sub.minutes == 0 or (sub.pos == 1) != (out.pos == 1):
+                        continue
+                    trial = [m for m in xi if m is not out] + [sub]
+                    if all(sum(1 for m in trial if m.pos == p) >= n for p, n in MIN_OUTFIELD.items()):
+                        xi = trial
+                        bench.remove(sub)
+                        mult[sub.id] = 1
+                        mult[out.id] = 0
+                        self.autosubs.append((out.id, sub.id))
+                        break
+
+        self.total = sum(m.points * mult[m.id] for m in squad)
+
+    def _captain_return(self) -> int:
+        if not self.captain_id:
+            return 0
+        mult = next((c.multiplier for c in self.members.values() if c.is_captain), 2)
+        return self.members[self.captain_id].points * mult
+
+    def all_finished(self) -> bool:
+        return bool(self._fixtures) and all(st[1] for st in self._fixtures.values())
+
+
+# ---------- sinks ----------
+def stdout_sink(update: Dict[str, Any]) -> None:
+    ts = time.strftime("%H:%M:%S")
+    line = f"[{ts}] GW{update['event']} live: {update['total']} pts ({update['delta']:+d})"
+    if update["captain"]:
+        line += f" | C {update['captain']} {update['captain_points']}"
+    print(line)
+    for c in update["changes"]:
+        print(f"   {c['name']:<20} {c['points']:>3} pts  {c['minutes']:>2}'  ({c['delta']:+d})")
+    for s in update["autosubs"]:
+        print(f"   autosub: {s['out']} -> {s['in']}")
+    sys.stdout.flush()
+
+
+class UDPSink:
+    """JSON-per-datagram updates to a local socket (e.g. `nc -ul 9999`)."""
+
+    def __init__(self, host: str, port: int):
+        self.addr = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __call__(self, update: Dict[str, Any]) -> None:
+        self.sock.sendto(json.dumps(update).encode(), self.addr)
+
+
+def run(tracker: LiveTracker, sinks: List[Callable[[Dict[str, Any]], None]], interval: float,
+        record_dir: Optional[str] = None, max_polls: Optional[int] = None) -> None:
+    """Poll until every fixture of the GW is finished (or max_polls)."""
+    while True:
+        live = tracker.client.event_live(tracker.event)
+        fixtures = tracker.client.fixtures(tracker.event)
+        if record_dir:
+            # replayable by a stand-in server: <dir>/<event>/<poll>-{live,fixtures}.json
+            d = os.path.join(record_dir, str(tracker.event))
+            os.makedirs(d, exist_ok=True)
+            for name, body in (("live", live), ("fixtures", fixtures)):
+                with open(os.path.join(d, f"{tracker.polls + 1:04d}-{name}.json"), "w") as f:
+                    json.dump(body, f)
+        update = tracker.update(live, fixtures)
+        if update:
+            for sink in sinks:
+                sink(update)
+        if tracker.all_finished() or (max_polls and tracker.polls >= max_polls):
+            return
+        time.sleep(interval)
+
+
+# ---------- main ----------
+def main():
+    import planner
+
+    client = planner.build_client()
+    bootstrap = client.bootstrap()
+    cur = [e for e in bootstrap["events"] if e.get("is_current")]
+    event = cur[0]["id"] if cur else planner.get_current_event(bootstrap)
+    picks = client.entry_picks(planner.TEAM_ID, event)
+
+    sinks = [stdout_sink]
+    target = planner.config.get("live_socket")    # "127.0.0.1:9999"
+    if target:
+        host, port = target.rsplit(":", 1)
+        sinks.append(UDPSink(host, int(port)))
+
+    tracker = LiveTracker(client, event, bootstrap, picks)
+    print(f"\nFPL Live – Team {planner.TEAM_ID} | GW{event}")
+    run(tracker, sinks, float(planner.config.get("live_poll_seconds", 60)),
+        record_dir=planner.config.get("live_record_dir"))
+    print("\nAll fixtures finished.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Minutes model: P(start), P(60+), P(any minutes) and expected minutes.
+
+Fitted per player from the last `window` matches of element_summary history
+with recency weights, then scaled by availability (chance_of_playing /
+status). Everything after the history -> matrix step is one numpy pass over
+all players:
+
+  start_rate   weighted share of matches started (`starts` when the API
+               provides it, else minutes >= 60)
+  full_rate    weighted share of starts lasting 60+   (prior FULL_PRIOR)
+  sub_rate     weighted share of non-starts with a cameo (prior SUB_PRIOR)
+
+  p_start = avail * start_rate
+  p60     = p_start * full_rate, floored at p60_floor * avail for players
+            who started at least once in the window (one benching should
+            not wipe out a regular)
+  p_play  = avail * (start_rate + (1 - start_rate) * sub_rate)
+  xmins   = avail * (start_rate * start_mins + (1 - start_rate) * sub_rate * sub_mins)
+
+The projection scalar is p60 plus a small credit for cameo minutes.
+
+chance_of_playing_next_round speaks for the next GW only. Over a horizon
+(`availability_by_gw`, players x GWs) it applies to the first GW and the
+doubt shrinks by RECOVERY per GW after it, so the fitted rates take over
+again; players who have left or can't play (NO_RETURN statuses) stay out.
+`fit_minutes` given per-GW availability returns every output per GW.
+"""
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+DECAY = 0.85           # per-match recency weight
+FULL_PRIOR = 0.85      # P(60+ | start) with no starts to learn from
+SUB_PRIOR = 0.3        # P(cameo | no start) with no benchings to learn from
+PRIOR_WEIGHT = 1.0     # pseudo-matches behind each prior
+NEW_PLAYER_START = 0.5 # start rate for players with no history at all
+CAMEO_WEIGHT = 0.3     # share of a full appearance's points a cameo is worth
+RECOVERY = 0.5         # share of a next-GW availability doubt left one GW later
+NO_RETURN = ("u", "n") # unavailable (left the club) / not eligible (e.g. on loan)
+
+
+def availability(players: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """chance_of_playing_next_round (or status) as a 0..1 array."""
+    status_p = {"a": 1.0, "d": 0.75, "f": 0.25}
+    out = np.empty(len(players))
+    for k, pl in enumerate(players):
+        c = pl.get("chance_of_playing_next_round")
+        out[k] = c / 100.0 if c is not None else status_p.get(pl.get("status", "a"), 0.0)
+    return np.clip(out, 0.0, 1.0)
+
+
+def availability_by_gw(players: Sequence[Dict[str, Any]], n_gws: int) -> np.ndarray:
+    """players x GWs: availability() for the first GW, easing toward 1 by RECOVERY per GW."""
+    avail = availability(players)[:, None]
+    eased = 1.0 - (1.0 - avail) * RECOVERY ** np.arange(n_gws)
+    out_for_good = np.array([pl.get("status") in NO_RETURN for pl in players], dtype=bool)[:, None]
+    return np.where(out_for_good, avail, eased)
+
+
+def history_row(hist: List[Dict[str, Any]], window: int):
+    """One player's (minutes, started, valid) row of history_matrix."""
+    mins = np.zeros(window)
+    started = np.zeros(window, dtype=bool)
+    valid = np.zeros(window, dtype=bool)
+    recent = hist[-window:] if window else []
+    if recent:
+        off = window - len(recent)
+        m = [h.get("minutes", 0) or 0 for h in recent]
+        mins[off:] = m
+        st = [h.get("starts") for h in recent]
+        started[off:] = [s > 0 if s is not None else mm >= 60 for s, mm in zip(st, m)]
+        valid[off:] = True
+    return mins, started, valid
+
+
+def history_matrix(histories: Sequence[List[Dict[str, Any]]], window: int):
+    """
+    Last `window` matches per player as right-aligned arrays:
+    (minutes, started, valid) each players x window, valid=False for padding.
+    """
+    n = len(histories)
+    mins = np.zeros((n, window))
+    started = np.zeros((n, window), dtype=bool)
+    valid = np.zeros((n, window), dtype=bool)
+    for k, hist in enumerate(histories):
+        mins[k], started[k], valid[k] = history_row(hist, window)
+    return mins, started, valid
+
+
+def fit_minutes(mins: np.ndarray, started: np.ndarray, valid: np.ndarray,
+                avail: np.ndarray, p60_floor: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Vectorized minutes model over players x window arrays (see module
+    docstring). `avail` is per player (P,) or per player per GW (P, G);
+    the outputs take its shape.
+    """
+    window = mins.shape[1]
+    w = DECAY ** np.arange(window - 1, -1, -1, dtype=float)     # newest match weighs 1
+    wv = w * valid
+    total = wv.sum(1)
+    has_hist = total > 0
+
+    starts_w = (wv * started).sum(1)
+    start_rate = np.where(has_hist, starts_w / np.where(has_hist, total, 1.0), NEW_PLAYER_START)
+
+    full_w = (wv * (started & (mins >= 60))).sum(1)
+    full_rate = (full_w + FULL_PRIOR * PRIOR_WEIGHT) / (starts_w + PRIOR_WEIGHT)
+
+    bench = valid & ~started
+    bench_w = (w * bench).sum(1)
+    cameo_w = (w * (bench & (mins > 0))).sum(1)
+    sub_rate = (cameo_w + SUB_PRIOR * PRIOR_WEIGHT) / (bench_w + PRIOR_WEIGHT)
+
+    start_mins = np.where(starts_w > 0, (wv * started * mins).sum(1) / np.maximum(starts_w, 1e-9), 80.0)
+    sub_mins = np.where(cameo_w > 0, (w * (bench & (mins > 0)) * mins).sum(1) / np.maximum(cameo_w, 1e-9), 20.0)
+
+    avail = np.asarray(avail, dtype=float)
+    if avail.ndim == 2:                                          # per GW: rates broadcast over GWs
+        start_rate, full_rate, sub_rate, start_mins, sub_mins = (
+            v[:, None] for v in (start_rate, full_rate, sub_rate, start_mins, sub_mins))
+    regular = (valid & started).any(1).reshape((-1,) + (1,) * (avail.ndim - 1))
+
+    p_start = avail * start_rate
+    p60 = p_start * full_rate
+    p60 = np.where(regular, np.maximum(p60, p60_floor * avail), p60)
+    p_play = avail * (start_rate + (1.0 - start_rate) * sub_rate)
+    xmins = avail * (start_rate * start_mins + (1.0 - start_rate) * sub_rate * sub_mins)
+
+    return {
+        "p_start": p_start,
+        "p60": p60,
+        "p_play": np.maximum(p_play, p60),
+        "xmins": xmins,
+        "scalar": p60 + CAMEO_WEIGHT * np.maximum(p_play - p60, 0.0),
+    }
+
+
+def minutes_model(histories: Sequence[List[Dict[str, Any]]], players: Sequence[Dict[str, Any]],
+                  window: int = 6, p60_floor: float = 0.0) -> Dict[str, np.ndarray]:
+    """Convenience wrapper: raw histories + bootstrap elements -> model arrays."""
+    mins, started, valid = history_matrix(histories, window)
+    return fit_minutes(mins, started, valid, availability(players), p60_floor)
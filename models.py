@@ -0,0 +1,217 @@
+"""
+Projection models behind one batch interface, and their weighted ensemble.
+
+A run builds one set of feature arrays for the players it projects over
+its GW range (`Features`: players x recent matches, players x GWs x
+fixtures; see build_features), and every model maps the whole set
+to xPts at once:
+
+  model.project(features) -> (P, G) matrix
+
+Models register under a name and are picked by name from config, either
+one name or {name: weight} for an ensemble:
+
+  regression   decayed recent points per appearance regressed to the
+               position (x price-tier) prior, x minutes scalar x fixture
+               strength scalar, floored per fixture (features.project_features)
+  form         mean points of the last FORM_N appearances (bootstrap form
+               for players without one) x chance to play x fixture
+               difficulty step (FDR <= 2: 1.1, 3: 1.0, 4+: 0.9)
+
+`project` runs an ensemble's models in a process pool (the features go to
+each worker once, through the initializer, as in scenarios.py) and
+returns the weight-averaged matrix; one model runs in-process.
+
+  @register("mine")
+  @dataclass
+  class Mine(Model):
+      def project(self, f): ...
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+from features import fixture_difficulty, fixture_tensor, project_features
+from minutes_model import availability_by_gw, fit_minutes, history_row
+from pipeline import iter_summaries
+
+RECENT_N = 8          # matches behind recent points per appearance
+RECENT_DECAY = 0.88   # per-appearance recency weight
+FORM_N = 6            # the form model's plain-mean window
+
+MODELS: Dict[str, Type["Model"]] = {}
+
+
+@dataclass
+class Features:
+    id: np.ndarray        # (P,)
+    pos: np.ndarray       # (P,) 1 GK .. 4 FWD
+    gw: np.ndarray        # (G,)
+    points: np.ndarray    # (P, RECENT_N) total_points of the last matches, right-aligned (0 = padding)
+    minutes: np.ndarray   # (P, RECENT_N)
+    form: np.ndarray      # (P,) bootstrap form
+    avail: np.ndarray     # (P, G) chance of being available (minutes_model.availability_by_gw)
+    ms: np.ndarray        # (P, G) minutes scalar (minutes_model)
+    p60: np.ndarray       # (P, G)
+    p_play: np.ndarray    # (P, G)
+    prior: np.ndarray     # (P,) position (x price-tier) prior
+    S: np.ndarray         # (P, G, F) fixture strength scalar
+    mask: np.ndarray      # (P, G, F) real fixtures
+    fdr: np.ndarray       # (P, G, F) fixture difficulty for the player's side
+
+
+class Model:
+    name = ""
+
+    def project(self, f: Features) -> np.ndarray:
+        raise NotImplementedError
+
+
+def register(name: str):
+    def deco(cls):
+        cls.name = name
+        MODELS[name] = cls
+        return cls
+    return deco
+
+
+def recent_ppa(points: np.ndarray, minutes: np.ndarray, n: int = RECENT_N, decay: float = RECENT_DECAY) -> np.ndarray:
+    """Per row: points per appearance over appearances in the last n matches, newest weighing 1."""
+    pts, played = points[:, -n:], minutes[:, -n:] > 0
+    after = np.cumsum(played[:, ::-1], axis=1)[:, ::-1] - 1      # appearances after this one
+    w = np.where(played, decay ** np.maximum(after, 0), 0.0)
+    den = w.sum(1)
+    return np.where(den > 0, (w * pts).sum(1) / np.where(den > 0, den, 1.0), 0.0)
+
+
+def points_row(hist, window: int = RECENT_N) -> Tuple[np.ndarray, np.ndarray]:
+    """One player's last `window` (total_points, minutes), right-aligned like minutes_model.history_row."""
+    pts, mins = np.zeros(window), np.zeros(window)
+    recent = hist[-window:] if window else []
+    if len(recent):
+        off = window - len(recent)
+        pts[off:] = [h.get("total_points", 0) or 0 for h in recent]
+        mins[off:] = [h.get("minutes", 0) or 0 for h in recent]
+    return pts, mins
+
+
+def recent_points_ppA(history, n: int = RECENT_N, decay: float = RECENT_DECAY) -> float:
+    pts, mins = points_row(history, n)
+    return float(recent_ppa(pts[None], mins[None], n, decay)[0])
+
+
+def build_features(client, elements, fixtures_idx, gw_range, scalar_fn, prior_fn,
+                   minutes_window: int = 6, p60_floor: float = 0.4) -> Features:
+    """
+    The models' inputs for `elements` over gw_range: scalar_fn(fixture,
+    element) scores each fixture and prior_fn(element) gives the regression
+    target. Fixtures are scored while the summaries are in flight, and each
+    summary is reduced to its rows as it arrives (completion order); the
+    minutes model then runs once over all of them.
+    """
+    gw_range = list(gw_range)
+    S, mask = fixture_tensor(elements, fixtures_idx, gw_range, scalar_fn)
+    fdr, _ = fixture_tensor(elements, fixtures_idx, gw_range, fixture_difficulty)
+    n = len(elements)
+    mins = np.zeros((n, minutes_window))
+    started = np.zeros((n, minutes_window), dtype=bool)
+    valid = np.zeros((n, minutes_window), dtype=bool)
+    points = np.zeros((n, RECENT_N))
+    minutes = np.zeros((n, RECENT_N))
+    for k, summ in iter_summaries(client, [e["id"] for e in elements]):
+        hist = summ.get("history", [])
+        mins[k], started[k], valid[k] = history_row(hist, minutes_window)
+        points[k], minutes[k] = points_row(hist)
+    avail = availability_by_gw(elements, len(gw_range))
+    mm = fit_minutes(mins, started, valid, avail, p60_floor)
+    return Features(
+        id=np.array([e["id"] for e in elements], dtype=np.int64),
+        pos=np.array([e.get("element_type", 4) for e in elements], dtype=np.int64),
+        gw=np.array(gw_range, dtype=np.int64),
+        points=points, minutes=minutes,
+        form=np.array([float(e.get("form") or 0.0) for e in elements]),
+        avail=avail, ms=mm["scalar"], p60=mm["p60"], p_play=mm["p_play"],
+        prior=np.array([prior_fn(e) for e in elements]),
+        S=S, mask=mask, fdr=fdr,
+    )
+
+
+@register("regression")
+@dataclass
+class Regression(Model):
+    # scalars -> (P, G); equal-length arrays (a knob grid) -> (K, P, G) in one pass
+    regression: float = 0.5
+    min_baseline: float = 2.0
+
+    def project(self, f: Features) -> np.ndarray:
+        rppa = recent_ppa(f.points, f.minutes)
+        return project_features(rppa, f.prior, f.ms, f.S, f.mask, self.regression, self.min_baseline)
+
+
+@register("form")
+@dataclass
+class Form(Model):
+    easy: float = 1.1
+    hard: float = 0.9
+
+    def project(self, f: Features) -> np.ndarray:
+        base = recent_ppa(f.points, f.minutes, FORM_N, 1.0)
+        base = np.where(base > 0, base, f.form)[:, None] * f.avail                 # P G
+        step = np.where(f.fdr <= 2, self.easy, np.where(f.fdr >= 4, self.hard, 1.0))
+        return np.where(f.mask, base[:, :, None] * step, 0.0).sum(-1)
+
+
+def parse_spec(spec: Union[str, Sequence[str], Dict[str, float]]) -> Dict[str, float]:
+    """'name' | [names] (equal weights) | {name: weight} -> {name: weight}, names checked."""
+    if isinstance(spec, str):
+        spec = {spec: 1.0}
+    elif not isinstance(spec, dict):
+        spec = {name: 1.0 for name in spec}
+    unknown = [n for n in spec if n not in MODELS]
+    if unknown:
+        raise ValueError(f"unknown projection model(s) {unknown}; registered: {sorted(MODELS)}")
+    spec = {n: float(w) for n, w in spec.items() if float(w) > 0}
+    if not spec:
+        raise ValueError("projection models need at least one positive weight")
+    return spec
+
+
+def build(spec, **params) -> List[Tuple[Model, float]]:
+    """(model, weight) pairs; each model takes the `params` it has fields for."""
+    out = []
+    for name, weight in parse_spec(spec).items():
+        cls = MODELS[name]
+        known = {fl.name for fl in fields(cls)}
+        out.append((cls(**{k: v for k, v in params.items() if k in known}), weight))
+    return out
+
+
+# ---------- evaluation ----------
+_CTX: Dict[str, Any] = {}
+
+
+def _init_worker(features):
+    _CTX["features"] = features
+
+
+def _project(model: Model, features: Features = None) -> np.ndarray:
+    return model.project(features if features is not None else _CTX["features"])
+
+
+def evaluate(models: Sequence[Model], features: Features, workers: Optional[int] = None) -> List[np.ndarray]:
+    """Each model's (P, G) projection; several models run in worker processes."""
+    workers = min(workers or os.cpu_count() or 1, len(models))
+    if workers <= 1:
+        return [_project(m, features) for m in models]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(features,)) as ex:
+        return list(ex.map(_project, models))
+
+
+def project(models: Sequence[Tuple[Model, float]], features: Features, workers: Optional[int] = None) -> np.ndarray:
+    """Weighted mean of the models' (P, G) projections."""
+    mats = evaluate([m for m, _ in models], features, workers)
+    w = np.array([w for _, w in models])
+    return np.tensordot(w / w.sum(), np.stack(mats), axes=1)
@@ -1,9 +1,29 @@
 #!/usr/bin/env python3
-import statistics
 from dataclasses import dataclass
-from typing import Dict, Any, List, Tuple, Iterable
-import os, yaml, requests
+from typing import Dict, Any, List, Iterable
+import argparse, os, yaml, requests
+import numpy as np
 from fpl_client import FPLClient, SnapshotClient
+from cache import SharedCache
+from price_changes import PriceChangeTracker
+from lineup import Lineup, optimize_lineup
+from chip_planner import CHIP_LABELS, CHIPS, fixture_count_matrix, plan_chips
+import league as ml
+import scenarios as sc
+from export import projection_tables, write_export
+import priors as tier_priors
+from features import (POS_BASELINES, build_fixtures_index, compute_strength_means, get_current_event,
+                      strength_scalar)
+import models
+from models import Features, recent_ppa
+import sensitivity
+import ticker
+import rotation
+import template
+import team_form
+from fixture_model import fit_outcomes
+from pipeline import StreamingClient, iter_summaries
+from history import pack_summary
 
 # ---------- config ----------
 def load_config() -> dict:
@@ -27,22 +47,67 @@ FREE_TRANSFERS = config.get("free_transfers", 1)
 HIT_PENALTY    = config.get("hit_penalty", 4)
 SHORTLIST      = config.get("shortlist", 80)
 SNAPSHOT_DIR   = config.get("snapshot_dir", None)
-REGRESSION_FACTOR = 0.5   # How much to regress to mean (0 = no regression, 1 = full regression)
-MIN_BASELINE = 2.0        # A floor so no projection drops below this average
-# Baselines per position (per-game, rough FPL reality)
-# 1=GK, 2=DEF, 3=MID, 4=FWD
-POS_BASELINES = {
-    1: 3.5,
-    2: 3.0,
-    3: 4.8,
-    4: 5.2,
-}
+API_BASE       = config.get("api_base", None)     # e.g. a local stand-in server
+CACHE_PATH     = config.get("cache_path", None)   # SQLite file shared by concurrent runs
+CACHE_TTL      = config.get("cache_ttl", 900)     # default freshness (s) for endpoints without their own
+FETCH_WORKERS  = int(config.get("fetch_workers", 8))  # API calls in flight at once per run
+HISTORY_FIELDS = config.get("history_fields", []) or []   # per-match fields kept beyond history.HISTORY_FIELDS
+REGRESSION_FACTOR = config.get("regression_factor", 0.5)   # How much to regress to mean (0 = no regression, 1 = full regression)
+MIN_BASELINE = config.get("min_baseline", 2.0)             # A floor so no projection drops below this average
+# Projection model(s) by name (models.py): "regression", or {name: weight, ...} for an ensemble
+PROJECTION_MODELS  = config.get("projection_models", "regression")
+PROJECTION_WORKERS = config.get("projection_workers", None)   # ensemble processes; default one per CPU
+MINUTES_WINDOW = config.get("minutes_window", 6)  # matches the minutes model learns from
+P60_FLOOR      = config.get("p60_floor", 0.4)     # min P(60+) for anyone who started in the window
+# Fitted position x price-tier priors from past seasons replace the flat
+# baselines when priors_path is set (see priors.py; refit once per season)
+PRIORS_PATH    = config.get("priors_path", None)
+PRICE_TIERS    = {int(k): v for k, v in (config.get("price_tiers") or tier_priors.TIER_EDGES).items()}
+TIER_PRIORS = None     # priors.TierPriors, loaded in main()
+# "outcomes": per-fixture team xG / clean-sheet model mixed by position (fixture_model.py);
+# "strength": the plain opponent strength ratio
+FIXTURE_MODEL  = config.get("fixture_model", "outcomes")
+FIXTURE_OUTCOMES = None   # fixture_model.FixtureOutcomes, fitted in main()
+# "form": strength_* moved by opponent-adjusted goals / xG from players' histories,
+# updated once per finished GW into team_form_path (team_form.py); "static": bootstrap's as-is
+TEAM_STRENGTH  = config.get("team_strength", "static")
+TEAM_FORM_PATH = config.get("team_form_path", None)
 MIN_RAW_GAIN = 2.0     # ignore tiny upgrades even before hits
 MIN_NET_GAIN = 0.5     # require at least +0.5 AFTER hits to recommend
 REQUIRE_NO_HIT = False # set True if you only want moves that use a free FT
 GK_SWAP_MIN_GAIN = 8.0   # require ≥8 xPts over horizon if swapping a bench GK (or skip)
 
-
+# price-change watch (optional; see price_changes.py)
+PRICE_WATCH_FILE   = config.get("price_watch_file", None)   # npz of accumulated bootstrap polls
+PRICE_HOURS_AHEAD  = config.get("price_hours_ahead", 12.0)  # hours until the next price update
+PRICE_TIEBREAK     = config.get("price_tiebreak", 0.5)      # xPts credit per expected £0.1m rise
+PRICE_BUDGET_BUFFER = config.get("price_budget_buffer", False)  # plan as if moves happen after tonight's update
+
+
+# chip planner knobs
+CHIPS_AVAILABLE = config.get("chips_available", list(CHIPS))  # wildcard, freehit, bboost, 3xc
+CHIP_HORIZON    = config.get("chip_horizon", 6)      # weeks a wildcard squad is valued over
+CHIP_MIN_EV     = config.get("chip_min_ev", 5.0)     # don't suggest a chip below this gain
+CHIP_BLACKLIST  = config.get("chip_blacklist_weeks", [])
+CHIP_POOL       = config.get("chip_pool", 15)        # per-position pool for FH/WC squads
+
+# mini-league EO / rank swing (optional)
+LEAGUE_ID       = config.get("league_id", None)      # classic league to compare against
+LEAGUE_MAX_ENTRIES = config.get("league_max_entries", None)
+LEAGUE_WORKERS  = config.get("league_workers", 8)    # concurrent picks fetches
+# Top-N overall template ownership sampled by `template.py` workers (SQLite queue)
+TEMPLATE_DB     = config.get("template_db", None)
+TEMPLATE_TOP    = config.get("template_top", 10000)
+
+# lock / avoid constraints and what-if scenarios (see scenarios.py)
+LOCK_PLAYERS    = config.get("lock_players", []) or []
+AVOID_PLAYERS   = config.get("avoid_players", []) or []
+AVOID_CLUBS     = config.get("avoid_clubs", []) or []
+SCENARIOS       = config.get("scenarios", []) or []
+SCENARIO_WORKERS = config.get("scenario_workers", None)   # default: one per CPU
+TICKER_GWS      = config.get("ticker_gws", 5)      # default window for `planner.py ticker`
+ROTATION_GWS    = config.get("rotation_gws", 8)    # default horizon for `planner.py rotation`
+EXPORT_DIR      = config.get("export_dir", None)   # columnar export of each plan run (see export.py)
 
 # auth + headers (for pre-deadline private endpoints)
 AUTH_HEADER    = config.get("auth_header", "")   # "Bearer eyJ..."
@@ -50,6 +115,18 @@ USER_AGENT     = config.get("user_agent", None)
 REFERER        = config.get("referer", None)
 
 # ---------- shared helpers ----------
+def build_client():
+    """Snapshot client if configured, else live client with auth headers."""
+    if SNAPSHOT_DIR:
+        return SnapshotClient(SNAPSHOT_DIR)
+    return FPLClient(
+        auth_header=AUTH_HEADER,
+        user_agent=USER_AGENT,
+        referer=REFERER,
+        cache=SharedCache(CACHE_PATH, ttl=CACHE_TTL) if CACHE_PATH else None,
+        base_url=API_BASE,
+    )
+
 def resolve_picks_with_fallback(client, bootstrap, team_id:int, event_id:int):
     """Try current GW picks; if fails (e.g., pre-season), fallback to last finished GW."""
     try:
@@ -63,58 +140,9 @@ def resolve_picks_with_fallback(client, bootstrap, team_id:int, event_id:int):
 
 POS_INV = {1:"GK",2:"DEF",3:"MID",4:"FWD"}
 
-def _clamp(x: float, lo: float, hi: float) -> float:
-    return lo if x < lo else hi if x > hi else x
-
-def compute_strength_means(teams: list[dict]) -> dict:
-    # League means to normalize opponent strengths into ~1.0
-    n = len(teams) or 1
-    get = lambda k: sum(float(t.get(k, 0) or 0) for t in teams) / n
-    return {
-        "att_home": get("strength_attack_home"),
-        "att_away": get("strength_attack_away"),
-        "def_home": get("strength_defence_home"),
-        "def_away": get("strength_defence_away"),
-    }
-
 def fixture_strength_scalar(fixt: dict, player: dict, teams_by_id: dict, strength_means: dict) -> float:
-    """
-    Returns a single multiplicative scalar for the fixture based on:
-      - opponent attack/defence strength (home/away)
-      - player's position (attackers face opp DEF; GK/DEF face opp ATT)
-      - small home/away bump for the player's team
-    """
-    player_team = player["team"]
-    pos = player.get("element_type", 4)  # 1 GK, 2 DEF, 3 MID, 4 FWD
-    player_is_home = (fixt["team_h"] == player_team)
-
-    opp_id = fixt["team_a"] if player_is_home else fixt["team_h"]
-    opp = teams_by_id.get(opp_id, {})
-
-    # opponent strength fields
-    if player_is_home:
-        # opponent is away
-        opp_att = float(opp.get("strength_attack_away", 0) or 0)
-        opp_def = float(opp.get("strength_defence_away", 0) or 0)
-        mean_att = float(strength_means.get("att_away", 1.0) or 1.0)
-        mean_def = float(strength_means.get("def_away", 1.0) or 1.0)
-    else:
-        # opponent is home
-        opp_att = float(opp.get("strength_attack_home", 0) or 0)
-        opp_def = float(opp.get("strength_defence_home", 0) or 0)
-        mean_att = float(strength_means.get("att_home", 1.0) or 1.0)
-        mean_def = float(strength_means.get("def_home", 1.0) or 1.0)
-
-    # normalize: stronger opp → scalar < 1; weaker opp → scalar > 1
-    if pos in (3, 4):  # attacker faces opponent DEF
-        base = (mean_def / opp_def) if opp_def > 0 else 1.0
-    else:              # GK/DEF face opponent ATT
-        base = (mean_att / opp_att) if opp_att > 0 else 1.0
-
-    base = _clamp(base, 0.6, 1.4)  # keep within sane bounds
-    ha = 1.05 if player_is_home else 0.95  # small home/away edge for the player's team
-
-    return base * ha
+    """features.strength_scalar with the fitted fixture-outcome model (FIXTURE_OUTCOMES), if any."""
+    return strength_scalar(fixt, player, teams_by_id, strength_means, FIXTURE_OUTCOMES)
 
 
 @dataclass
@@ -127,51 +155,11 @@ class PlayerProj:
     xpts_by_gw: Dict[int, float]
     xpts_total: float
     starter: bool
+    p_play: float = 1.0   # chance of any minutes; drives autosub EV in lineups
+    p_play_by_gw: Dict[int, float] = None   # per GW where known (a doubt for the next GW eases after it)
 
-def get_current_event(bootstrap: Dict[str, Any]) -> int:
-    events = bootstrap["events"]
-
-    # Prefer the next gameweek when the site marks one
-    nxt = [e for e in events if e.get("is_next")]
-    if nxt:
-        return nxt[0]["id"]
-
-    # Otherwise use the current GW (bump if already finished)
-    cur = [e for e in events if e.get("is_current")]
-    if cur:
-        e = cur[0]
-        if e.get("is_finished", False):
-            return e["id"] + 1
-        return e["id"]
-
-    # Fallbacks
-    unfinished = [ev for ev in events if not ev.get("is_finished", False)]
-    if unfinished:
-        return min(unfinished, key=lambda x: x["id"])["id"]
-    return max(ev["id"] for ev in events)
-
-
-
-
-def recent_points_ppA(history: List[Dict[str,Any]], n:int=8, decay:float=0.88) -> float:
-    recent = [h for h in history[-n:] if h.get("minutes",0)>0]
-    if not recent: return 0.0
-    w=1.0; num=0.0; den=0.0
-    for h in reversed(recent):
-        num += h.get("total_points",0)*w
-        den += w
-        w *= decay
-    return num/(den or 1.0)
-
-def minutes_scalar(history: List[Dict[str,Any]], player: Dict[str,Any]) -> float:
-    mins=[h.get("minutes",0) for h in history[-6:] if h.get("minutes",0)>0]
-    m_rate = min(1.0, (sum(mins)/len(mins)/90.0)) if mins else 0.0
-    if player.get("chance_of_playing_next_round") is not None:
-        c = max(0.0, min(1.0, player["chance_of_playing_next_round"]/100.0))
-    else:
-        status=player.get("status","a")
-        c = 1.0 if status=="a" else (0.75 if status=="d" else (0.25 if status=="f" else 0.0))
-    return 0.6*c+0.4*m_rate
+    def p_play_in(self, gw: int) -> float:
+        return (self.p_play_by_gw or {}).get(gw, self.p_play)
 
 def fixture_scalars(fixt: Dict[str,Any], player_team:int):
     if fixt["team_h"]==player_team:
@@ -182,81 +170,75 @@ def fixture_scalars(fixt: Dict[str,Any], player_team:int):
     ha_s = 1.05 if home else 0.95
     return diff_s, ha_s
 
-def build_fixtures_index(fixtures:List[Dict[str,Any]]):
-    idx={}
-    for f in fixtures:
-        ev=f.get("event")
-        if ev is None: continue
-        for t in (f["team_h"], f["team_a"]):
-            idx.setdefault(t,{}).setdefault(ev,[]).append(f)
-    return idx
+def position_prior(player: Dict[str,Any]) -> float:
+    pos = player.get("element_type", 4)
+    if TIER_PRIORS is not None and pos in TIER_PRIORS.edges:
+        return TIER_PRIORS.lookup(pos, (player.get("now_cost") or 0) / 10.0)
+    return POS_BASELINES.get(pos, 3.5)
 
 def project_player_points_by_gw(client, player, fixtures_idx, gw_range,
                                 teams_by_id, strength_means):
+    """One player's {gw: xPts}: a one-row projection_table (same models and features)."""
+    table = projection_table(client, [player], fixtures_idx, gw_range, teams_by_id, strength_means)
+    return dict(zip(table["gw"].tolist(), table["xpts"][0].tolist()))
+
+def build_features(client, elements, fixtures_idx, gw_range, team_by_id, strength_means) -> Features:
+    """models.build_features with the planner's fixture scalar, priors and minutes knobs."""
+    return models.build_features(client, elements, fixtures_idx, gw_range,
+                                 lambda f, e: fixture_strength_scalar(f, e, team_by_id, strength_means),
+                                 position_prior, MINUTES_WINDOW, P60_FLOOR)
+
+def projection_models(spec=None):
+    """(model, weight) pairs for `spec` (default PROJECTION_MODELS) with the current knobs."""
+    return models.build(PROJECTION_MODELS if spec is None else spec,
+                        regression=REGRESSION_FACTOR, min_baseline=MIN_BASELINE)
+
+def projection_table(client, elements, fixtures_idx, gw_range, team_by_id, strength_means) -> Dict[str, np.ndarray]:
     """
-    Per-GW projection with:
-      - recent points per appearance
-      - regression to position baseline (using REGRESSION_FACTOR)
-      - minutes floor (nerfs if not nailed)
-      - opponent strength (home/away, attack/defence)
-      - per-fixture floor via MIN_BASELINE to avoid silly tiny numbers
+    Every element projected over gw_range by the configured model(s) as
+    arrays: id, gw, xpts and fixture_scalar (players x GWs; summed over DGW
+    fixtures, 0 for blanks), p60, p_play and minutes_scalar (players x GWs),
+    rppa and prior (per player), plus the models.Features behind xpts
+    (`features`) for re-projection under other knobs (sensitivity.py).
     """
-    summ = client.element_summary(player["id"])
-    hist = summ.get("history", [])
-
-    # 1) recent per-appearance points (your decayed rpPA)
-    recent_pts = recent_points_ppA(hist)
-
-    # 2) regression target = baseline by position
-    pos = player.get("element_type", 4)
-    baseline = POS_BASELINES.get(pos, 3.5)
-
-    # 3) regression mix:
-    #    REGRESSION_FACTOR = 0 → use recent only
-    #    REGRESSION_FACTOR = 1 → use baseline only
-    base = (1.0 - REGRESSION_FACTOR) * recent_pts + REGRESSION_FACTOR * baseline
-
-    # 4) minutes expectation (with simple floor if not nailed)
-    ms = minutes_scalar(hist, player)
-    recent_mins = [h.get("minutes", 0) for h in hist[-3:]]
-    if sum(1 for m in recent_mins if m >= 30) < 2:
-        ms *= 0.7   # gentler nerf than before so we’re not overly negative
-
-    team = player["team"]
-    out = {}
-
-    for ev in gw_range:
-        fxs = fixtures_idx.get(team, {}).get(ev, [])
-        if not fxs:
-            out[ev] = 0.0
-            continue
-
-        total = 0.0
-        for f in fxs:
-            s = fixture_strength_scalar(f, player, teams_by_id, strength_means)
-
-            # raw contribution for this fixture
-            contrib = base * ms * s
-
-            # 5) gentle per-fixture floor so we aren’t absurdly pessimistic
-            #    MIN_BASELINE is interpreted as “floor per fixture”
-            contrib = max(contrib, MIN_BASELINE)
-
-            total += contrib
-
-        out[ev] = total
+    f = build_features(client, elements, fixtures_idx, gw_range, team_by_id, strength_means)
+    return {
+        "id": f.id,
+        "gw": f.gw,
+        "xpts": models.project(projection_models(), f, PROJECTION_WORKERS),
+        "fixture_scalar": np.where(f.mask, f.S, 0.0).sum(-1),
+        "p60": f.p60,
+        "p_play": f.p_play,
+        "minutes_scalar": f.ms,
+        "rppa": recent_ppa(f.points, f.minutes),
+        "prior": f.prior,
+        "features": f,
+    }
 
-    return out
+def table_xmaps(table: Dict[str, np.ndarray], key: str = "xpts") -> Dict[int, Dict[int, float]]:
+    """{element_id: {gw: value}} for one players x GWs column of the table."""
+    gws = table["gw"].tolist()
+    return {eid: dict(zip(gws, row)) for eid, row in zip(table["id"].tolist(), table[key].tolist())}
 
+def project_elements(client, elements, fixtures_idx, gw_range, team_by_id, strength_means):
+    """{element_id: {gw: xPts}} for every element; one batched minutes_model pass."""
+    return table_xmaps(projection_table(client, elements, fixtures_idx, gw_range, team_by_id, strength_means))
 
+def best_lineup(projs:List[PlayerProj], gw:int) -> Lineup:
+    """Exact formation-valid XI, captain/vice and bench order for one GW (see lineup.py)."""
+    return optimize_lineup(
+        [p.xpts_by_gw.get(gw,0.0) for p in projs],
+        [p.pos for p in projs],
+        [p.p_play_in(gw) for p in projs],
+    )
 
+def plan_lineups(projs:List[PlayerProj], gw_range:Iterable[int]) -> Dict[int, Lineup]:
+    return {gw: best_lineup(projs, gw) for gw in gw_range}
 
 def suggest_captain_and_bench(projs:List[PlayerProj], gw:int):
-    starters=[p for p in projs if p.starter]
-    bench=[p for p in projs if not p.starter]
-    bench.sort(key=lambda p: (p.xpts_by_gw.get(gw,0.0), p.pos==1))
-    captain=max(starters, key=lambda p: p.xpts_by_gw.get(gw,0.0))
-    return captain, bench
+    """Captain and bench (autosub order) of the best legal XI for `gw`."""
+    lu = best_lineup(projs, gw)
+    return projs[lu.captain], [projs[i] for i in lu.bench]
 
 def propose_transfers(
     bootstrap,
@@ -272,24 +254,43 @@ def propose_transfers(
     hit_penalty: int = 4,
     shortlist: int = 80,
     max_swaps: int = 2,
+    price_risk: Dict[int, float] = None,
+    xmaps: Dict[int, Dict[int, float]] = None,
+    locked: Iterable[int] = (),
+    avoid: Iterable[int] = (),
+    avoid_clubs: Iterable[int] = (),
+    force_sell: Iterable[int] = (),
+    p_play: Dict[int, float] = None,
 ):
+    """
+    xmaps: optional precomputed project_elements() output for gw_range.
+    p_play: optional {element_id: {gw: chance of any minutes}} (projection_table's
+    p_play via table_xmaps) carried onto the bought players.
+    locked / avoid / avoid_clubs: element ids never sold / never bought, and
+    clubs never bought from. force_sell: ids that must go; each is replaced
+    by the best affordable option even when that loses points. A forced sale
+    with no affordable replacement, or beyond max_swaps, is left out of the
+    result (scenarios.evaluate reports it as unmet).
+    price_risk: optional {element_id: expected £m move tonight} from
+    PriceChangeTracker. Likely risers win near-ties (buying before the rise
+    banks the value); with PRICE_BUDGET_BUFFER the affordability check also
+    assumes buys rise and sells drop before the move is made.
+    """
     by_id = {p.id: p for p in current}
+    price_risk = price_risk or {}
+    p_play = p_play or {}
+    locked, avoid, avoid_clubs = set(locked), set(avoid), set(avoid_clubs)
+    force_sell = set(force_sell) - locked
     elements = bootstrap["elements"]
 
     # Rank candidates by projected xPts over the horizon (safer than "form")
-    scored = []
-    for e in elements:
-        xmap = project_player_points_by_gw(client, e, fixtures_idx, gw_range, team_by_id, strength_means)
-        xtot = sum(xmap.values())
-        scored.append((xtot, e))
+    if xmaps is None:
+        xmaps = project_elements(client, elements, fixtures_idx, gw_range, team_by_id, strength_means)
+    scored = [(sum(xmaps[e["id"]].values()), e) for e in elements]
     candidates = [e for (xtot, e) in sorted(scored, key=lambda t: t[0], reverse=True)[:shortlist]]
 
-    # Precompute candidate totals
-    cand_x = {}
-    for c in candidates:
-        cand_x[c["id"]] = sum(
-            project_player_points_by_gw(client, c, fixtures_idx, gw_range, team_by_id, strength_means).values()
-        )
+    # Candidate totals
+    cand_x = {c["id"]: sum(xmaps[c["id"]].values()) for c in candidates}
 
     # Club counts (max 3 rule)
     club_counts = {}
@@ -304,41 +305,53 @@ def propose_transfers(
     for p in current:
         by_pos.setdefault(p.pos, []).append(p)
 
-    sells = {}
+    # forced sells first, then each remaining position's weakest unlocked player
+    sells = [p for p in current if p.id in force_sell]
     for pos, arr in by_pos.items():
-        arr.sort(key=lambda p: p.xpts_total)
-        if arr:
-            sells[pos] = arr[0]
+        arr = sorted((p for p in arr if p.id not in locked), key=lambda p: p.xpts_total)
+        if arr and not any(p.pos == pos for p in sells):
+            sells.append(arr[0])
+    sells.sort(key=lambda p: (p.id not in force_sell, p.xpts_total))
 
     props = []
     swaps = 0
     bank = bank_m
 
     # For each position's weakest, find the best affordable upgrade
-    for pos, to_sell in sorted(sells.items(), key=lambda kv: kv[1].xpts_total):
+    for to_sell in sells:
+        pos = to_sell.pos
+        forced = to_sell.id in force_sell
         budget = bank + to_sell.cost
+        if PRICE_BUDGET_BUFFER:
+            budget += min(0.0, price_risk.get(to_sell.id, 0.0))
         best = None
         best_gain = 0.0
+        best_score = 0.0 if not forced else float("-inf")
 
         for c in candidates:
             if c["element_type"] != pos:
                 continue
-            if c["id"] in by_id:
+            if c["id"] in by_id or c["id"] in avoid or c["team"] in avoid_clubs:
                 continue
             price = (c.get("now_cost") or 0) / 10.0
+            if PRICE_BUDGET_BUFFER:
+                price += max(0.0, price_risk.get(c["id"], 0.0))
             if price > budget + 1e-6:
                 continue
             if not can_add(c["team"]):
                 continue
 
             gain = cand_x[c["id"]] - to_sell.xpts_total
-            if gain > best_gain + 0.01:
+            # expected rise (in £0.1m units) breaks near-ties between targets
+            score = gain + PRICE_TIEBREAK * price_risk.get(c["id"], 0.0) * 10.0
+            if (gain > 0.0 or forced) and score > best_score + 0.01:
+                best_score = score
                 best_gain = gain
                 best = c
 
-        if best and best_gain > 0.2:
+        if best and (best_gain > 0.2 or forced):
             # avoid paying for bench GK swaps unless they're huge
-            if pos == 1 and not to_sell.starter:
+            if pos == 1 and not to_sell.starter and not forced:
                 # If this is a bench GK and the gain isn't huge, skip.
                 if best_gain < GK_SWAP_MIN_GAIN or swaps >= free_transfers:
                     continue
@@ -346,8 +359,8 @@ def propose_transfers(
             swaps += 1
             hit = 0 if swaps <= free_transfers else hit_penalty
 
-            # NEW: project points per GW for the buy, not just total
-            buy_xmap = project_player_points_by_gw(client, best, fixtures_idx, gw_range, team_by_id, strength_means)
+            # per-GW points for the buy, not just total
+            buy_xmap = xmaps[best["id"]]
             buy_xtot = sum(buy_xmap.values())
 
             props.append(
@@ -362,6 +375,8 @@ def propose_transfers(
                         buy_xmap,      # <--- this was {} before
                         buy_xtot,      # <--- use real total
                         True,
+                        p_play.get(best["id"], {}).get(gw, 1.0),
+                        p_play.get(best["id"]),
                     ),
                     best_gain,
                     best_gain - hit,
@@ -391,6 +406,9 @@ def propose_transfers(
 
     filtered = []
     for sell, buy, raw, net in props:
+        if sell.id in force_sell:
+            filtered.append((sell, buy, raw, net))
+            continue
         if raw < MIN_RAW_GAIN:
             continue
         if buy.xpts_total < MIN_BUY_XPTS:
@@ -402,13 +420,16 @@ def propose_transfers(
         filtered.append((sell, buy, raw, net))
     
         # Recompute hits AFTER filtering, so the first kept move uses free FT(s)
-    filtered.sort(key=lambda x: x[2], reverse=True)  # raw gain desc
+    filtered.sort(key=lambda x: (x[0].id not in force_sell, -x[2]))  # forced, then raw gain desc
 
     final = []
     for i, (sell, buy, raw, _old_net) in enumerate(filtered, start=1):
         hit = 0 if i <= free_transfers else hit_penalty
         net = raw - hit
         uses_hit = (hit > 0)
+        if sell.id in force_sell:
+            final.append((sell, buy, raw, net, uses_hit))
+            continue
         # apply final gates
         if raw < MIN_RAW_GAIN: 
             continue
@@ -421,57 +442,230 @@ def propose_transfers(
     return final
 
 
-def detect_double_gameweeks(fixtures, gw):
-    counts={}
-    for f in fixtures:
-        if f.get("event")!=gw: continue
-        for t in (f["team_h"], f["team_a"]):
-            counts[t]=counts.get(t,0)+1
-    return {t:c for t,c in counts.items() if c>1}
-
-def chip_suggestions(projs, gw, fixtures):
-    out=[]
-    bench=[p for p in projs if not p.starter]
-    bench_x=sum(p.xpts_by_gw.get(gw,0.0) for p in bench)
-    if bench_x>=12.0: out.append(f"Bench Boost looks viable (bench xPts ≈ {bench_x:.1f}).")
-    dgw=detect_double_gameweeks(fixtures, gw)
-    starters=[p for p in projs if p.starter]
-    if starters:
-        cap=max(starters, key=lambda p:p.xpts_by_gw.get(gw,0.0))
-        if dgw.get(cap.team,1)>1: out.append(f"Triple Captain candidate: {cap.name} (team has a DGW).")
-    return out
+def plan_season_chips(client, bootstrap, fixtures, projs, bank, season, fixtures_idx,
+                      team_by_id, strength_means):
+    """
+    Project the squad and a FH/WC pool over every remaining GW and search the
+    chip calendar (see chip_planner.py). The fixture-count matrix is built once.
+    """
+    elements = {e["id"]: e for e in bootstrap["elements"]}
+    squad_pos = np.array([p.pos for p in projs])
+    squad_cost = np.array([p.cost for p in projs])
+
+    # pool: best per position by season points, plus the cheapest enablers
+    pool = {}
+    for pos in (1, 2, 3, 4):
+        arr = [e for e in bootstrap["elements"] if e["element_type"] == pos and e.get("status", "a") == "a"]
+        arr.sort(key=lambda e: e.get("total_points") or 0, reverse=True)
+        for e in arr[:CHIP_POOL] + sorted(arr, key=lambda e: e.get("now_cost") or 0)[:3]:
+            pool[e["id"]] = e
+    pool_els = list(pool.values())
+    # squad and pool in one projection pass over the season
+    table = projection_table(client, [elements[p.id] for p in projs] + pool_els, fixtures_idx, season,
+                             team_by_id, strength_means)
+    squad_x, pool_x = table["xpts"][:len(projs)], table["xpts"][len(projs):]
+
+    team_ids = sorted(team_by_id)
+    counts = fixture_count_matrix(fixtures, team_ids, season)
+    return plan_chips(
+        season, squad_x, squad_pos, squad_cost, bank,
+        pool_x,
+        np.array([e["element_type"] for e in pool_els]),
+        np.array([e["team"] for e in pool_els]),
+        np.array([(e.get("now_cost") or 0) / 10.0 for e in pool_els]),
+        chips=CHIPS_AVAILABLE,
+        wc_horizon=CHIP_HORIZON,
+        min_ev=CHIP_MIN_EV,
+        blacklist=CHIP_BLACKLIST,
+        counts=counts,
+        team_ids=team_ids,
+    )
+
+def league_report(client, bootstrap, league_id, event_id, picks_event, picks, my_total, xmaps, lineup, projs,
+                  transfers):
+    """
+    EO of the league's most-owned players plus the expected rank swing of each
+    captain option and each suggested transfer (see league.py). Rivals' picks
+    are fetched for picks_event (the GW our own picks came from, which is the
+    last finished one before the deadline); xPts are event_id's.
+    """
+    element_ids = np.array([e["id"] for e in bootstrap["elements"]])
+    col = {int(eid): j for j, eid in enumerate(element_ids)}
+    lg = ml.fetch_league(client, league_id, picks_event, element_ids,
+                         max_entries=LEAGUE_MAX_ENTRIES, workers=LEAGUE_WORKERS)
+    mu = np.array([xmaps.get(int(eid), {}).get(event_id, 0.0) for eid in element_ids])
+    # the optimized XI and armband, not the picks as saved
+    chip = picks.get("active_chip")
+    mine = np.zeros(len(element_ids))
+    for i in (range(len(projs)) if chip == "bboost" else lineup.xi):
+        mine[col[projs[i].id]] = 1.0
+    mine[col[projs[lineup.captain].id]] = 3.0 if chip == "3xc" else 2.0
+
+    eo = ml.effective_ownership(lg.mult)
+    xi_cols = [col[projs[i].id] for i in lineup.xi]
+    cap_opts = sorted(xi_cols, key=lambda j: mu[j], reverse=True)[:5]
+    deltas = [ml.captain_deltas(mine, cap_opts)]
+    deltas += [ml.transfer_delta(mine, col[sell.id], col[buy.id])[None, :] for sell, buy, *_ in transfers]
+    ranks = ml.expected_rank(lg, mine, my_total, mu, deltas=np.vstack(deltas), exclude_entry=TEAM_ID)
+
+    names = {e["id"]: e["web_name"] for e in bootstrap["elements"]}
+    print(f"\nMini-league: {lg.name or league_id} ({len(lg.entry_ids)} entries, GW{lg.event} picks)")
+    print(f"   Expected rank with suggested XI/captain: {ranks[0]:.1f}")
+    print("   Highest EO:")
+    for j in np.argsort(-eo["eo"])[:8]:
+        print(f"     {names[int(element_ids[j])]:<20} EO {eo['eo'][j]*100:>5.0f}%  "
+              f"(own {eo['own'][j]*100:.0f}%, C {eo['cap'][j]*100:.0f}%)  yours x{int(mine[j])}  xPts {mu[j]:.2f}")
+    print("   Captain options (expected rank, swing vs suggested):")
+    for k, j in enumerate(cap_opts, start=1):
+        print(f"     {names[int(element_ids[j])]:<20} EO {eo['eo'][j]*100:>5.0f}%  "
+              f"rank {ranks[k]:>6.1f} ({ranks[k] - ranks[0]:+.1f})")
+    for k, (sell, buy, *_) in enumerate(transfers, start=1 + len(cap_opts)):
+        print(f"   Transfer {sell.name} -> {buy.name}: rank {ranks[k]:.1f} ({ranks[k] - ranks[0]:+.1f})")
+
+def run_whatif(ctx, base, raw_scenarios, bootstrap, top=4):
+    """Evaluate the configured scenarios on one shared projection pass and print
+    the best `top` per row block, side by side."""
+    scenarios = [base] + sc.parse_scenarios(bootstrap, raw_scenarios, base)
+    results = sc.run_scenarios(scenarios, propose_transfers, ctx, SCENARIO_WORKERS)
+    results.sort(key=lambda r: r.score, reverse=True)
+    print(f"\nWhat-if scenarios ({len(results)}, ranked by horizon XI xPts minus hits):")
+    for i in range(0, len(results), top):
+        print()
+        print(sc.render_side_by_side(results[i:i + top], best=results[0].score))
+
+def _floats(text: str) -> List[float]:
+    return [float(v) for v in text.split(",") if v.strip()]
+
+def sensitivity_grid(center: float, step: float, n: int = 2, lo: float = 0.0, hi: float = None) -> List[float]:
+    """center +/- n steps, clipped to [lo, hi]."""
+    vals = [round(center + k * step, 4) for k in range(-n, n + 1)]
+    return sorted({v for v in vals if v >= lo and (hi is None or v <= hi)})
+
+def run_sensitivity(args, table, bootstrap, projs, bank, transfers, base):
+    reg = args.regression or sensitivity_grid(REGRESSION_FACTOR, 0.1, lo=0.0, hi=1.0)
+    mb = args.min_baseline or sensitivity_grid(MIN_BASELINE, 0.25)
+    hits = args.hit or sensitivity_grid(HIT_PENALTY, 2, n=1)
+    elements = {e["id"]: e for e in bootstrap["elements"]}
+    res = sensitivity.run_grid(
+        table, elements, projs, bank, transfers, reg, mb, hits,
+        free_transfers=FREE_TRANSFERS, min_raw_gain=MIN_RAW_GAIN, min_net_gain=MIN_NET_GAIN,
+        locked=base.lock, avoid=base.avoid, avoid_clubs=base.avoid_clubs,
+        spec=PROJECTION_MODELS, workers=PROJECTION_WORKERS,
+    )
+    print(f"\nSensitivity: regression_factor x min_baseline ({len(reg)}x{len(mb)}), "
+          f"hit penalty {', '.join(f'-{h:g}' for h in hits)}; * = current settings\n")
+    print(sensitivity.render(res, {i: e["web_name"] for i, e in elements.items()}, transfers,
+                             FREE_TRANSFERS, current=(REGRESSION_FACTOR, MIN_BASELINE)))
+
+def run_ticker(args, bootstrap, fixtures, event_id):
+    team_by_id = {t["id"]: t for t in bootstrap["teams"]}
+    strength_means = compute_strength_means(bootstrap["teams"])
+    events = sorted(e["id"] for e in bootstrap["events"])
+    start = args.start or event_id
+    if start not in events:
+        raise SystemExit(f"GW{start} is not in this season's events")
+    t = ticker.build_ticker(fixtures, list(team_by_id), events,
+                            lambda f, p: fixture_strength_scalar(f, p, team_by_id, strength_means))
+    print(f"\nFixture ticker – GW{start}-GW{min(start + args.gws - 1, events[-1])}, ranked by {args.by} "
+          f"(sum of strength scalars; >1 per game is a kind fixture, blanks score 0)\n")
+    print(ticker.render(t, start, args.gws, args.by, {i: tm["short_name"] for i, tm in team_by_id.items()}))
+
+def run_rotation(args, table, bootstrap):
+    pos = {v: k for k, v in POS_INV.items()}[args.pos]
+    elements = {e["id"]: e for e in bootstrap["elements"]}
+    rows = [k for k, i in enumerate(table["id"].tolist()) if elements[i]["element_type"] == pos]
+    ids = table["id"][rows]
+    els = [elements[int(i)] for i in ids]
+    pairs = rotation.rotation_pairs(
+        ids, table["xpts"][rows], [(e.get("now_cost") or 0) / 10.0 for e in els], [e["team"] for e in els],
+        top=args.top, by=args.by, max_cost=args.max_cost, distinct_clubs=not args.same_club,
+        min_starts=args.min_starts,
+    )
+    team_by_id = {t["id"]: t for t in bootstrap["teams"]}
+    gws = table["gw"].tolist()
+    cap = f", pair ≤ £{args.max_cost:.1f}m" if args.max_cost else ""
+    print(f"\nRotation pairs – {args.pos}, GW{gws[0]}-GW{gws[-1]}, ranked by {args.by}{cap} "
+          f"({len(ids)} players; A/B = who plays each GW)\n")
+    print(rotation.render(pairs, gws, {e["id"]: e["web_name"] for e in els},
+                          {e["id"]: team_by_id[e["team"]]["short_name"] for e in els}))
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="FPL planner")
+    sub = ap.add_subparsers(dest="mode")
+    pl = sub.add_parser("plan", help="lineup, captain, chips and transfers (default)")
+    pl.add_argument("--export", metavar="DIR", help="write the projection matrix + transfers as columns")
+    wi = sub.add_parser("whatif", help="compare lock/avoid/sell scenarios side by side")
+    wi.add_argument("--scenarios", help="YAML file with a `scenarios:` list (default: config.yaml)")
+    se = sub.add_parser("sensitivity", help="does the transfer advice survive other model knobs?")
+    se.add_argument("--regression", type=_floats, help="regression_factor grid, e.g. 0.3,0.5,0.7")
+    se.add_argument("--min-baseline", type=_floats, help="min_baseline grid, e.g. 1.5,2,2.5")
+    se.add_argument("--hit", type=_floats, help="hit_penalty values, e.g. 2,4,6")
+    tk = sub.add_parser("ticker", help="clubs ranked by upcoming fixture run")
+    tk.add_argument("--gws", type=int, default=TICKER_GWS, help="window length in GWs")
+    tk.add_argument("--from", dest="start", type=int, help="first GW of the window (default: next GW)")
+    tk.add_argument("--by", choices=ticker.KINDS, default="overall", help="rank by attack, defence or overall")
+    ro = sub.add_parser("rotation", help="best two-player rotations for one position")
+    ro.add_argument("--pos", choices=list(POS_INV.values()), default="GK")
+    ro.add_argument("--gws", type=int, default=ROTATION_GWS, help="GWs to rotate over")
+    ro.add_argument("--max-cost", type=float, help="cap on the pair's combined price (£m)")
+    ro.add_argument("--by", choices=rotation.ORDERS, default="value", help="rank by points per £m or points")
+    ro.add_argument("--top", type=int, default=10)
+    ro.add_argument("--same-club", action="store_true", help="allow both players from one club")
+    ro.add_argument("--min-starts", type=int, default=rotation.MIN_STARTS, help="GWs each player must be the pick")
+    args = ap.parse_args(argv)
+    if args.mode is None:
+        args = ap.parse_args(["plan"] + list(argv if argv is not None else []))
+    return args
 
 # ---------- main ----------
-def main():
-    # Build client: snapshot or live with auth headers
-    if SNAPSHOT_DIR:
-        client = SnapshotClient(SNAPSHOT_DIR)
-    else:
-        client = FPLClient(
-            auth_header=AUTH_HEADER,
-            user_agent=USER_AGENT,
-            referer=REFERER,
-        )
-
+def main(argv=None):
+    args = parse_args(argv)
+    # snapshot or live client; calls run on a fetch pool so independent ones overlap
+    extra = list(dict.fromkeys(list(HISTORY_FIELDS) + (list(team_form.FIELDS) if TEAM_STRENGTH == "form" else [])))
+    pack = lambda summ: pack_summary(summ, extra)
+    with StreamingClient(build_client(), FETCH_WORKERS, pack=pack) as client:
+        run(args, client)
+
+def run(args, client):
+    # fixtures and entry don't depend on bootstrap: start them first
+    fixtures_f = client.submit(client.fixtures)
+    entry_f = client.submit(client.entry, TEAM_ID)
     bootstrap=client.bootstrap()
-    fixtures=client.fixtures()
-    fixtures_idx=build_fixtures_index(fixtures)
     event_id=get_current_event(bootstrap)
-    entry=client.entry(TEAM_ID)
+    if args.mode != "ticker":
+        # picks go out ahead of the summaries queued behind them
+        picks_f = client.submit(resolve_picks_with_fallback, client, bootstrap, TEAM_ID, event_id)
+        client.prefetch_summaries([e["id"] for e in bootstrap["elements"]])
+    fixtures=fixtures_f.result()
+    fixtures_idx=build_fixtures_index(fixtures)
+    if TEAM_STRENGTH == "form":
+        # only a newly finished GW needs the histories (already in flight); the ticker uses the store as is
+        ids = [e["id"] for e in bootstrap["elements"]]
+        histories = None if args.mode == "ticker" else (
+            lambda: (summ.get("history", []) for _, summ in iter_summaries(client, ids)))
+        form = team_form.load_or_update(TEAM_FORM_PATH, fixtures, bootstrap["teams"], histories, event_id)
+        bootstrap = {**bootstrap, "teams": form.apply(bootstrap["teams"])}
+    global FIXTURE_OUTCOMES
+    if FIXTURE_MODEL == "outcomes":
+        FIXTURE_OUTCOMES = fit_outcomes(fixtures, bootstrap["teams"])
+    if args.mode == "ticker":
+        run_ticker(args, bootstrap, fixtures, event_id)
+        return
+    entry=entry_f.result()
 
     # Build GW range from config horizon
     events_sorted=[e["id"] for e in sorted(bootstrap["events"], key=lambda x:x["id"])]
     start_idx=events_sorted.index(event_id)
-    gw_range=events_sorted[start_idx:start_idx+HORIZON]
+    gw_range=events_sorted[start_idx:start_idx+(args.gws if args.mode == "rotation" else HORIZON)]
 
-    # Fetch picks with pre-deadline fallback to /my-team/
+    # Picks with pre-deadline fallback to /my-team/
     try:
-        event_id, picks = resolve_picks_with_fallback(client, bootstrap, TEAM_ID, event_id)
+        picks_event, picks = picks_f.result()
     except requests.HTTPError as e:
         status = getattr(e.response, "status_code", None)
         if AUTH_HEADER and status in (401, 403, 404):
             my = client.my_team(TEAM_ID)
-            picks = {"picks": my["picks"], "active_chip": my.get("active_chip")}
+            picks_event, picks = event_id, {"picks": my["picks"], "active_chip": my.get("active_chip")}
         else:
             raise
 
@@ -479,32 +673,90 @@ def main():
     team_by_id={t["id"]:t for t in bootstrap["teams"]}
     strength_means = compute_strength_means(bootstrap["teams"])
 
+    global TIER_PRIORS
+    if PRIORS_PATH:
+        TIER_PRIORS = tier_priors.load_or_fit(PRIORS_PATH, bootstrap, client.element_summary,
+                                              POS_BASELINES, PRICE_TIERS)
+
+    # Price-change risk from accumulated bootstrap polls (this run adds one)
+    price_risk = {}
+    if PRICE_WATCH_FILE:
+        tracker = PriceChangeTracker.load(PRICE_WATCH_FILE, hours_ahead=PRICE_HOURS_AHEAD)
+        tracker.observe(bootstrap)
+        tracker.save(PRICE_WATCH_FILE)
+        price_risk = tracker.expected_change_by_id()
+
+    # every element is projected as its summary lands; the squad is read off the table
+    table = projection_table(client, bootstrap["elements"], fixtures_idx, gw_range, team_by_id, strength_means)
+    if args.mode == "rotation":
+        run_rotation(args, table, bootstrap)
+        return
+    xmaps = table_xmaps(table)
+    pmaps = table_xmaps(table, "p_play")
 
     projs=[]
     for p in picks["picks"]:
-        el=elements[p["element"]]
+        el = elements[p["element"]]
         is_starter=p.get("position",0)<=11
-        xgw = project_player_points_by_gw(client, el, fixtures_idx, gw_range, team_by_id, strength_means)
+        xgw = xmaps[el["id"]]
         xtot=sum(xgw.values())
-        projs.append(PlayerProj(el["id"], el["web_name"], el["element_type"], el["team"], el["now_cost"]/10.0, xgw, xtot, is_starter))
-
-    captain, bench = suggest_captain_and_bench(projs, event_id)
+        projs.append(PlayerProj(el["id"], el["web_name"], el["element_type"], el["team"], el["now_cost"]/10.0, xgw, xtot, is_starter,
+                                pmaps[el["id"]].get(event_id, 1.0), pmaps[el["id"]]))
+
+    # Best legal XI per GW; this GW's XI replaces the picked starters from here on
+    lineups = plan_lineups(projs, gw_range)
+    lineup = lineups.get(event_id) or best_lineup(projs, event_id)
+    picked_xi = {p.id for p in projs if p.starter}
+    for i, p in enumerate(projs):
+        p.starter = i in lineup.xi
+    captain, vice = projs[lineup.captain], projs[lineup.vice]
+    bench = [projs[i] for i in lineup.bench]
     bank=entry.get("bank",0)/10.0
-    transfers = propose_transfers(
-        bootstrap,
-        projs,
-        bank,
-        event_id,
-        gw_range,
-        client,
-        fixtures_idx,
-        team_by_id,
-        strength_means,
+    base = sc.Scenario(
+        "config",
+        lock=sc.resolve_players(bootstrap, LOCK_PLAYERS),
+        avoid=sc.resolve_players(bootstrap, AVOID_PLAYERS),
+        avoid_clubs=sc.resolve_clubs(bootstrap, AVOID_CLUBS),
+    )
+    # everything a transfer search needs; scenarios only add constraints
+    ctx = dict(
+        bootstrap=bootstrap,
+        current=projs,
+        bank_m=bank,
+        gw=event_id,
+        gw_range=gw_range,
+        client=None,
+        fixtures_idx=fixtures_idx,
+        team_by_id=team_by_id,
+        strength_means=strength_means,
         free_transfers=FREE_TRANSFERS,
         hit_penalty=HIT_PENALTY,
         shortlist=SHORTLIST,
         max_swaps=2,
-)
+        price_risk=price_risk,
+        xmaps=xmaps,
+        p_play=pmaps,
+    )
+
+    if args.mode == "whatif":
+        raw = SCENARIOS
+        if args.scenarios:
+            with open(args.scenarios, "r") as f:
+                raw = (yaml.safe_load(f) or {}).get("scenarios", [])
+        print(f"\nFPL Planner – Team {TEAM_ID} | GW{event_id} | Horizon {HORIZON} | Bank £{bank:.1f}m")
+        run_whatif(ctx, base, raw, bootstrap)
+        return
+
+    transfers = propose_transfers(**ctx, locked=base.lock, avoid=base.avoid, avoid_clubs=base.avoid_clubs)
+
+    if args.mode == "sensitivity":
+        run_sensitivity(args, table, bootstrap, projs, bank, transfers, base)
+        return
+
+    export_dir = args.export or EXPORT_DIR
+    if export_dir:
+        write_export(export_dir, projection_tables(bootstrap, table, projs, transfers),
+                     {"team_id": TEAM_ID, "event": event_id, "horizon": HORIZON})
 
 
     def fmt(p):
@@ -516,23 +768,71 @@ def main():
             f"{team_by_id[p.team]['short_name']}"
         )
 
+    def price_note(pid):
+        d = price_risk.get(pid, 0.0)
+        if d >= 0.05:
+            return "  [price rise likely]"
+        if d <= -0.05:
+            return "  [price drop likely]"
+        return ""
+
     print(f"\nFPL Planner – Team {TEAM_ID}")
     print(f"Current GW: {event_id} | Horizon: {HORIZON} GWs | Bank: £{bank:.1f}m | FTs: {FREE_TRANSFERS} | Hit: -{HIT_PENALTY} per extra\n")
 
     starters = sorted([p for p in projs if p.starter], key=lambda x:x.xpts_by_gw.get(event_id,0.0), reverse=True)
-    print("Starters (sorted by GW xPts):")
+    print(f"Starters ({'-'.join(map(str, lineup.formation))}, sorted by GW xPts):")
     for p in starters: print("  ", fmt(p))
 
-    print("\nBench order (low GW xPts first):")
+    moved_in = [p.name for p in projs if p.starter and p.id not in picked_xi]
+    moved_out = [p.name for p in projs if not p.starter and p.id in picked_xi]
+    if moved_in:
+        print(f"   Lineup changes vs picks: IN {', '.join(moved_in)} | OUT {', '.join(moved_out)}")
+
+    print("\nBench order (autosub priority):")
     for p in bench: print("  ", fmt(p))
 
     print("\nCaptain suggestion:")
     print("  ", fmt(captain))
-
-    tips=chip_suggestions(projs, event_id, fixtures)
-    if tips:
-        print("\nChip planning signals:")
-        for t in tips: print("  -", t)
+    print(f"   Vice: {vice.name}")
+
+    if len(lineups) > 1:
+        print("\nBest XI by GW:")
+        for gw, lu in lineups.items():
+            print(f"   GW{gw}: {'-'.join(map(str, lu.formation))}  C {projs[lu.captain].name:<15} "
+                  f"V {projs[lu.vice].name:<15} xPts {lu.xpts:>6.2f} (autosub EV {lu.autosub_ev:+.2f})")
+
+    season = [ev for ev in events_sorted if ev >= event_id]
+    if CHIPS_AVAILABLE and season:
+        plan = plan_season_chips(client, bootstrap, fixtures, projs, bank, season, fixtures_idx,
+                                 team_by_id, strength_means)
+        squad_teams = {p.team for p in projs}
+        print("\nChip planning signals (season):")
+        if not plan.assignments:
+            print(f"  - No chip clears +{CHIP_MIN_EV:.1f} xPts in the remaining GWs.")
+        for chip, (gw, ev) in sorted(plan.assignments.items(), key=lambda kv: kv[1][0]):
+            tags = []
+            if any(t in squad_teams for t in plan.dgw_teams.get(gw, [])):
+                tags.append("DGW")
+            if any(t in squad_teams for t in plan.bgw_teams.get(gw, [])):
+                tags.append("BGW")
+            tag = f" ({'/'.join(tags)})" if tags else ""
+            print(f"  - {CHIP_LABELS[chip]:<15} GW{gw}{tag}: +{ev:.1f} xPts")
+
+    if LEAGUE_ID:
+        league_report(client, bootstrap, LEAGUE_ID, event_id, picks_event, picks,
+                      entry.get("summary_overall_points", 0), xmaps, lineup, projs, transfers)
+
+    tmpl = template.load(TEMPLATE_DB)
+    if tmpl is not None:
+        xtot = {i: sum(x.values()) for i, x in xmaps.items()}
+        yours, threats = template.differentials(tmpl, xtot, [p.id for p in projs])
+        name = {e["id"]: e["web_name"] for e in bootstrap["elements"]}
+        print(f"\nTemplate (top {tmpl.n} sampled, GW{tmpl.event}; horizon xPts vs their EO):")
+        print("  Your differentials: " + ", ".join(f"{name[i]} {v:.1f} (EO {eo:.2f})" for i, v, eo in yours))
+        print("  Template threats:   " + ", ".join(f"{name[i]} {v:.1f} (EO {eo:.2f})" for i, v, eo in threats))
+
+    def eo_note(pid):
+        return f"  [template EO {tmpl.eo_of(pid):.2f}]" if tmpl is not None else ""
 
     if transfers:
         print("\nTransfer suggestions (xPts over horizon; raw vs net after hits):")
@@ -548,8 +848,8 @@ def main():
             else:
                 st_note = ""
 
-            print(f"  SELL  {sell.name:<20} {POS_INV[sell.pos]:<3} £{sell.cost:>4.1f}  {HORIZON}GW:{sell.xpts_total:>6.2f}")
-            print(f"  BUY   {buy.name:<20}  {POS_INV[buy.pos]:<3} £{buy.cost:>4.1f}  {HORIZON}GW:{buy.xpts_total:>6.2f}")
+            print(f"  SELL  {sell.name:<20} {POS_INV[sell.pos]:<3} £{sell.cost:>4.1f}  {HORIZON}GW:{sell.xpts_total:>6.2f}{price_note(sell.id)}{eo_note(sell.id)}")
+            print(f"  BUY   {buy.name:<20}  {POS_INV[buy.pos]:<3} £{buy.cost:>4.1f}  {HORIZON}GW:{buy.xpts_total:>6.2f}{price_note(buy.id)}{eo_note(buy.id)}")
             print(f"  ==> Gain: +{raw:.2f} xPts | Net after hits: {net:+.2f}{hit_note} | GW{event_id} Δ: {delta_now:+.2f}{st_note}\n")
     else:
         print("\nNo positive net-EV transfer found given FTs/hit. Consider rolling.")
@@ -0,0 +1,174 @@
+"""
+Position x price-tier priors from past seasons.
+
+`history_past` (one row per player per finished season, from
+element-summary) is ingested once into a compact local store (npz):
+position, that season's start cost, points and minutes per row. Priors are
+fitted in one vectorized pass: rows are bucketed by position and price tier
+(TIER_EDGES, £m) and each bucket's prior is its pooled points per
+appearance - the unit the planner's recent points per appearance regresses
+toward - shrunk toward the flat position baseline with PRIOR_STRENGTH
+pseudo-appearances:
+
+  prior[pos, tier] = (points + k * baseline[pos]) / (appearances + k)
+
+history_past has no appearance count, so it is estimated from starts and
+minutes: each start is taken as START_MINUTES and the minutes left over as
+cameos of SUB_MINUTES (seasons without `starts`: minutes / START_MINUTES).
+
+past seasons don't change mid-season, so the store is keyed by the current
+season label and only rebuilt when a new season starts (or it's missing).
+A player's prior is looked up from his *current* price.
+"""
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# tier boundaries (£m) per position: tier k covers [edges[k-1], edges[k])
+TIER_EDGES = {
+    1: [4.5, 5.0, 5.5],
+    2: [4.5, 5.0, 5.5, 6.0],
+    3: [5.5, 7.0, 9.0, 11.0],
+    4: [6.0, 7.5, 9.0, 11.0],
+}
+PRIOR_STRENGTH = 30.0   # pseudo-appearances behind the flat position baseline
+MIN_MINUTES = 270       # ignore seasons with fewer minutes than this
+START_MINUTES = 85.0    # typical minutes of a start
+SUB_MINUTES = 20.0      # typical minutes of a cameo
+
+
+@dataclass
+class TierPriors:
+    season: str
+    edges: Dict[int, List[float]]
+    table: np.ndarray       # (5, max tiers); row = position, unused cells NaN
+    apps: np.ndarray        # evidence behind each cell (appearances)
+
+    def lookup(self, pos: int, cost: float) -> float:
+        tier = int(np.searchsorted(self.edges[pos], cost, side="right"))
+        return float(self.table[pos, tier])
+
+    def lookup_many(self, pos: np.ndarray, cost: np.ndarray) -> np.ndarray:
+        out = np.empty(len(pos))
+        for p, edges in self.edges.items():
+            m = pos == p
+            out[m] = self.table[p, np.searchsorted(edges, cost[m], side="right")]
+        return out
+
+
+def season_label(bootstrap: Dict[str, Any]) -> str:
+    """'2025/26' from the first GW deadline (the season history_past excludes)."""
+    deadlines = [e.get("deadline_time") for e in bootstrap.get("events", []) if e.get("deadline_time")]
+    if not deadlines:
+        return "unknown"
+    y = int(min(deadlines)[:4])
+    return f"{y}/{(y + 1) % 100:02d}"
+
+
+# ---------- store ----------
+def ingest(elements: Sequence[Dict[str, Any]], summaries: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """history_past of every element as flat columns (one row per player-season)."""
+    pos, cost, pts, mins, starts, eid = [], [], [], [], [], []
+    for el, summ in zip(elements, summaries):
+        for h in summ.get("history_past", []) or []:
+            pos.append(el["element_type"])
+            cost.append((h.get("start_cost") or el.get("now_cost") or 0) / 10.0)
+            pts.append(h.get("total_points", 0) or 0)
+            mins.append(h.get("minutes", 0) or 0)
+            st = h.get("starts")
+            starts.append(np.nan if st is None else st)
+            eid.append(el["id"])
+    return {
+        "element": np.array(eid, dtype=np.int32),
+        "pos": np.array(pos, dtype=np.int8),
+        "cost": np.array(cost, dtype=np.float32),
+        "points": np.array(pts, dtype=np.float32),
+        "minutes": np.array(mins, dtype=np.float32),
+        "starts": np.array(starts, dtype=np.float32),
+    }
+
+
+def appearances(minutes: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Estimated appearances per row (see module docstring)."""
+    minutes = minutes.astype(float)
+    st = starts.astype(float)
+    cameo = np.maximum(minutes - np.nan_to_num(st) * START_MINUTES, 0.0) / SUB_MINUTES
+    est = np.where(np.isnan(st), minutes / START_MINUTES, st + cameo)
+    return np.maximum(est, minutes / 90.0)
+
+
+def fit_priors(rows: Dict[str, np.ndarray], baselines: Dict[int, float], season: str,
+               edges: Dict[int, List[float]] = None, strength: float = PRIOR_STRENGTH) -> TierPriors:
+    """Bucket every row by (position, tier) and fit all cells at once (bincount)."""
+    edges = edges or TIER_EDGES
+    width = max(len(e) for e in edges.values()) + 1
+    pos = rows["pos"].astype(np.int64)
+    cost = rows["cost"].astype(float)
+    keep = (rows["minutes"] >= MIN_MINUTES) & np.isin(pos, list(edges))
+
+    tier = np.zeros(len(pos), dtype=np.int64)
+    for p, e in edges.items():
+        m = pos == p
+        tier[m] = np.searchsorted(e, cost[m], side="right")
+    cell = (pos * width + tier)[keep]
+
+    size = 5 * width
+    pts = np.bincount(cell, weights=rows["points"][keep], minlength=size).reshape(5, width)
+    starts = rows.get("starts", np.full(len(pos), np.nan))
+    apps = appearances(rows["minutes"], starts)[keep]
+    apps = np.bincount(cell, weights=apps, minlength=size).reshape(5, width)
+    base = np.array([baselines.get(p, 3.5) for p in range(5)])[:, None]
+    table = (pts + strength * base) / (apps + strength)
+
+    valid = np.zeros((5, width), dtype=bool)
+    for p, e in edges.items():
+        valid[p, : len(e) + 1] = True
+    table[~valid] = np.nan
+    return TierPriors(season, {int(p): list(e) for p, e in edges.items()}, table, apps)
+
+
+def save(path: str, rows: Dict[str, np.ndarray], priors: TierPriors) -> None:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = path + ".tmp.npz"
+    edges = np.full((5, priors.table.shape[1] - 1), np.nan)
+    for p, e in priors.edges.items():
+        edges[p, : len(e)] = e
+    np.savez(tmp, season=np.array(priors.season), table=priors.table, apps=priors.apps, edges=edges, **rows)
+    os.replace(tmp, path)
+
+
+def load(path: str) -> Tuple[Optional[TierPriors], Optional[Dict[str, np.ndarray]]]:
+    if not os.path.exists(path):
+        return None, None
+    with np.load(path) as z:
+        if "apps" not in z:              # per-90 store from before priors were per appearance: refit
+            return None, None
+        edges = {p: [float(v) for v in z["edges"][p] if not np.isnan(v)] for p in range(1, 5)}
+        priors = TierPriors(str(z["season"]), edges, z["table"], z["apps"])
+        rows = {k: z[k] for k in ("element", "pos", "cost", "points", "minutes", "starts")}
+    return priors, rows
+
+
+def load_or_fit(path: Optional[str], bootstrap: Dict[str, Any], summary: Callable[[int], Dict[str, Any]],
+                baselines: Dict[int, float], edges: Dict[int, List[float]] = None) -> TierPriors:
+    """
+    Cached priors for the current season; otherwise ingest every element's
+    history_past (via `summary(element_id)`), fit, and store. path=None
+    always refits (nothing is stored).
+    """
+    season = season_label(bootstrap)
+    edges = edges or TIER_EDGES
+    if path:
+        cached, _ = load(path)
+        if cached is not None and cached.season == season and cached.edges == {int(p): list(e) for p, e in edges.items()}:
+            return cached
+    elements = bootstrap["elements"]
+    rows = ingest(elements, (summary(e["id"]) for e in elements))
+    priors = fit_priors(rows, baselines, season, edges)
+    if path:
+        save(path, rows, priors)
+    return priors
@@ -0,0 +1,215 @@
+"""
+Local stand-in for the FPL API, replaying a snapshot directory over HTTP.
+
+Serves the same URL shapes FPLClient requests (same payloads as
+SnapshotClient reads), so the real HTTP path - keep-alive connection reuse,
+timeouts, retries in FPLClient._fetch_json - can be exercised and
+benchmarked offline:
+
+  /api/bootstrap-static/                      bootstrap-static.json
+  /api/fixtures/[?event=N]                    fixtures.json
+  /api/entry/<id>/                            entry.json
+  /api/entry/<id>/event/<gw>/picks/           picks/<id>.json or picks.json
+  /api/element-summary/<id>/                  element_summaries/<id>.json (404 when absent)
+  /api/my-team/<id>/                          my-team.json (else built from picks.json)
+  /api/event/<gw>/live/                       live/<gw>.json
+  /api/leagues-classic/<id>/standings/        leagues/<id>.json
+
+Faults are injected per request: fixed latency (+ jitter), a share of
+responses answered 429 (with Retry-After) or 5xx, and a per-response
+bandwidth cap (the body is trickled out in chunks).
+
+  python3 replay_server.py snapshots/ --port 8765 --latency 0.05 --error-rate 0.05 --bandwidth 500000
+
+then point the planner at it with `api_base: http://127.0.0.1:8765/api`.
+Per-route counts are printed on Ctrl-C.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from fpl_client import SnapshotClient
+
+
+@dataclass
+class Faults:
+    latency: float = 0.0          # seconds before every response
+    jitter: float = 0.0           # + uniform(0, jitter)
+    error_rate: float = 0.0       # share of requests answered with an error code
+    error_codes: Tuple[int, ...] = (429, 500, 502, 503)
+    retry_after: float = 1.0      # Retry-After (s) sent with 429s
+    bandwidth: float = 0.0        # bytes/s per response, 0 = unlimited
+    seed: Optional[int] = None
+
+
+def _my_team(snap: SnapshotClient, team_id: int) -> Dict[str, Any]:
+    if os.path.exists(os.path.join(snap.dir, "my-team.json")):
+        return snap._load("my-team.json")
+    picks = snap.entry_picks(team_id, 0)
+    return {"picks": picks.get("picks", []), "chips": [], "transfers": {}}
+
+
+# path regex -> handler(snapshot, match groups as ints, query)
+ROUTES: Tuple[Tuple[re.Pattern, Callable], ...] = tuple((re.compile(p), fn) for p, fn in (
+    (r"^/api/bootstrap-static/$", lambda s, g, q: s.bootstrap()),
+    (r"^/api/fixtures/$", lambda s, g, q: s.fixtures(int(q["event"][0]) if "event" in q else None)),
+    (r"^/api/entry/(\d+)/$", lambda s, g, q: s.entry(g[0])),
+    (r"^/api/entry/(\d+)/event/(\d+)/picks/$", lambda s, g, q: s.entry_picks(g[0], g[1])),
+    (r"^/api/element-summary/(\d+)/$", lambda s, g, q: s._load(os.path.join("element_summaries", f"{g[0]}.json"))),
+    (r"^/api/my-team/(\d+)/$", lambda s, g, q: _my_team(s, g[0])),
+    (r"^/api/event/(\d+)/live/$", lambda s, g, q: s.event_live(g[0])),
+    (r"^/api/leagues-classic/(\d+)/standings/$", lambda s, g, q: s.league_standings(g[0])),
+))
+
+
+class ReplayServer:
+    def __init__(self, snapshot_dir: str, faults: Faults = None, host: str = "127.0.0.1", port: int = 0):
+        self.snapshot = SnapshotClient(snapshot_dir)
+        self.faults = faults or Faults()
+        self.rng = random.Random(self.faults.seed)
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "not_found": 0, "bytes": 0, "connections": 0}
+        self._bodies: Dict[str, bytes] = {}      # encoded once per path (the snapshot doesn't change)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def _roll(self) -> Tuple[float, Optional[int]]:
+        """(delay, error code or None) for one request."""
+        f = self.faults
+        with self._lock:
+            delay = f.latency + (self.rng.uniform(0, f.jitter) if f.jitter else 0.0)
+            code = self.rng.choice(f.error_codes) if f.error_rate and self.rng.random() < f.error_rate else None
+        return delay, code
+
+    def body_for(self, path: str) -> Optional[bytes]:
+        body = self._bodies.get(path)
+        if body is not None:
+            return body
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        for pattern, fn in ROUTES:
+            m = pattern.match(parts.path)
+            if m:
+                try:
+                    obj = fn(self.snapshot, [int(x) for x in m.groups()], query)
+                except FileNotFoundError:
+                    return None
+                body = json.dumps(obj).encode()
+                self._bodies[path] = body
+                return body
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"       # keep-alive, so clients can reuse connections
+            disable_nagle_algorithm = True      # headers and body go out as separate writes
+
+            def setup(self):
+                super().setup()
+                server._count("connections")
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._count("requests")
+                delay, code = server._roll()
+                if delay:
+                    time.sleep(delay)
+                if code is not None:
+                    server._count("errors")
+                    self._send(code, b'"injected"', {"Retry-After": f"{server.faults.retry_after:g}"} if code == 429 else {})
+                    return
+                body = server.body_for(self.path)
+                if body is None:
+                    server._count("not_found")
+                    self._send(404, b'"The game is being updated."')
+                    return
+                server._count(f"GET {urlsplit(self.path).path.split('/')[2]}")
+                self._send(200, body)
+
+            def _send(self, code: int, body: bytes, headers: Dict[str, str] = None):
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                bw = server.faults.bandwidth
+                if not bw:
+                    self.wfile.write(body)
+                else:
+                    chunk = max(1024, int(bw / 20))
+                    for i in range(0, len(body), chunk):
+                        part = body[i:i + chunk]
+                        self.wfile.write(part)
+                        time.sleep(len(part) / bw)
+                server._count("bytes", len(body))
+
+        return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay a snapshot directory as a local FPL API.")
+    ap.add_argument("snapshot_dir")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra uniform(0, jitter) seconds")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 429/5xx")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429s")
+    ap.add_argument("--bandwidth", type=float, default=0.0, help="bytes/s per response (0 = unlimited)")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    faults = Faults(args.latency, args.jitter, args.error_rate, retry_after=args.retry_after,
+                    bandwidth=args.bandwidth, seed=args.seed)
+    srv = ReplayServer(args.snapshot_dir, faults, args.host, args.port)
+    print(f"Serving {args.snapshot_dir} at {srv.url}")
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.httpd.server_close()
+        for k, v in sorted(srv.stats.items()):
+            print(f"  {k:<24} {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Rotation pairs: two cheap players of one position sharing a slot.
+
+Each GW the better-projected of the pair plays, so a pair's horizon value
+is
+
+  points[i, j] = sum_g max(x[i, g], x[j, g])
+
+evaluated for every pair at once by broadcasting the position's players x
+GWs xPts matrix against itself (in row blocks to bound memory). Pairs are
+ranked either by raw points or by points per £m of the pair's combined
+price ("value"), with optional caps on that price and a different-clubs
+rule. Each must be the one to play in at least MIN_STARTS GWs, or the
+"pair" is a starter plus a bench fodder. `gain` is what the pair adds over
+the better of the two on their own (the complementarity of their fixtures).
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+ORDERS = ("value", "points")
+MIN_STARTS = 2     # a "rotation" where one player never plays is just a bench slot
+
+
+@dataclass
+class RotationPair:
+    a: int                 # element ids
+    b: int
+    points: float          # sum over GWs of the better projection
+    cost: float            # combined price (£m)
+    gain: float            # points over the better player alone
+    a_starts: np.ndarray   # (G,) True where `a` is the one to play
+
+    @property
+    def value(self) -> float:
+        return self.points / self.cost if self.cost else 0.0
+
+
+def pair_points(x: np.ndarray, block: int = 128):
+    """(P, P) sum over GWs of max(x[i], x[j]), and (P, P) GWs in which i is the one to play."""
+    n = len(x)
+    pts = np.empty((n, n))
+    plays = np.empty((n, n), dtype=np.int64)
+    for s in range(0, n, block):
+        xi = x[s:s + block, None, :]
+        pts[s:s + block] = np.maximum(xi, x[None, :, :]).sum(-1)
+        plays[s:s + block] = (xi >= x[None, :, :]).sum(-1)
+    return pts, plays
+
+
+def rotation_pairs(ids: Sequence[int], xpts: np.ndarray, cost: Sequence[float], team: Sequence[int],
+                   top: int = 10, by: str = "value", max_cost: Optional[float] = None,
+                   distinct_clubs: bool = True, min_starts: int = MIN_STARTS) -> List[RotationPair]:
+    """
+    Best `top` pairs among the rows of `xpts` (players x GWs) for one
+    position; each player must be the one to play in >= min_starts GWs.
+    """
+    ids = np.asarray(ids)
+    x = np.asarray(xpts, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    team = np.asarray(team)
+    n = len(ids)
+    if n < 2:
+        return []
+
+    pts, plays = pair_points(x)
+    pair_cost = cost[:, None] + cost[None, :]
+    ok = np.triu(np.ones((n, n), dtype=bool), k=1)
+    ok &= (plays >= min_starts) & (x.shape[1] - plays >= min_starts)
+    if max_cost is not None:
+        ok &= pair_cost <= max_cost + 1e-9
+    if distinct_clubs:
+        ok &= team[:, None] != team[None, :]
+
+    score = pts / np.where(pair_cost > 0, pair_cost, np.inf) if by == "value" else pts
+    score = np.where(ok, score, -np.inf)
+    flat = score.ravel()
+    k = min(top, int(ok.sum()))
+    if k == 0:
+        return []
+    best = np.argpartition(-flat, k - 1)[:k]
+    best = best[np.argsort(-flat[best], kind="stable")]
+
+    solo = x.sum(1)
+    out = []
+    for i, j in zip(*np.unravel_index(best, score.shape)):
+        out.append(RotationPair(
+            a=int(ids[i]), b=int(ids[j]),
+            points=float(pts[i, j]),
+            cost=float(pair_cost[i, j]),
+            gain=float(pts[i, j] - max(solo[i], solo[j])),
+            a_starts=x[i] >= x[j],
+        ))
+    return out
+
+
+def render(pairs: Sequence[RotationPair], gws: Sequence[int], names, clubs) -> str:
+    """Ranked pairs with points, price, gain over the better single and who plays each GW."""
+    head = f"{'#':>3}  {'Pair':<34} {'£m':>5} {'Pts':>6} {'Pts/£m':>6} {'Gain':>5}  "
+    head += " ".join(f"{'GW' + str(g):>4}" for g in gws)
+    lines = [head]
+    for r, p in enumerate(pairs, start=1):
+        pair = f"A {names.get(p.a, p.a)} ({clubs.get(p.a, '')}) + B {names.get(p.b, p.b)} ({clubs.get(p.b, '')})"
+        who = " ".join(f"{'A' if s else 'B':>4}" for s in p.a_starts)
+        lines.append(f"{r:>3}  {pair:<34} {p.cost:>5.1f} {p.points:>6.2f} {p.value:>6.2f} {p.gain:>+5.2f}  {who}")
+    return "\n".join(lines)
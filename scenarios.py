@@ -0,0 +1,181 @@
+"""
+What-if scenarios over one projection pass.
+
+A scenario is a set of transfer constraints (lock / avoid / avoid clubs /
+force-sell). The planner projects every element once, then each scenario
+only re-runs the transfer search and scores the resulting squad's best XI
+per GW, so adding a scenario costs optimizer time only. Scenarios run
+concurrently in a process pool; the shared inputs are shipped to each
+worker once (initializer), not once per scenario.
+
+Config (or a separate YAML file via `planner.py whatif --scenarios f.yaml`):
+
+  scenarios:
+    - name: keep-salah
+      lock: [Salah]
+    - name: sell-haaland
+      sell: [Haaland]
+      avoid_clubs: [MCI]
+
+Players may be given by web_name or element id, clubs by short_name, name
+or id.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from lineup import optimize_lineup
+
+COL_WIDTH = 30
+
+
+@dataclass
+class Scenario:
+    name: str
+    lock: List[int] = field(default_factory=list)
+    avoid: List[int] = field(default_factory=list)
+    avoid_clubs: List[int] = field(default_factory=list)
+    sell: List[int] = field(default_factory=list)
+
+
+@dataclass
+class ScenarioResult:
+    scenario: Scenario
+    moves: List[Tuple]           # propose_transfers output
+    net_gain: float              # sum of net gains after hits
+    xi_by_gw: Dict[int, float]   # best-XI xPts (incl. captain) of the resulting squad
+    xi_total: float
+    hits: float                  # points paid in hits
+    unmet: List[Any] = field(default_factory=list)   # forced sells (squad players) the plan couldn't make
+
+    @property
+    def score(self) -> float:
+        return self.xi_total - self.hits
+
+
+# ---------- definitions ----------
+def resolve_players(bootstrap: Dict[str, Any], refs: Sequence) -> List[int]:
+    by_name: Dict[str, List[int]] = {}
+    for e in bootstrap["elements"]:
+        by_name.setdefault(e["web_name"].lower(), []).append(e["id"])
+    ids = {e["id"] for e in bootstrap["elements"]}
+    out = []
+    for r in refs or []:
+        if isinstance(r, int) or str(r).isdigit():
+            if int(r) in ids:
+                out.append(int(r))
+            continue
+        out.extend(by_name.get(str(r).lower(), []))
+    return out
+
+
+def resolve_clubs(bootstrap: Dict[str, Any], refs: Sequence) -> List[int]:
+    keys = {}
+    for t in bootstrap["teams"]:
+        keys[str(t["id"])] = t["id"]
+        for k in ("short_name", "name"):
+            if t.get(k):
+                keys[t[k].lower()] = t["id"]
+    return [keys[str(r).lower()] for r in refs or [] if str(r).lower() in keys]
+
+
+def parse_scenarios(bootstrap: Dict[str, Any], raw: Sequence[Dict[str, Any]],
+                    base: Optional[Scenario] = None) -> List[Scenario]:
+    """Scenario list from config dicts; `base` constraints apply to every scenario."""
+    base = base or Scenario("base")
+    out = []
+    for k, d in enumerate(raw or [], start=1):
+        out.append(Scenario(
+            name=str(d.get("name") or f"scenario {k}"),
+            lock=base.lock + resolve_players(bootstrap, d.get("lock")),
+            avoid=base.avoid + resolve_players(bootstrap, d.get("avoid")),
+            avoid_clubs=base.avoid_clubs + resolve_clubs(bootstrap, d.get("avoid_clubs")),
+            sell=base.sell + resolve_players(bootstrap, d.get("sell")),
+        ))
+    return out
+
+
+# ---------- evaluation ----------
+_CTX: Dict[str, Any] = {}
+
+
+def _init_worker(plan_fn, ctx):
+    _CTX["plan_fn"], _CTX["ctx"] = plan_fn, ctx
+
+
+def squad_after(current: Sequence, moves: Sequence[Tuple]) -> List:
+    out = list(current)
+    for sell, buy, *_ in moves:
+        out = [buy if p.id == sell.id else p for p in out]
+    return out
+
+
+def evaluate(scenario: Scenario, plan_fn: Callable = None, ctx: Dict[str, Any] = None) -> ScenarioResult:
+    """Transfer plan for one scenario plus the resulting squad's best XI per GW."""
+    plan_fn = plan_fn or _CTX["plan_fn"]
+    ctx = ctx or _CTX["ctx"]
+    moves = plan_fn(**ctx, locked=scenario.lock, avoid=scenario.avoid,
+                    avoid_clubs=scenario.avoid_clubs, force_sell=scenario.sell)
+    squad = squad_after(ctx["current"], moves)
+    sold = {m[0].id for m in moves}
+    unmet = [p for p in ctx["current"] if p.id in set(scenario.sell) - sold]
+    xi = {}
+    for gw in ctx["gw_range"]:
+        lu = optimize_lineup([p.xpts_by_gw.get(gw, 0.0) for p in squad], [p.pos for p in squad],
+                             [p.p_play_in(gw) for p in squad])
+        xi[gw] = lu.xpts
+    hits = sum(m[2] - m[3] for m in moves)
+    return ScenarioResult(scenario, moves, sum(m[3] for m in moves), xi, sum(xi.values()), hits, unmet)
+
+
+def run_scenarios(scenarios: Sequence[Scenario], plan_fn: Callable, ctx: Dict[str, Any],
+                  workers: Optional[int] = None) -> List[ScenarioResult]:
+    """
+    Evaluate every scenario against the same ctx (propose_transfers kwargs with
+    precomputed xmaps). Results keep the input order.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(scenarios))
+    if workers <= 1:
+        return [evaluate(s, plan_fn, ctx) for s in scenarios]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(plan_fn, ctx)) as ex:
+        return list(ex.map(evaluate, scenarios))
+
+
+# ---------- output ----------
+def render_side_by_side(results: Sequence[ScenarioResult], max_moves: int = 2,
+                        width: int = COL_WIDTH, best: Optional[float] = None) -> str:
+    """Scenarios as columns: moves, net gain after hits, resulting XI xPts per GW,
+    and the score (XI xPts over the horizon minus hits). `best` is the score the
+    others are compared against (default: the best in `results`, marked *)."""
+    def cell(s):
+        s = str(s)
+        return s[: width - 1].ljust(width)
+
+    label = 12
+    lines = [" " * label + "".join(cell(r.scenario.name) for r in results)]
+    lines.append(" " * label + "".join(cell("-" * (width - 2)) for _ in results))
+    for k in range(max_moves):
+        row = []
+        for r in results:
+            if k < len(r.moves):
+                sell, buy, raw, net, uses_hit = r.moves[k]
+                row.append(cell(f"{sell.name} -> {buy.name}{' (-hit)' if uses_hit else ''}"))
+            else:
+                row.append(cell("-" if k else "roll"))
+        lines.append(f"{'Move ' + str(k + 1):<{label}}" + "".join(row))
+    if any(r.unmet for r in results):
+        lines.append(f"{'Unmet sell':<{label}}" + "".join(
+            cell(", ".join(p.name for p in r.unmet) or "-") for r in results))
+    lines.append(f"{'Net gain':<{label}}" + "".join(cell(f"{r.net_gain:+.2f}") for r in results))
+    gws = list(results[0].xi_by_gw) if results else []
+    for gw in gws:
+        lines.append(f"{'GW' + str(gw) + ' XI':<{label}}" + "".join(cell(f"{r.xi_by_gw[gw]:.2f}") for r in results))
+    lines.append(f"{'Hits':<{label}}" + "".join(cell(f"-{r.hits:.0f}") for r in results))
+    if best is None:
+        best = max(r.score for r in results) if results else 0.0
+    lines.append(f"{'Score':<{label}}" + "".join(
+        cell(f"{r.score:.2f}" + (" *" if abs(r.score - best) < 1e-9 else f" ({r.score - best:+.2f})"))
+        for r in results))
+    return "\n".join(line.rstrip() for line in lines)
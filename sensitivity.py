@@ -0,0 +1,174 @@
+"""
+Sensitivity of the transfer recommendation to model knobs.
+
+One planner run's projection features (models.Features) are re-projected
+by the configured model(s) over a grid of (regression_factor, min_baseline)
+settings in a single batched pass (the regression model takes the whole
+grid as array knobs; knob-free models such as "form" run once), then every
+legal single move (sell s, buy c) is scored at every grid point at once:
+
+  gain[k, s, c] = xtot[k, c] - xtot[k, s]      (-inf where the swap is illegal:
+                                                position, budget, 3-per-club,
+                                                lock / avoid lists)
+
+For each grid point we keep the best move, and for each move the planner
+suggested we check whether it still clears min_raw_gain / min_net_gain
+under each hit_penalty assumption. The output shows where the best move
+flips and how robust a -4 actually is.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import models
+
+
+@dataclass
+class SensitivityResult:
+    regression: np.ndarray        # (R,) grid values
+    min_baseline: np.ndarray      # (M,)
+    hit_penalty: np.ndarray       # (H,)
+    best_sell: np.ndarray         # (R, M) element ids of the best single move (-1: none)
+    best_buy: np.ndarray          # (R, M)
+    best_gain: np.ndarray         # (R, M)
+    move_gain: np.ndarray         # (n_moves, R, M) horizon gain of each suggested move
+    move_holds: np.ndarray        # (n_moves, H, R, M) still clears the gates?
+
+
+def legal_swaps(table: Dict[str, np.ndarray], elements: Dict[int, Dict[str, Any]], squad: Sequence,
+                bank: float, locked=(), avoid=(), avoid_clubs=()) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(sell_rows, buy_rows, legal[S, C]) as rows of `table` for the squad and every non-squad element."""
+    ids = table["id"]
+    row = {int(i): k for k, i in enumerate(ids)}
+    squad_ids = {p.id for p in squad}
+    sell_rows = np.array([row[p.id] for p in squad])
+    buy_rows = np.array([k for k, i in enumerate(ids) if int(i) not in squad_ids])
+
+    pos = np.array([elements[int(i)]["element_type"] for i in ids])
+    team = np.array([elements[int(i)]["team"] for i in ids])
+    cost = np.array([(elements[int(i)].get("now_cost") or 0) / 10.0 for i in ids])
+    sell_cost = np.array([p.cost for p in squad])
+    clubs = {}
+    for p in squad:
+        clubs[p.team] = clubs.get(p.team, 0) + 1
+    club_n = np.array([clubs.get(t, 0) for t in team[buy_rows]])
+
+    locked, avoid, avoid_clubs = set(locked), set(avoid), set(avoid_clubs)
+    s_team = team[sell_rows][:, None]
+    c_team = team[buy_rows][None, :]
+    legal = (
+        (pos[sell_rows][:, None] == pos[buy_rows][None, :])
+        & (cost[buy_rows][None, :] <= bank + sell_cost[:, None] + 1e-6)
+        & (club_n[None, :] - (s_team == c_team) < 3)
+        & ~np.isin(ids[sell_rows], list(locked))[:, None]
+        & ~np.isin(ids[buy_rows], list(avoid))[None, :]
+        & ~np.isin(team[buy_rows], list(avoid_clubs))[None, :]
+    )
+    return sell_rows, buy_rows, legal
+
+
+def grid_xpts(features: models.Features, spec, regression: Sequence[float], min_baseline: Sequence[float],
+              workers: Optional[int] = None) -> np.ndarray:
+    """
+    K x P x G: the model(s) in `spec` at each (regression[k], min_baseline[k]).
+    Each model is built once with the whole grid as its knobs, so a
+    knob-dependent one (regression) projects every grid point in one
+    batched call (K x P x G) and a knob-free one (form) runs once (P x G);
+    worker processes only split the distinct models.
+    """
+    reg = np.asarray(regression, dtype=float)
+    ens = models.build(spec, regression=reg, min_baseline=np.asarray(min_baseline, dtype=float))
+    mats = models.evaluate([m for m, _ in ens], features, workers)
+    w = np.array([w for _, w in ens])
+    out = sum(wk * m for wk, m in zip(w / w.sum(), mats))
+    return np.broadcast_to(out, (len(reg),) + out.shape[-2:])
+
+
+def run_grid(table: Dict[str, Any], elements: Dict[int, Dict[str, Any]], squad: Sequence, bank: float,
+             moves: Sequence[Tuple], regression: Sequence[float], min_baseline: Sequence[float],
+             hit_penalty: Sequence[float], free_transfers: int, min_raw_gain: float, min_net_gain: float,
+             locked=(), avoid=(), avoid_clubs=(), spec="regression", workers: Optional[int] = None) -> SensitivityResult:
+    """`table` is planner.projection_table output (id and features are used)."""
+    reg = np.asarray(regression, dtype=float)
+    mb = np.asarray(min_baseline, dtype=float)
+    hits = np.asarray(hit_penalty, dtype=float)
+    rr, mm = np.meshgrid(reg, mb, indexing="ij")                  # R x M grid, flattened to K
+
+    xpts = grid_xpts(table["features"], spec, rr.ravel(), mm.ravel(), workers)   # K x P x G
+    xtot = xpts.sum(-1)                                                           # K x P
+
+    sell_rows, buy_rows, legal = legal_swaps(table, elements, squad, bank, locked, avoid, avoid_clubs)
+    gain = xtot[:, buy_rows][:, None, :] - xtot[:, sell_rows][:, :, None]         # K x S x C
+    gain = np.where(legal[None], gain, -np.inf)
+    flat = gain.reshape(len(gain), -1)
+    best = flat.argmax(1)
+    best_gain = flat[np.arange(len(flat)), best]
+    ids = table["id"]
+    found = np.isfinite(best_gain)
+    s_idx, c_idx = np.unravel_index(best, legal.shape)
+    shape = rr.shape
+
+    row = {int(i): k for k, i in enumerate(ids)}
+    move_gain = np.array([xtot[:, row[b.id]] - xtot[:, row[s.id]] for s, b, *_ in moves]).reshape(-1, *shape)
+    # k-th suggested move pays a hit once the free transfers are used up
+    paid = (np.arange(len(moves)) >= free_transfers)[:, None, None, None]
+    net = move_gain[:, None] - np.where(paid, hits[None, :, None, None], 0.0)
+    holds = (move_gain[:, None] >= min_raw_gain) & (net >= min_net_gain)
+
+    return SensitivityResult(
+        regression=reg,
+        min_baseline=mb,
+        hit_penalty=hits,
+        best_sell=np.where(found, ids[sell_rows][s_idx], -1).reshape(shape),
+        best_buy=np.where(found, ids[buy_rows][c_idx], -1).reshape(shape),
+        best_gain=np.where(found, best_gain, 0.0).reshape(shape),
+        move_gain=move_gain,
+        move_holds=holds,
+    )
+
+
+def render(res: SensitivityResult, names: Dict[int, str], moves: Sequence[Tuple], free_transfers: int,
+           current: Tuple[float, float] = None) -> str:
+    """Best-move map over the grid (letters keyed in a legend) and how often each suggested move holds."""
+    pairs: List[Tuple[int, int]] = []
+    for s, b in zip(res.best_sell.ravel().tolist(), res.best_buy.ravel().tolist()):
+        if s >= 0 and (s, b) not in pairs:
+            pairs.append((s, b))
+    letter = {p: chr(ord("A") + k) if k < 26 else str(k) for k, p in enumerate(pairs)}
+
+    lines = ["Best single move per setting:"]
+    for p, l in letter.items():
+        lines.append(f"  {l}  SELL {names.get(p[0], p[0])} -> BUY {names.get(p[1], p[1])}")
+    lines.append("")
+    lines.append(" " * 14 + "".join(f"{'mb ' + format(v, '.2f'):>11}" for v in res.min_baseline))
+    for i, r in enumerate(res.regression):
+        cells = []
+        for j, mbv in enumerate(res.min_baseline):
+            s, b = int(res.best_sell[i, j]), int(res.best_buy[i, j])
+            tag = letter.get((s, b), "-") if s >= 0 else "-"
+            tag += f" {res.best_gain[i, j]:+.1f}" if s >= 0 else ""
+            if current and np.isclose(r, current[0]) and np.isclose(mbv, current[1]):
+                tag += "*"
+            cells.append(f"{tag:>11}")
+        lines.append(f"  {'reg ' + format(r, '.2f'):<12}" + "".join(cells))
+
+    total = res.best_sell.size
+    counts = {l: int(sum(1 for s, b in zip(res.best_sell.ravel(), res.best_buy.ravel())
+                         if letter.get((int(s), int(b))) == l)) for l in letter.values()}
+    if counts:
+        top = max(counts, key=counts.get)
+        lines.append(f"  Best move {top} at {counts[top]}/{total} settings"
+                     + (" (stable)" if counts[top] == total else " – flips inside the grid"))
+
+    if moves:
+        lines.append("")
+        lines.append("Suggested moves (settings where gain/net still clear the gates):")
+        for k, (s, b, *_rest) in enumerate(moves):
+            paid = k >= free_transfers
+            g = res.move_gain[k]
+            held = " ".join(
+                f"hit -{h:g}: {int(res.move_holds[k, hi].sum())}/{total}" for hi, h in enumerate(res.hit_penalty)
+            ) if paid else f"free: {int(res.move_holds[k, 0].sum())}/{total}"
+            lines.append(f"  {s.name} -> {b.name}: gain {g.min():+.1f}..{g.max():+.1f} | {held}")
+    return "\n".join(lines)
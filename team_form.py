@@ -0,0 +1,208 @@
+"""
+Team attack / defence ratings from what players' histories say happened.
+
+bootstrap's strength_* fields are set before the season and barely move.
+Every element-summary `history` row carries the match it came from, so one
+group-by over all players' rows rolls them up per fixture and side:
+
+  key = (fixture, home/away)      goals = sum(goals_scored), xg = sum(expected_goals)
+
+(a side's goals conceded are the other side's goals, so conceded needs no
+separate pass; a finished fixture's own score is used for goals when the
+fixtures feed has it, which also catches own goals). Those per-fixture rows
+are kept in a small store (npz) and only fixtures finished since the last
+run are aggregated, so each GW adds ten rows instead of redoing the season.
+
+Ratings are a multiplicative opponent- and venue-adjusted fit over the
+store, recent matches weighted up (DECAY per GW back):
+
+  y  = XG_WEIGHT * xg + (1 - XG_WEIGHT) * goals     (goals alone without xG)
+  E[y] = mu[venue] * A[team] / D[opponent]
+
+each team shrunk toward its static rating by PRIOR_MATCHES pseudo-matches.
+`apply` moves a team's static strength_* fields (home and away alike) by
+the ratio the evidence moved it, taken back to strength units with the
+1 / SPREAD the fixture models raise strength ratios by; everything that
+reads strength fields (fixture_strength_scalar, fixture_model, the ticker)
+then uses form without change.
+"""
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from fixture_model import SPREAD
+from history import PackedHistory
+
+FIELDS = ("fixture", "goals_scored", "expected_goals")   # history fields beyond history.HISTORY_FIELDS
+STORE = ("fixture", "event", "team", "opp", "home", "goals", "xg")
+XG_WEIGHT = 0.7          # xG is the steadier signal; goals keep finishing in
+DECAY = 0.9              # weight per GW back
+PRIOR_MATCHES = 6.0      # pseudo-matches at the static rating
+ITERATIONS = 8
+
+_KEYS = ("strength_attack_home", "strength_attack_away", "strength_defence_home", "strength_defence_away")
+
+
+@dataclass
+class TeamForm:
+    team_ids: np.ndarray     # (T,)
+    attack: np.ndarray       # (T,) fitted goal-ratio vs league (1.0 = average)
+    defence: np.ndarray      # (T,) higher = concedes less
+    attack_prior: np.ndarray
+    defence_prior: np.ndarray
+    matches: np.ndarray      # (T,) decayed matches behind each rating
+
+    def apply(self, teams: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copies of `teams` with strength_* moved by form (teams without evidence unchanged)."""
+        row = {int(t): k for k, t in enumerate(self.team_ids)}
+        out = []
+        for t in teams:
+            k = row.get(t["id"])
+            t = dict(t)
+            if k is not None:
+                att = (self.attack[k] / self.attack_prior[k]) ** (1.0 / SPREAD)
+                dfn = (self.defence[k] / self.defence_prior[k]) ** (1.0 / SPREAD)
+                for key in _KEYS:
+                    if t.get(key):
+                        t[key] = float(t[key]) * (att if "attack" in key else dfn)
+            out.append(t)
+        return out
+
+
+def _empty() -> Dict[str, np.ndarray]:
+    return {k: np.zeros(0, dtype=bool if k == "home" else (np.float64 if k in ("goals", "xg") else np.int64))
+            for k in STORE}
+
+
+def aggregate(histories: Iterable[Any], fixtures: Sequence[Dict[str, Any]],
+              fixture_ids: Optional[Iterable[int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Per (fixture, side) goals and xG for the finished fixtures in
+    `fixture_ids` (default: all finished), from every player's history in
+    one bincount pass. Histories may be PackedHistory or lists of dicts.
+    """
+    want = set(fixture_ids) if fixture_ids is not None else None
+    fx = sorted((f for f in fixtures if f.get("finished") and f.get("team_h") and f.get("team_a")
+                 and (want is None or f["id"] in want)), key=lambda f: f["id"])
+    if not fx:
+        return _empty()
+    ids = np.array([f["id"] for f in fx], dtype=np.int64)
+
+    cols = {c: [] for c in ("fixture", "was_home", "minutes", "goals_scored", "expected_goals")}
+    for h in histories:
+        if not isinstance(h, PackedHistory):
+            h = PackedHistory.pack(h or [], tuple(cols))
+        for c in cols:
+            cols[c].append(h.column(c))
+    a = {c: np.concatenate(v) if v else np.zeros(0, dtype=np.float32) for c, v in cols.items()}
+
+    fid = np.nan_to_num(a["fixture"], nan=-1).astype(np.int64)
+    k = np.minimum(np.searchsorted(ids, fid), len(ids) - 1)
+    keep = (ids[k] == fid) & (np.nan_to_num(a["minutes"]) > 0)
+    key = k[keep] * 2 + (np.nan_to_num(a["was_home"][keep]) == 0)          # 0 home, 1 away
+    goals = np.bincount(key, weights=np.nan_to_num(a["goals_scored"][keep]), minlength=2 * len(ids))
+    xg_rows = a["expected_goals"][keep]
+    xg = np.bincount(key, weights=np.nan_to_num(xg_rows), minlength=2 * len(ids))
+    has_xg = np.bincount(key, weights=(~np.isnan(xg_rows)).astype(float), minlength=2 * len(ids)) > 0
+    seen = np.bincount(key, minlength=2 * len(ids)).reshape(-1, 2).any(1)
+
+    goals, xg, has_xg = goals.reshape(-1, 2), xg.reshape(-1, 2), has_xg.reshape(-1, 2)
+    for r, f in enumerate(fx):
+        if f.get("team_h_score") is not None and f.get("team_a_score") is not None:
+            goals[r] = (f["team_h_score"], f["team_a_score"])
+            seen[r] = True
+    xg = np.where(has_xg, xg, np.nan)
+
+    h = np.array([f["team_h"] for f in fx], dtype=np.int64)
+    aw = np.array([f["team_a"] for f in fx], dtype=np.int64)
+    ev = np.array([f.get("event") or 0 for f in fx], dtype=np.int64)
+    r = np.flatnonzero(seen)                                  # fixtures with a score or someone's minutes
+    return {
+        "fixture": np.repeat(ids[r], 2),
+        "event": np.repeat(ev[r], 2),
+        "team": np.stack([h[r], aw[r]], 1).ravel(),
+        "opp": np.stack([aw[r], h[r]], 1).ravel(),
+        "home": np.tile([True, False], len(r)),
+        "goals": goals[r].ravel(),
+        "xg": xg[r].ravel(),
+    }
+
+
+def fit(store: Dict[str, np.ndarray], teams: Sequence[Dict[str, Any]], event: Optional[int] = None) -> TeamForm:
+    """Opponent- and venue-adjusted attack / defence over the store, weighted toward `event`."""
+    tids = np.array([t["id"] for t in teams], dtype=np.int64)
+    size = int(max(tids.max(initial=0), store["team"].max(initial=0))) + 1
+
+    def rel(key_h, key_a):
+        # static strength (mean of venues) / league mean, as a goal ratio
+        v = np.array([(float(t.get(key_h) or 0) + float(t.get(key_a) or 0)) / 2 for t in teams])
+        out = np.ones(size)
+        if (v > 0).any():
+            out[tids[v > 0]] = (v[v > 0] / v[v > 0].mean()) ** SPREAD
+        return out
+
+    att0 = rel("strength_attack_home", "strength_attack_away")
+    def0 = rel("strength_defence_home", "strength_defence_away")
+    att, dfn = att0.copy(), def0.copy()
+    n = np.zeros(size)
+
+    team, opp, home = store["team"], store["opp"], store["home"]
+    if len(team):
+        xg = store["xg"]
+        y = np.where(np.isnan(xg), store["goals"], XG_WEIGHT * np.nan_to_num(xg) + (1 - XG_WEIGHT) * store["goals"])
+        last = event if event is not None else int(store["event"].max())
+        w = DECAY ** np.maximum(last - store["event"], 0).astype(float)
+        mu_v = np.array([(w * y)[~home].sum() / max(w[~home].sum(), 1e-9),
+                         (w * y)[home].sum() / max(w[home].sum(), 1e-9)])[home.astype(int)]
+        k = PRIOR_MATCHES * mu_v.mean()
+        n = np.bincount(team, weights=w, minlength=size)
+        scored = np.bincount(team, weights=w * y, minlength=size)
+        conceded = np.bincount(opp, weights=w * y, minlength=size)
+        for _ in range(ITERATIONS):
+            att = (scored + k * att0) / (np.bincount(team, weights=w * mu_v / dfn[opp], minlength=size) + k)
+            dfn = (np.bincount(opp, weights=w * mu_v * att[team], minlength=size) + k * def0) / (conceded + k)
+            # pin the scale (A * c, D * c fit equally well) to the priors'
+            att *= np.exp(np.log(att0[tids]).mean() - np.log(att[tids]).mean())
+            dfn *= np.exp(np.log(def0[tids]).mean() - np.log(dfn[tids]).mean())
+    return TeamForm(tids, att[tids], dfn[tids], att0[tids], def0[tids], n[tids])
+
+
+def save(path: str, store: Dict[str, np.ndarray], seen: np.ndarray) -> None:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, seen=seen, **store)
+    os.replace(tmp, path)
+
+
+def load(path: str):
+    """(store, fixture ids already aggregated) or (None, None)."""
+    if not path or not os.path.exists(path):
+        return None, None
+    with np.load(path) as z:
+        return {k: z[k] for k in STORE}, z["seen"]
+
+
+def load_or_update(path: Optional[str], fixtures: Sequence[Dict[str, Any]], teams: Sequence[Dict[str, Any]],
+                   histories: Optional[Callable[[], Iterable[Any]]] = None, event: Optional[int] = None) -> TeamForm:
+    """
+    Ratings from the store at `path`, first aggregating any fixture finished
+    since it was written (`histories()` is only called then). Without
+    `histories` the store is used as it is; path=None always aggregates
+    (nothing is stored).
+    """
+    store, seen = load(path)
+    if store is None:
+        store, seen = _empty(), np.zeros(0, dtype=np.int64)
+    finished = np.array([f["id"] for f in fixtures if f.get("finished")], dtype=np.int64)
+    new = np.setdiff1d(finished, seen)
+    if len(new) and histories is not None:
+        rows = aggregate(histories(), fixtures, new.tolist())
+        store = {k: np.concatenate([store[k], rows[k]]) for k in STORE}
+        seen = np.union1d(seen, new)
+        if path:
+            save(path, store, seen)
+    return fit(store, teams, event)
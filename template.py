@@ -0,0 +1,321 @@
+"""
+Template ownership among the top of the overall league.
+
+bootstrap's selected_by_percent is ownership across ~10M managers; what
+moves a good rank is ownership among the top N. Getting that takes one
+picks call per sampled entry, so the job runs off a work queue in a single
+SQLite file (WAL) that any number of worker processes - on this machine or
+any that share the file - drain together:
+
+  seed     standings of the overall league -> one `tasks` row per entry
+  work     claim a batch (lease), fetch picks, and in the same transaction
+           that marks an entry done add its squad to `ownership`
+           (owned / started / captained / sum of multipliers per element)
+  read     `load()` gives the running table at any moment; it only ever
+           reflects fully counted entries
+
+Leases expire (LEASE s) so a crashed worker's batch is picked up again; a
+late completion from a worker that lost its lease is discarded, so no
+entry is counted twice. Failed fetches are retried up to MAX_ATTEMPTS
+(a 404 - deleted team - fails at once).
+
+  python3 template.py seed --top 10000
+  python3 template.py work --procs 4
+  python3 template.py show
+
+Seeding again for a new GW resets the tables.
+"""
+import argparse
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import requests
+
+from league import fetch_standings
+
+OVERALL_LEAGUE = 314   # the classic league every manager is in
+LEASE = 120.0          # seconds before a claimed batch is up for grabs again
+MAX_ATTEMPTS = 3
+BATCH = 25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    entry     INTEGER PRIMARY KEY,
+    rank      INTEGER NOT NULL,
+    state     TEXT NOT NULL DEFAULT 'pending',   -- pending | leased | done | failed
+    owner     TEXT,
+    leased_at REAL,
+    attempts  INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, rank);
+CREATE TABLE IF NOT EXISTS ownership (
+    element   INTEGER PRIMARY KEY,
+    owned     INTEGER NOT NULL,
+    started   INTEGER NOT NULL,
+    captained INTEGER NOT NULL,
+    mult      INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class TemplateOwnership:
+    event: int
+    n: int                    # entries counted
+    element: np.ndarray       # (E,) ids
+    own: np.ndarray           # share of sampled squads holding the player
+    start: np.ndarray         # share fielding him
+    cap: np.ndarray           # share captaining him
+    eo: np.ndarray            # effective ownership: mean multiplier
+
+    def __post_init__(self):
+        self._row = {int(e): k for k, e in enumerate(self.element)}
+
+    def eo_of(self, element_id: int) -> float:
+        k = self._row.get(element_id)
+        return float(self.eo[k]) if k is not None else 0.0
+
+    def own_of(self, element_id: int) -> float:
+        k = self._row.get(element_id)
+        return float(self.own[k]) if k is not None else 0.0
+
+
+class TemplateQueue:
+    def __init__(self, path: str, lease: float = LEASE):
+        self.path = path
+        self.lease = lease
+        self._local = threading.local()
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # one connection per thread and process, as in cache.SharedCache
+        c = getattr(self._local, "conn", None)
+        if c is None or getattr(self._local, "pid", None) != os.getpid():
+            c = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = c, os.getpid()
+        return c
+
+    def _tx(self):
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        return c
+
+    # ---------- producer ----------
+    def seed(self, event: int, entries: Sequence[Tuple[int, int]]) -> int:
+        """Queue (entry, rank) pairs for `event`; a different event starts the sample over."""
+        c = self._tx()
+        try:
+            row = c.execute("SELECT value FROM meta WHERE key = 'event'").fetchone()
+            if row is None or int(row[0]) != event:
+                c.execute("DELETE FROM tasks")
+                c.execute("DELETE FROM ownership")
+                c.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('event', ?)", (str(event),))
+            before = c.total_changes
+            c.executemany("INSERT OR IGNORE INTO tasks (entry, rank) VALUES (?, ?)", entries)
+            return c.total_changes - before
+        finally:
+            c.execute("COMMIT")
+
+    def event(self) -> Optional[int]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'event'").fetchone()
+        return int(row[0]) if row else None
+
+    # ---------- workers ----------
+    def claim(self, owner: str, n: int = BATCH) -> List[int]:
+        """Lease up to n pending (or expired) entries, best rank first."""
+        c = self._tx()
+        try:
+            now = time.time()
+            rows = c.execute(
+                "SELECT entry FROM tasks WHERE state = 'pending' OR (state = 'leased' AND leased_at < ?) "
+                "ORDER BY rank LIMIT ?", (now - self.lease, n)
+            ).fetchall()
+            ids = [r[0] for r in rows]
+            c.executemany("UPDATE tasks SET state = 'leased', owner = ?, leased_at = ? WHERE entry = ?",
+                          [(owner, now, e) for e in ids])
+            return ids
+        finally:
+            c.execute("COMMIT")
+
+    def complete(self, owner: str, entry: int, picks: Sequence[Dict[str, Any]]) -> bool:
+        """Count one squad and mark the entry done - only if `owner` still holds its lease."""
+        c = self._tx()
+        try:
+            row = c.execute("SELECT state, owner FROM tasks WHERE entry = ?", (entry,)).fetchone()
+            if row is None or row[0] != "leased" or row[1] != owner:
+                return False
+            c.executemany(
+                "INSERT INTO ownership (element, owned, started, captained, mult) VALUES (?, 1, ?, ?, ?) "
+                "ON CONFLICT(element) DO UPDATE SET owned = owned + 1, started = started + excluded.started, "
+                "captained = captained + excluded.captained, mult = mult + excluded.mult",
+                [(p["element"], int(p.get("multiplier", 1) > 0), int(bool(p.get("is_captain"))),
+                  int(p.get("multiplier", 0))) for p in picks],
+            )
+            c.execute("UPDATE tasks SET state = 'done', owner = NULL WHERE entry = ?", (entry,))
+            return True
+        finally:
+            c.execute("COMMIT")
+
+    def fail(self, owner: str, entry: int, permanent: bool = False) -> None:
+        c = self._tx()
+        try:
+            c.execute(
+                "UPDATE tasks SET attempts = attempts + 1, owner = NULL, "
+                "state = CASE WHEN ? OR attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+                "WHERE entry = ? AND state = 'leased' AND owner = ?",
+                (int(permanent), MAX_ATTEMPTS, entry, owner),
+            )
+        finally:
+            c.execute("COMMIT")
+
+    def progress(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()
+        return {"pending": 0, "leased": 0, "done": 0, "failed": 0, **dict(rows)}
+
+    # ---------- reader ----------
+    def ownership(self) -> TemplateOwnership:
+        # one read transaction: counts and n always agree
+        c = self._conn()
+        c.execute("BEGIN")
+        try:
+            n = c.execute("SELECT COUNT(*) FROM tasks WHERE state = 'done'").fetchone()[0]
+            rows = c.execute("SELECT element, owned, started, captained, mult FROM ownership ORDER BY element").fetchall()
+        finally:
+            c.execute("COMMIT")
+        a = np.array(rows, dtype=float).reshape(-1, 5)
+        d = max(n, 1)
+        return TemplateOwnership(self.event() or 0, n, a[:, 0].astype(np.int64),
+                                 a[:, 1] / d, a[:, 2] / d, a[:, 3] / d, a[:, 4] / d)
+
+
+def load(path: str) -> Optional[TemplateOwnership]:
+    """Running template table from a queue file, None if there isn't one (or nothing counted yet)."""
+    if not path or not os.path.exists(path):
+        return None
+    t = TemplateQueue(path).ownership()
+    return t if t.n else None
+
+
+def seed_top(queue: TemplateQueue, client, event: int, top_n: int, league_id: int = OVERALL_LEAGUE) -> int:
+    _, rows = fetch_standings(client, league_id, top_n)
+    return queue.seed(event, [(r["entry"], r.get("rank") or k + 1) for k, r in enumerate(rows)])
+
+
+def work(queue: TemplateQueue, client, threads: int = 4, batch: int = BATCH,
+         max_entries: Optional[int] = None, owner: str = None) -> int:
+    """Drain the queue (or max_entries of it); returns entries this worker counted."""
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    event = queue.event()
+    done = 0
+
+    def one(entry):
+        try:
+            picks = client.entry_picks(entry, event).get("picks", [])
+        except requests.HTTPError as e:
+            queue.fail(owner, entry, permanent=getattr(e.response, "status_code", None) == 404)
+            return False
+        except Exception:
+            queue.fail(owner, entry)
+            return False
+        return queue.complete(owner, entry, picks)
+
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+        while max_entries is None or done < max_entries:
+            n = batch if max_entries is None else min(batch, max_entries - done)
+            ids = queue.claim(owner, n)
+            if not ids:
+                break
+            done += sum(pool.map(one, ids))
+    return done
+
+
+def differentials(t: TemplateOwnership, xtot: Dict[int, float], squad_ids: Sequence[int],
+                  top: int = 5) -> Tuple[List[Tuple[int, float, float]], List[Tuple[int, float, float]]]:
+    """
+    Rank-relevant horizon points vs the template, as (element, score, EO):
+      yours    owned players by xPts * (1 - EO)       what you gain on the field
+      threats  players you don't own by xPts * EO     what the field gains on you
+    """
+    owned = set(squad_ids)
+    ids = np.array(list(xtot), dtype=np.int64)
+    x = np.array([xtot[i] for i in ids.tolist()])
+    eo = np.array([t.eo_of(i) for i in ids.tolist()])
+    mine = np.isin(ids, list(owned))
+    gain = np.where(mine, x * (1.0 - np.minimum(eo, 1.0)), -np.inf)
+    threat = np.where(~mine, x * eo, -np.inf)
+
+    def best(score):
+        order = np.argsort(-score, kind="stable")[:top]
+        return [(int(ids[k]), float(score[k]), float(eo[k])) for k in order if np.isfinite(score[k])]
+
+    return best(gain), best(threat)
+
+
+def _worker_main(path: str, threads: int, batch: int) -> None:
+    import planner
+
+    print(f"worker {os.getpid()}: counted {work(TemplateQueue(path), planner.build_client(), threads, batch)}")
+
+
+def main(argv=None):
+    import planner
+
+    ap = argparse.ArgumentParser(description="Top-N template ownership via a shared SQLite work queue")
+    ap.add_argument("--db", default=planner.TEMPLATE_DB or "snapshots/template.sqlite")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sd = sub.add_parser("seed", help="queue the top N overall entries for the current GW")
+    sd.add_argument("--top", type=int, default=planner.TEMPLATE_TOP)
+    wk = sub.add_parser("work", help="drain the queue (run on as many machines as share the file)")
+    wk.add_argument("--procs", type=int, default=1)
+    wk.add_argument("--threads", type=int, default=4, help="picks fetches in flight per process")
+    wk.add_argument("--batch", type=int, default=BATCH)
+    sh = sub.add_parser("show", help="print the running template table")
+    sh.add_argument("--top", type=int, default=30)
+    args = ap.parse_args(argv)
+
+    q = TemplateQueue(args.db)
+    if args.cmd == "seed":
+        client = planner.build_client()
+        bootstrap = client.bootstrap()
+        cur = [e for e in bootstrap["events"] if e.get("is_current")]
+        event = cur[0]["id"] if cur else planner.get_current_event(bootstrap)
+        print(f"queued {seed_top(q, client, event, args.top)} entries for GW{event}")
+    elif args.cmd == "work":
+        import multiprocessing as mp
+
+        procs = [mp.Process(target=_worker_main, args=(args.db, args.threads, args.batch))
+                 for _ in range(max(1, args.procs))]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+    print("queue:", " ".join(f"{k} {v}" for k, v in q.progress().items()))
+    if args.cmd == "show":
+        t = q.ownership()
+        els = {e["id"]: e for e in planner.build_client().bootstrap()["elements"]}
+        print(f"\nTemplate – top {t.n} sampled, GW{t.event}\n")
+        print(f"{'Player':<20} {'Own':>6} {'Start':>6} {'Capt':>6} {'EO':>6} {'Overall':>8}")
+        for k in np.argsort(-t.eo)[: args.top]:
+            el = els.get(int(t.element[k]), {})
+            print(f"{el.get('web_name', t.element[k]):<20} {t.own[k]:>6.1%} {t.start[k]:>6.1%} {t.cap[k]:>6.1%} "
+                  f"{t.eo[k]:>6.2f} {float(el.get('selected_by_percent') or 0) / 100:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# tests/test_advisor.py
+import requests
+
+import advisor
+
+
+class _PreDeadlineClient:
+    """tiny_league's client, with GW2 picks not public yet (GW1's are)."""
+
+    def __init__(self, league):
+        self.league = league
+
+    def __getattr__(self, name):
+        return getattr(self.league.client, name)
+
+    def entry(self, team_id):
+        return {"id": team_id, "bank": 5}
+
+    def entry_picks(self, team_id, event):
+        if event != 1:
+            resp = requests.Response()
+            resp.status_code = 404
+            raise requests.HTTPError(response=resp)
+        return {"picks": [{"element": 101, "position": 1}, {"element": 102, "position": 2},
+                          {"element": 201, "position": 12}]}
+
+
+def test_picks_fallback_keeps_projecting_from_the_current_gw(tiny_league, monkeypatch, capsys):
+    seen = {}
+    project = advisor.project_squad
+
+    def project_squad(client, bootstrap, squad, fixtures, gw_range):
+        seen["gw_range"] = gw_range
+        return project(client, bootstrap, squad, fixtures, gw_range)
+
+    monkeypatch.setattr(advisor, "build_client", lambda snapshot_dir: _PreDeadlineClient(tiny_league))
+    monkeypatch.setattr(advisor, "project_squad", project_squad)
+    monkeypatch.setattr(advisor, "HORIZON", 2)
+    advisor.main()
+
+    assert seen["gw_range"] == [2, 3]             # not the finished GW1 the picks came from
+    assert "Using GW 2 (picks from GW 1)" in capsys.readouterr().out
@@ -0,0 +1,139 @@
+# tests/test_cache.py
+import multiprocessing as mp
+import threading
+import time
+
+from cache import SharedCache
+from fpl_client import FPLClient
+
+
+def _slow_fetch(log_path, value):
+    with open(log_path, "a") as f:
+        f.write("x")
+    time.sleep(0.3)
+    return value
+
+
+def _worker(db, log_path, q):
+    cache = SharedCache(db, poll=0.01)
+    q.put(cache.get_or_fetch("k", lambda: _slow_fetch(log_path, {"v": 1})))
+
+
+def test_single_flight_across_processes(tmp_path):
+    db, log_path = str(tmp_path / "c.sqlite"), str(tmp_path / "fetches.log")
+    ctx = mp.get_context("fork")
+    q = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(db, log_path, q)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    results = [q.get(timeout=20) for _ in procs]
+    for p in procs:
+        p.join(timeout=20)
+
+    assert results == [{"v": 1}] * 4
+    with open(log_path) as f:
+        assert f.read() == "x"
+
+
+def test_single_flight_across_threads_and_failed_leader_hands_over(tmp_path):
+    cache = SharedCache(str(tmp_path / "c.sqlite"), poll=0.01)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        time.sleep(0.1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return [1, 2, 3]
+
+    out, errors = [], []
+
+    def run():
+        try:
+            out.append(cache.get_or_fetch("k", flaky))
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 1                 # only the first leader saw the failure
+    assert out == [[1, 2, 3]] * 4
+    assert len(calls) == 2
+
+
+def test_ttl_expiry_refetches(tmp_path):
+    cache = SharedCache(str(tmp_path / "c.sqlite"), ttl=0.05)
+    n = []
+    assert cache.get_or_fetch("k", lambda: n.append(1) or len(n)) == 1
+    assert cache.get_or_fetch("k", lambda: n.append(1) or len(n)) == 1
+    time.sleep(0.1)
+    assert cache.get_or_fetch("k", lambda: n.append(1) or len(n)) == 2
+
+
+class _Resp:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+class _Session:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        return _Resp({"url": url})
+
+
+def test_client_uses_cache_except_for_private_endpoints(tmp_path):
+    cache = SharedCache(str(tmp_path / "c.sqlite"))
+    sess = _Session()
+    a = FPLClient(session=sess, cache=cache)
+    b = FPLClient(session=sess, cache=cache)   # e.g. advisor + planner
+
+    a.bootstrap(); b.bootstrap()
+    a.element_summary(7); b.element_summary(7)
+    a.my_team(1); b.my_team(1)
+
+    assert sum("bootstrap-static" in u for u in sess.urls) == 1
+    assert sum("element-summary/7" in u for u in sess.urls) == 1
+    assert sum("my-team" in u for u in sess.urls) == 2
+
+
+class _FlakySession:
+    """503 (after `delay` s) for the first `fails` requests, then a body."""
+
+    def __init__(self, fails, delay):
+        self.fails, self.delay, self.calls = fails, delay, 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        r = _Resp({"url": url})
+        r.status_code, r.headers = (503 if self.calls <= self.fails else 200), {}
+        return r
+
+
+def test_retrying_leader_keeps_its_lease(tmp_path):
+    cache = SharedCache(str(tmp_path / "c.sqlite"), lease=0.25, poll=0.01)
+    sess = _FlakySession(fails=3, delay=0.15)          # ~0.7 s of retries, well past the lease
+    client = FPLClient(session=sess, cache=cache, retries=3, backoff=0.02)
+    out = []
+    leader = threading.Thread(target=lambda: out.append(client.bootstrap()))
+    leader.start()
+    time.sleep(0.05)
+    other = _Session()
+    out.append(FPLClient(session=other, cache=cache).bootstrap())
+    leader.join()
+
+    assert sess.calls == 4 and other.urls == []       # the waiter never fetched itself
+    assert out[0] == out[1]
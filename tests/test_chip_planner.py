@@ -0,0 +1,65 @@
+# tests/test_chip_planner.py
+import numpy as np
+
+from chip_planner import fixture_count_matrix, plan_chips
+
+
+def _squad(G, base=2.0):
+    pos = np.array([1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4])
+    x = np.full((15, G), base)
+    return x, pos
+
+
+def test_fixture_count_matrix_flags_doubles_and_blanks():
+    fixtures = [
+        {"event": 1, "team_h": 1, "team_a": 2},
+        {"event": 2, "team_h": 1, "team_a": 3},
+        {"event": 2, "team_h": 2, "team_a": 1},
+        {"event": None, "team_h": 3, "team_a": 2},   # unscheduled
+    ]
+    counts = fixture_count_matrix(fixtures, [1, 2, 3], [1, 2])
+    assert counts.tolist() == [[1, 2], [1, 1], [0, 1]]
+
+
+def test_plan_chips_picks_distinct_weeks_with_dgw_peaks():
+    G = 6
+    events = list(range(10, 10 + G))
+    x, pos = _squad(G)
+    x[12, 3] = 14.0          # captain's DGW in GW13
+    x[:, 4] = 4.0            # whole squad doubles up in GW14
+    cost = np.full(15, 5.0)
+
+    plan = plan_chips(events, x, pos, cost, 0.0, x.copy(), pos, np.arange(15), cost,
+                      chips=["bboost", "3xc"], min_ev=5.0)
+    assert plan.assignments["3xc"][0] == 13
+    assert plan.assignments["bboost"][0] == 14
+    assert "freehit" not in plan.assignments and "wildcard" not in plan.assignments
+
+
+def test_plan_chips_respects_blacklist():
+    G = 4
+    x, pos = _squad(G)
+    x[12, 1] = 12.0
+    x[12, 2] = 10.0
+    cost = np.full(15, 5.0)
+    plan = plan_chips([1, 2, 3, 4], x, pos, cost, 0.0, x.copy(), pos, np.arange(15), cost,
+                      chips=["3xc"], blacklist=[2])
+    assert plan.assignments["3xc"][0] == 3
+
+
+def test_every_allowed_wildcard_week_is_valued():
+    G = 6
+    x, pos = _squad(G)
+    x[12, 1] = 30.0                                   # a huge captain week dwarfs every FH gain
+    cost = np.full(15, 5.0)
+    pool_x = np.vstack([x, np.full((1, G), 2.0)])
+    pool_x[15, 3:] = 9.0                              # a new midfielder worth a rebuild from GW4
+    pool_pos, pool_team = np.append(pos, 3), np.append(np.arange(15), 99)
+    plan = plan_chips(list(range(1, G + 1)), x, pos, cost, 0.0, pool_x, pool_pos, pool_team,
+                      np.append(cost, 5.0), chips=["wildcard", "3xc"], wc_horizon=3, blacklist=[5])
+
+    wc_weeks = [gw for gw, _ in plan.best_weeks["wildcard"]]
+    assert len(wc_weeks) == 3 and 5 not in wc_weeks
+    assert plan.assignments["3xc"][0] == 2
+    assert plan.assignments["wildcard"] == plan.best_weeks["wildcard"][0]
+    assert plan.assignments["wildcard"][0] in (3, 4)
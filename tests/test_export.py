@@ -0,0 +1,79 @@
+# tests/test_export.py
+import json
+
+import numpy as np
+import pytest
+
+from export import SCHEMA, projection_tables, read_export, write_export
+from planner import (
+    PlayerProj,
+    build_fixtures_index,
+    compute_strength_means,
+    project_player_points_by_gw,
+    projection_table,
+)
+
+
+def _tables(tiny_league):
+    teams_by_id = {t["id"]: t for t in tiny_league.teams}
+    proj = projection_table(tiny_league.client, tiny_league.elements, build_fixtures_index(tiny_league.fixtures),
+                            [2, 3], teams_by_id, compute_strength_means(tiny_league.teams))
+    squad = [PlayerProj(101, "SolidDef", 2, 1, 4.5, {}, 0.0, True), PlayerProj(201, "BenchGK", 1, 1, 4.0, {}, 0.0, False)]
+    buy = PlayerProj(202, "AltDef", 2, 2, 4.5, {}, 0.0, True)
+    return proj, projection_tables(tiny_league.bootstrap, proj, squad, [(squad[0], buy, 2.5, 2.5, False)])
+
+
+def test_projection_table_matches_single_player_projection(tiny_league):
+    proj, _ = _tables(tiny_league)
+    teams_by_id = {t["id"]: t for t in tiny_league.teams}
+    idx = build_fixtures_index(tiny_league.fixtures)
+    means = compute_strength_means(tiny_league.teams)
+    for k, el in enumerate(tiny_league.elements):
+        one = project_player_points_by_gw(tiny_league.client, el, idx, [2, 3], teams_by_id, means)
+        assert np.allclose(proj["xpts"][k], [one[2], one[3]])
+    assert (proj["fixture_scalar"][:, 0] > 0).all() and (proj["fixture_scalar"][:, 1] == 0).all()
+
+
+def test_export_roundtrip_is_memory_mapped_with_stable_dtypes(tiny_league, tmp_path):
+    proj, tables = _tables(tiny_league)
+    out = str(tmp_path / "run")
+    write_export(out, tables, {"event": 2})
+    write_export(out, tables, {"event": 2})          # replaces the previous export in place
+
+    info, t = read_export(out)
+    assert info["event"] == 2 and info["tables"]["players"]["rows"] == 5
+    players = t["players"]
+    assert isinstance(players["xpts"], np.memmap) and players["xpts"].shape == (5, 2)
+    for table, cols in SCHEMA.items():
+        for name, dtype, _ in cols:
+            assert t[table][name].dtype == np.dtype(dtype)
+    assert np.allclose(players["xpts"], proj["xpts"].astype(np.float32))
+    assert list(players["name"][:2]) == ["SolidDef", "HotStrk"]
+    assert players["in_squad"].tolist() == [True, False, True, False, False]
+    assert players["starter"].tolist() == [True, False, False, False, False]
+    assert t["transfers"]["buy_id"].tolist() == [202]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run", "run.versions"]   # no temp links left behind
+
+    # a reader holding the previous version keeps reading it across later exports
+    held = (tmp_path / "run").resolve()
+    write_export(out, tables, {"event": 3})
+    assert read_export(str(held))[0]["event"] == 2 and read_export(out)[0]["event"] == 3
+    write_export(out, tables, {"event": 4})
+    assert len(list((tmp_path / "run.versions").iterdir())) == 2 and not held.exists()
+
+
+def test_export_rejects_ragged_columns_and_foreign_schema(tiny_league, tmp_path):
+    _, tables = _tables(tiny_league)
+    tables["players"]["cost"] = tables["players"]["cost"][:3]
+    with pytest.raises(ValueError):
+        write_export(str(tmp_path / "bad"), tables)
+    assert list(tmp_path.iterdir()) == []
+
+    _, tables = _tables(tiny_league)
+    out = tmp_path / "run"
+    write_export(str(out), tables)
+    info = json.loads((out / "schema.json").read_text())
+    info["version"] = 99
+    (out / "schema.json").write_text(json.dumps(info))
+    with pytest.raises(ValueError):
+        read_export(str(out))
@@ -0,0 +1,57 @@
+# tests/test_fixture_model.py
+import numpy as np
+
+import planner
+from fixture_model import ATTACK_WEIGHT, CLAMP, CS_WEIGHT, fit_outcomes
+from planner import compute_strength_means, fixture_strength_scalar
+
+TEAMS = [
+    {"id": 1, "strength_attack_home": 1350, "strength_attack_away": 1340,
+     "strength_defence_home": 1360, "strength_defence_away": 1350},
+    {"id": 2, "strength_attack_home": 1050, "strength_attack_away": 1040,
+     "strength_defence_home": 1060, "strength_defence_away": 1080},
+    {"id": 3, "strength_attack_home": 1180, "strength_attack_away": 1170,
+     "strength_defence_home": 1190, "strength_defence_away": 1180},
+]
+FIXTURES = [
+    {"id": 1, "event": 1, "team_h": 1, "team_a": 2},
+    {"id": 2, "event": 2, "team_h": 2, "team_a": 3},
+    {"id": 3, "event": 3, "team_h": 3, "team_a": 1},
+]
+
+
+def test_outcomes_are_team_level_and_consistent():
+    o = fit_outcomes(FIXTURES, TEAMS)
+    assert o.xg.shape == (3, 2) and o.scalars.shape == (3, 2, 5)
+    # strong home side vs weak visitors: more goals for, likelier clean sheet
+    assert o.xg[0, 0] > o.xg[0, 1] and o.cs[0, 0] > o.cs[0, 1]
+    assert np.allclose(o.cs, np.exp(-o.xg[:, ::-1]))
+    # the same fixture row serves every player on that side
+    gk = o.scalar(FIXTURES[0], {"team": 1, "element_type": 1})
+    fwd = o.scalar(FIXTURES[0], {"team": 1, "element_type": 4})
+    assert gk == o.scalars[0, 0, 1] and fwd == o.scalars[0, 0, 4]
+    assert o.scalar(FIXTURES[0], {"team": 2, "element_type": 1}) < 1.0 < gk
+
+
+def test_position_mix_of_cs_and_xg():
+    o = fit_outcomes(FIXTURES, TEAMS)
+    cs_rel = o.cs / o.cs.mean()
+    xg_rel = o.xg / o.xg.mean()
+    for pos in (1, 2, 3, 4):
+        w_cs, w_att = CS_WEIGHT[pos], ATTACK_WEIGHT[pos]
+        want = np.clip((1 - w_cs - w_att) + w_cs * cs_rel + w_att * xg_rel, *CLAMP)
+        assert np.allclose(o.scalars[..., pos], want)
+    # forwards ignore clean sheets entirely
+    assert CS_WEIGHT[4] == 0.0
+
+
+def test_planner_scalar_uses_outcomes_and_falls_back(monkeypatch):
+    teams_by_id = {t["id"]: t for t in TEAMS}
+    means = compute_strength_means(TEAMS)
+    player = {"team": 1, "element_type": 3}
+    plain = fixture_strength_scalar(FIXTURES[0], player, teams_by_id, means)
+    o = fit_outcomes(FIXTURES, TEAMS)
+    monkeypatch.setattr(planner, "FIXTURE_OUTCOMES", o)
+    assert fixture_strength_scalar(FIXTURES[0], player, teams_by_id, means) == o.scalar(FIXTURES[0], player)
+    unmodeled = {"id": 99, "event": 4, "team_h": 1, "team_a": 2}
+    assert fixture_strength_scalar(unmodeled, player, teams_by_id, means) == plain
@@ -0,0 +1,44 @@
+# tests/test_history.py
+import numpy as np
+
+from history import HISTORY_FIELDS, PackedHistory, pack_summary
+from minutes_model import history_row
+from models import recent_points_ppA
+from priors import ingest
+
+
+def _summary():
+    hist = [
+        {"round": r, "minutes": m, "starts": s, "total_points": p, "was_home": r % 2 == 0,
+         "opponent_team": 3, "expected_goals": "0.45", "kickoff_time": "2025-08-16T14:00:00Z", "bps": 20}
+        for r, (m, s, p) in enumerate([(90, 1, 6), (0, 0, 0), (25, 0, 1), (90, 1, 2), (88, 1, 9)], start=1)
+    ]
+    hist[2].pop("starts")
+    return {
+        "fixtures": [{"id": 1, "event": 6}],
+        "history": hist,
+        "history_past": [{"season_name": "2024/25", "start_cost": 55, "total_points": 130, "minutes": 2500}],
+    }
+
+
+def test_pack_keeps_requested_fields_only():
+    packed = pack_summary(_summary(), extra=["expected_goals"])
+    assert set(packed) == {"history", "history_past"}
+    h = packed["history"]
+    assert isinstance(h, PackedHistory) and len(h) == 5
+    assert h.data.dtype == np.float32 and h.data.shape == (5, len(HISTORY_FIELDS) + 1)
+    assert np.allclose(h.column("expected_goals"), 0.45)
+    assert h[0].get("bps") is None and h[0].get("kickoff_time", "-") == "-"
+    assert h[2].get("starts") is None                      # missing in the source stays missing
+    assert h[0].get("was_home") == 0 and h[1]["was_home"] == 1
+
+
+def test_packed_reads_like_raw_history():
+    raw = _summary()
+    packed = pack_summary(raw)
+    assert recent_points_ppA(packed["history"]) == recent_points_ppA(raw["history"])
+    for a, b in zip(history_row(packed["history"], 6), history_row(raw["history"], 6)):
+        assert np.array_equal(a, b)
+    els = [{"id": 7, "element_type": 3, "now_cost": 60}]
+    for key, col in ingest(els, [packed]).items():
+        assert np.array_equal(col, ingest(els, [raw])[key], equal_nan=True)   # starts: NaN when absent
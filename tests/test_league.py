@@ -0,0 +1,114 @@
+# tests/test_league.py
+import math
+
+import numpy as np
+import requests
+
+import league as ml
+
+
+class _LeagueClient:
+    """Two standings pages; entry 4 joined late and has no picks for the GW."""
+
+    def __init__(self, picks):
+        self.picks = picks
+
+    def league_standings(self, league_id, page=1):
+        rows = [{"entry": e, "entry_name": f"T{e}", "total": 100 + e} for e in sorted(self.picks) + [4]]
+        chunk = rows[(page - 1) * 2: page * 2]
+        return {"league": {"name": "Mates"}, "standings": {"has_next": page * 2 < len(rows), "results": chunk}}
+
+    def entry_picks(self, entry, event):
+        if entry not in self.picks:
+            raise requests.HTTPError("404")
+        return {"picks": [{"element": e, "multiplier": m} for e, m in self.picks[entry].items()]}
+
+
+def test_fetch_league_builds_multiplier_matrix_and_eo():
+    client = _LeagueClient({1: {10: 2, 11: 1, 12: 0}, 2: {10: 1, 11: 2}, 3: {10: 3, 13: 1}})
+    lg = ml.fetch_league(client, 99, event=5, element_ids=[10, 11, 12, 13], workers=2)
+
+    assert lg.name == "Mates" and list(lg.entry_ids) == [1, 2, 3]
+    assert lg.mult.tolist() == [[2, 1, 0, 0], [1, 2, 0, 0], [3, 0, 0, 1]]
+    eo = ml.effective_ownership(lg.mult)
+    assert np.allclose(eo["eo"], [2.0, 1.0, 0.0, 1 / 3])
+    assert np.allclose(eo["own"], [1.0, 2 / 3, 0.0, 1 / 3])
+    assert np.allclose(eo["cap"], [2 / 3, 1 / 3, 0.0, 0.0])
+
+
+def test_erf_matches_math_erf():
+    x = np.linspace(-4, 4, 81)
+    assert np.max(np.abs(ml._erf(x) - np.array([math.erf(v) for v in x]))) < 2e-7
+
+
+def test_expected_rank_options_match_direct_computation():
+    rng = np.random.default_rng(0)
+    R, P = 300, 40
+    mult = np.zeros((R, P), dtype=np.int8)
+    for r in range(R):
+        cols = rng.choice(P, 11, replace=False)
+        mult[r, cols] = 1
+        mult[r, cols[0]] = 2
+    lg = ml.League(1, "x", np.arange(R), [""] * R, rng.normal(500, 10, R), mult, np.arange(P), 1)
+    mu = rng.uniform(1, 7, P)
+    mine = np.zeros(P)
+    mine[:11] = 1
+    mine[0] = 2
+
+    opts = list(range(11))
+    deltas = np.vstack([ml.captain_deltas(mine, opts), ml.transfer_delta(mine, 3, 20)])
+    ranks = ml.expected_rank(lg, mine, 500.0, mu, deltas=deltas)
+
+    var = ml.points_variance(mu)
+    for k, d in enumerate(np.vstack([np.zeros(P), deltas])):
+        m = mine + d
+        diff = lg.mult - m
+        z = (lg.totals - 500.0 + diff @ mu) / np.sqrt((diff * diff) @ var)
+        direct = 1 + sum(0.5 * (1 + math.erf(v / math.sqrt(2))) for v in z)
+        assert abs(ranks[k] - direct) < 1e-4
+    assert ranks[1] == ranks[0]                      # captaining the current captain changes nothing
+
+
+def test_captaining_the_template_pick_protects_rank():
+    # everyone owns and captains player 0; I own him but captain a differential
+    R, P = 50, 3
+    mult = np.zeros((R, P), dtype=np.int8)
+    mult[:, 0] = 2
+    mult[:, 1] = 1
+    lg = ml.League(1, "x", np.arange(R), [""] * R, np.full(R, 100.0), mult, np.arange(P), 1)
+    mine = np.array([1.0, 1.0, 2.0])
+    mu = np.array([8.0, 3.0, 4.0])
+    ranks = ml.expected_rank(lg, mine, 100.0, mu, deltas=ml.captain_deltas(mine, [0]))
+    assert ranks[1] < ranks[0]
+
+
+def test_league_report_scores_the_projection_gw_with_fallback_picks(monkeypatch, capsys):
+    import planner
+    from lineup import Lineup
+
+    class Client(_LeagueClient):
+        fetched = set()
+
+        def entry_picks(self, entry, event):
+            self.fetched.add(event)
+            return super().entry_picks(entry, event)
+
+    seen, rank = {}, ml.expected_rank
+
+    def expected_rank(lg, mine, my_total, mu, **kw):
+        seen["mu"] = mu
+        return rank(lg, mine, my_total, mu, **kw)
+
+    client = Client({1: {10: 2, 11: 1}, 2: {10: 1, 11: 2}})
+    monkeypatch.setattr(ml, "expected_rank", expected_rank)
+    monkeypatch.setattr(planner, "LEAGUE_MAX_ENTRIES", None)
+    bootstrap = {"elements": [{"id": e, "web_name": f"P{e}"} for e in (10, 11)]}
+    projs = [planner.PlayerProj(e, f"P{e}", 3, 1, 5.0, {}, 0.0, True) for e in (10, 11)]
+    xmaps = {10: {5: 6.0, 6: 1.0}, 11: {5: 3.0, 6: 1.0}}
+
+    # picks fell back to GW4 (deadline not passed); projections are for GW5
+    planner.league_report(client, bootstrap, 99, 5, 4, {"picks": []}, 100, xmaps,
+                          Lineup([0, 1], [], 0, 1, (0, 0, 2), 9.0, 0.0), projs, [])
+    assert client.fetched == {4}
+    assert seen["mu"].tolist() == [6.0, 3.0]
+    assert "GW4 picks" in capsys.readouterr().out
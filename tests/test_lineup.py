@@ -0,0 +1,57 @@
+# tests/test_lineup.py
+import itertools
+
+import numpy as np
+
+from lineup import FORMATIONS, optimize_lineup, xi_values
+
+POS = [1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4]
+
+
+def _brute_force_xi(x, pos):
+    """Best legal XI sum by trying every 11 of 15 (reference for the optimizer)."""
+    best = 0.0
+    for xi in itertools.combinations(range(15), 11):
+        c = [sum(1 for i in xi if pos[i] == k) for k in (1, 2, 3, 4)]
+        if c[0] == 1 and 3 <= c[1] <= 5 and 2 <= c[2] <= 5 and 1 <= c[3] <= 3:
+            best = max(best, sum(x[i] for i in xi))
+    return best
+
+
+def test_formations_are_the_eight_legal_shapes():
+    assert len(FORMATIONS) == 8
+    assert (4, 4, 2) in FORMATIONS and (5, 2, 3) in FORMATIONS and (3, 3, 4) not in FORMATIONS
+
+
+def test_optimizer_matches_brute_force_and_picks_captain():
+    rng = np.random.default_rng(7)
+    for _ in range(5):
+        x = list(rng.uniform(0, 8, size=15))
+        lu = optimize_lineup(x, POS)
+        assert len(lu.xi) == 11 and len(lu.bench) == 4
+        assert POS[lu.bench[0]] == 1                       # backup GK sits first
+        assert abs(sum(x[i] for i in lu.xi) - _brute_force_xi(x, POS)) < 1e-9
+        assert lu.captain == max(lu.xi, key=lambda i: x[i])
+        assert lu.autosub_ev == 0.0
+
+
+def test_autosub_ev_and_vice_with_doubtful_starters():
+    x = [5, 1, 4, 4, 4, 1, 1, 6, 5, 5, 2, 1, 8, 3, 1]
+    p = [1.0] * 15
+    p[12] = 0.5            # doubtful captain candidate
+    lu = optimize_lineup(x, POS, p)
+    assert lu.autosub_ev > 0
+    # armband value: 8 + 0.5 * 6 beats 6 + 0 * 8
+    assert (lu.captain, lu.vice) == (12, 7)
+    # first bench outfielder is the best one left out
+    assert x[lu.bench[1]] == max(x[i] for i in lu.bench[1:])
+
+
+def test_batch_xi_values_match_single_optimizer():
+    rng = np.random.default_rng(3)
+    x = rng.uniform(0, 8, size=(15, 6))
+    xi, bench, cap = xi_values(x, np.array(POS))
+    for j in range(6):
+        lu = optimize_lineup(list(x[:, j]), POS)
+        assert abs(xi[j] + cap[j] - lu.xpts) < 1e-9
+        assert abs(bench[j] - sum(x[i, j] for i in lu.bench)) < 1e-9
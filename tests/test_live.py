@@ -0,0 +1,112 @@
+# tests/test_live.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fpl_client import FPLClient
+from live import LiveTracker, run
+
+EVENT = 5
+
+
+def _fixtures(done_1=False, done_2=False, started=True):
+    return [
+        {"id": 1, "event": EVENT, "team_h": 1, "team_a": 2, "started": started, "finished": done_1,
+         "team_h_score": 1, "team_a_score": 0},
+        {"id": 2, "event": EVENT, "team_h": 3, "team_a": 4, "started": started, "finished": done_2,
+         "team_h_score": 0, "team_a_score": 0},
+    ]
+
+
+def _live(stats):
+    return {"elements": [{"id": i, "stats": {"minutes": m, "total_points": p}} for i, (m, p) in stats.items()]}
+
+
+# Squad: GK 1 (team 1), DEF 2-4, MID 5-9, FWD 10-11 | bench GK 12, DEF 13, MID 14, FWD 15
+POS = {1: 1, 2: 2, 3: 2, 4: 2, 5: 3, 6: 3, 7: 3, 8: 3, 9: 3, 10: 4, 11: 4, 12: 1, 13: 2, 14: 3, 15: 4}
+TEAM = {i: (1 if i <= 5 else 3 if i <= 10 else 4) for i in POS}
+TEAM[13] = 2
+
+BOOTSTRAP = {"elements": [{"id": i, "web_name": f"P{i}", "element_type": p, "team": TEAM[i]} for i, p in POS.items()]}
+PICKS = {"active_chip": None, "picks": [
+    {"element": i, "position": i, "multiplier": 2 if i == 10 else (1 if i <= 11 else 0),
+     "is_captain": i == 10, "is_vice_captain": i == 5}
+    for i in POS
+]}
+
+# Recorded polls: kick-off, a goal, the team-3 game ends with FWD 10 (captain) and MID 9 unused
+BASE = {i: (60, 2) for i in POS}
+POLLS = [
+    (_live(BASE), _fixtures()),
+    (_live(BASE), _fixtures()),                                   # nothing moved
+    (_live({**BASE, 2: (70, 8)}), _fixtures()),                   # DEF 2 scores
+    (_live({**BASE, 2: (90, 8), 9: (0, 0), 10: (0, 0), 13: (90, 6)}),
+     _fixtures(done_1=True, done_2=True)),
+]
+
+
+@pytest.fixture
+def replay_server():
+    """Stand-in API that replays recorded (live, fixtures) payloads poll by poll."""
+    state = {"live": 0, "fixtures": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith(f"/api/event/{EVENT}/live/"):
+                body = POLLS[min(state["live"], len(POLLS) - 1)][0]
+                state["live"] += 1
+            elif self.path.startswith("/api/fixtures/"):
+                body = POLLS[min(state["fixtures"], len(POLLS) - 1)][1]
+                state["fixtures"] += 1
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/api"
+    srv.shutdown()
+
+
+def test_live_tracker_diffs_polls_and_resolves_autosubs(replay_server, tmp_path):
+    client = FPLClient(base_url=replay_server)
+    tracker = LiveTracker(client, EVENT, BOOTSTRAP, PICKS)
+    updates = []
+    run(tracker, [updates.append], interval=0, record_dir=str(tmp_path))
+
+    assert tracker.polls == 4
+    assert [u["poll"] for u in updates] == [1, 3, 4]            # poll 2 changed nothing
+    assert updates[0]["total"] == 2 * 11 + 2                    # captain doubled
+    assert updates[1]["delta"] == 6
+    assert [c["name"] for c in updates[1]["changes"]] == ["P2"]
+
+    final = updates[-1]
+    # captain blanked -> vice (P5) takes the armband; blanks are replaced in bench
+    # order: MID 9 -> DEF 13, then FWD 10 -> MID 14 (FWD 11 still covers the 1-FWD minimum)
+    assert final["captain"] == "P5"
+    subbed = {(s["out"], s["in"]) for s in final["autosubs"]}
+    assert ("P9", "P13") in subbed and ("P10", "P14") in subbed
+    # GK 2, DEFs 8+2+2, MIDs 2*2 (vice) + 2+2+2, FWD 11 2, subs 6 + 2
+    assert final["total"] == 2 + 12 + 10 + 2 + 8
+    assert (tmp_path / str(EVENT) / "0004-live.json").exists()
+
+
+def test_bench_boost_scores_everyone_without_subs():
+    picks = dict(PICKS, active_chip="bboost",
+                 picks=[dict(p, multiplier=max(p["multiplier"], 1)) for p in PICKS["picks"]])
+    tracker = LiveTracker(None, EVENT, BOOTSTRAP, picks)
+    up = tracker.update(_live(BASE), _fixtures(done_1=True, done_2=True))
+    assert up["total"] == 2 * 15 + 2
+    assert up["autosubs"] == []
@@ -0,0 +1,61 @@
+# tests/test_minutes_model.py
+import numpy as np
+
+from minutes_model import availability, availability_by_gw, fit_minutes, history_matrix, minutes_model
+
+
+def _hist(mins, starts=None):
+    rows = [{"minutes": m, "total_points": 2 if m else 0} for m in mins]
+    if starts is not None:
+        for r, s in zip(rows, starts):
+            r["starts"] = s
+    return rows
+
+
+def test_nailed_rotation_and_unused_players_are_ordered():
+    players = [{"status": "a"}] * 3
+    hists = [
+        _hist([90, 90, 90, 90, 90, 90]),      # nailed
+        _hist([90, 15, 90, 0, 70, 20]),       # rotation
+        _hist([0, 0, 0, 0, 0, 0]),            # unused
+    ]
+    mm = minutes_model(hists, players, window=6)
+    assert mm["p60"][0] > 0.85
+    assert mm["p60"][0] > mm["p60"][1] > mm["p60"][2]
+    assert mm["p_play"][1] > mm["p60"][1]          # cameos count towards playing at all
+    assert 80 <= mm["xmins"][0] <= 90
+    assert mm["xmins"][2] < 10
+
+
+def test_availability_and_starts_field():
+    hists = [_hist([90] * 6), _hist([90] * 6), _hist([65] * 6, starts=[0] * 6)]
+    players = [{"status": "a"}, {"status": "d", "chance_of_playing_next_round": 50}, {"status": "a"}]
+    mm = minutes_model(hists, players, window=6)
+    assert np.isclose(mm["p_start"][1], 0.5 * mm["p_start"][0])
+    # 65-minute sub appearances are not starts when the API says so
+    assert mm["p_start"][2] == 0.0
+
+
+def test_p60_floor_only_for_players_who_started():
+    players = [{"status": "a"}] * 2
+    hists = [_hist([90, 0, 0, 0, 0, 0]), _hist([0, 0, 0, 0, 0, 0])]
+    floored = minutes_model(hists, players, window=6, p60_floor=0.4)
+    assert floored["p60"][0] == 0.4
+    assert floored["p60"][1] == 0.0
+
+
+def test_next_round_doubt_eases_over_the_horizon():
+    players = [{"status": "a"}, {"status": "d", "chance_of_playing_next_round": 25},
+               {"status": "u", "chance_of_playing_next_round": 0}]
+    avail = availability_by_gw(players, 4)
+    assert avail.shape == (3, 4) and (avail[0] == 1.0).all()
+    assert avail[1, 0] == 0.25 and np.all(np.diff(avail[1]) > 0) and avail[1, -1] > 0.9
+    assert (avail[2] == 0.0).all()                   # left the club: no recovery
+
+    mins, started, valid = history_matrix([[{"minutes": 90, "total_points": 2}] * 6] * 3, 6)
+    per_gw = fit_minutes(mins, started, valid, avail, 0.4)
+    first = fit_minutes(mins, started, valid, availability(players), 0.4)
+    for key in ("p_start", "p60", "p_play", "xmins", "scalar"):
+        assert per_gw[key].shape == (3, 4)
+        assert np.allclose(per_gw[key][:, 0], first[key])
+    assert per_gw["p60"][1, 3] > 3 * per_gw["p60"][1, 0]
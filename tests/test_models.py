@@ -0,0 +1,68 @@
+# tests/test_models.py
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+import models
+import planner
+from models import Model, recent_ppa
+from planner import build_features, build_fixtures_index, compute_strength_means, projection_table
+
+
+def _features(tiny_league, gws=(2, 3)):
+    teams_by_id = {t["id"]: t for t in tiny_league.teams}
+    return build_features(tiny_league.client, tiny_league.elements, build_fixtures_index(tiny_league.fixtures),
+                          list(gws), teams_by_id, compute_strength_means(tiny_league.teams))
+
+
+def test_recent_ppa_matches_per_player_loop():
+    rng = np.random.default_rng(4)
+    pts = rng.integers(0, 13, size=(50, 8)).astype(float)
+    mins = rng.choice([0, 0, 30, 90], size=(50, 8)).astype(float)
+    for n, decay in ((8, 0.88), (6, 1.0)):
+        got = recent_ppa(pts, mins, n, decay)
+        for k in range(50):
+            w, num, den = 1.0, 0.0, 0.0
+            for p, m in zip(pts[k, -n:][::-1], mins[k, -n:][::-1]):
+                if m > 0:
+                    num, den, w = num + p * w, den + w, w * decay
+            assert np.isclose(got[k], num / den if den else 0.0)
+
+
+def test_registry_and_parallel_ensemble(tiny_league):
+    f = _features(tiny_league)
+    with pytest.raises(ValueError, match="registered"):
+        models.parse_spec({"regression": 1, "nope": 1})
+    (reg, _), = models.build("regression", regression=0.2, min_baseline=1.0, unused=5)
+    assert (reg.regression, reg.min_baseline) == (0.2, 1.0)
+
+    ens = models.build({"regression": 3.0, "form": 1.0})
+    expected = 0.75 * ens[0][0].project(f) + 0.25 * ens[1][0].project(f)
+    assert np.allclose(models.project(ens, f, workers=1), expected)
+    assert np.allclose(models.project(ens, f, workers=2), expected)      # worker processes
+
+
+@dataclass
+class Flat(Model):
+    name = "flat"
+    level: float = 2.0
+
+    def project(self, f):
+        return np.where(f.mask, self.level, 0.0).sum(-1)
+
+
+def test_planner_projects_with_configured_models(tiny_league, monkeypatch):
+    monkeypatch.setitem(models.MODELS, "flat", Flat)
+    monkeypatch.setattr(planner, "PROJECTION_MODELS", {"flat": 1.0, "regression": 1.0})
+    idx = build_fixtures_index(tiny_league.fixtures)
+    teams_by_id = {t["id"]: t for t in tiny_league.teams}
+    means = compute_strength_means(tiny_league.teams)
+    table = projection_table(tiny_league.client, tiny_league.elements, idx, [2, 3], teams_by_id, means)
+    reg = models.build("regression", regression=planner.REGRESSION_FACTOR,
+                       min_baseline=planner.MIN_BASELINE)[0][0].project(_features(tiny_league))
+    assert np.allclose(table["xpts"][:, 0], (2.0 + reg[:, 0]) / 2)
+    assert (table["xpts"][:, 1] == 0).all()                              # blank GW stays blank
+    for k, el in enumerate(tiny_league.elements):
+        one = planner.project_player_points_by_gw(tiny_league.client, el, idx, [2, 3], teams_by_id, means)
+        assert np.allclose(table["xpts"][k], [one[2], one[3]])
@@ -0,0 +1,223 @@
+# tests/test_perf_budget.py
+"""
+Hard budgets for full runs on a full-size synthetic league: API calls per
+endpoint, wall time and peak traced memory. A failure prints the per-stage
+breakdown (endpoint calls and seconds, planner stages) to point at the
+regression.
+"""
+import contextlib
+import functools
+import io
+import json
+import random
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+import advisor
+import planner
+
+N_TEAMS, PER_TEAM, N_GWS, CURRENT = 20, 35, 38, 10
+N_ELEMENTS = N_TEAMS * PER_TEAM
+
+PLANNER_CALLS = {"bootstrap": 1, "fixtures": 1, "entry": 1, "entry_picks": 2,
+                 "element_summary": N_ELEMENTS, "my_team": 0}
+PLANNER_WALL_S = 6.0
+PLANNER_PEAK_MB = 8       # raw (unpacked) summaries kept alive: ~11 MB
+
+ADVISOR_CALLS = {"bootstrap": 1, "fixtures": 1, "entry": 1, "entry_picks": 2,
+                 "element_summary": 15, "my_team": 0}
+ADVISOR_WALL_S = 2.0
+ADVISOR_PEAK_MB = 10
+
+PLANNER_STAGES = ("projection_table", "plan_lineups", "propose_transfers", "plan_season_chips",
+                  "league_report", "write_export")
+ADVISOR_STAGES = ("project_squad", "suggest_captain_and_bench")
+
+
+def synthetic_league(seed=7):
+    rnd = random.Random(seed)
+    teams = [{"id": t, "name": f"Team {t}", "short_name": f"T{t:02d}",
+              **{k: rnd.randint(1050, 1350) for k in ("strength_attack_home", "strength_attack_away",
+                                                      "strength_defence_home", "strength_defence_away")}}
+             for t in range(1, N_TEAMS + 1)]
+    events = [{"id": g, "deadline_time": f"2025-08-{g % 28 + 1:02d}T10:00:00Z", "is_finished": g < CURRENT,
+               "is_previous": g == CURRENT - 1, "is_current": g == CURRENT - 1, "is_next": g == CURRENT}
+              for g in range(1, N_GWS + 1)]
+    layout = [1] * 3 + [2] * 11 + [3] * 12 + [4] * 9
+    elements = []
+    for t in range(1, N_TEAMS + 1):
+        for pos in layout:
+            eid = len(elements) + 1
+            elements.append({"id": eid, "web_name": f"P{eid}", "element_type": pos, "team": t,
+                             "now_cost": rnd.randint(40, 130), "status": rnd.choice("aaaaaaaad"),
+                             "chance_of_playing_next_round": None, "total_points": rnd.randint(0, 80),
+                             "form": f"{rnd.random() * 8:.1f}", "selected_by_percent": f"{rnd.random() * 30:.1f}",
+                             "transfers_in_event": rnd.randint(0, 50000), "transfers_out_event": rnd.randint(0, 50000)})
+    fixtures = []
+    for g in range(1, N_GWS + 1):
+        order = list(range(1, N_TEAMS + 1))
+        rnd.shuffle(order)
+        for i in range(0, N_TEAMS, 2):
+            fixtures.append({"id": len(fixtures) + 1, "event": g, "team_h": order[i], "team_a": order[i + 1],
+                             "team_h_difficulty": rnd.randint(2, 5), "team_a_difficulty": rnd.randint(2, 5),
+                             "finished": g < CURRENT})
+    summaries = {}
+    for e in elements:
+        hist = []
+        for g in range(1, CURRENT):
+            m = rnd.choice([0, 0, 30, 60, 90, 90, 90, 90])
+            hist.append({"element": e["id"], "round": g, "fixture": g, "opponent_team": rnd.randint(1, N_TEAMS),
+                         "was_home": rnd.random() < 0.5, "minutes": m, "starts": int(m >= 60),
+                         "total_points": rnd.randint(1, 12) if m else 0, "bps": rnd.randint(0, 40),
+                         "influence": f"{rnd.random() * 50:.1f}", "expected_goals": f"{rnd.random() * 0.5:.2f}",
+                         "kickoff_time": "2025-09-01T14:00:00Z", "value": e["now_cost"]})
+        summaries[e["id"]] = {
+            "fixtures": [{"id": f, "event": f, "difficulty": 3} for f in range(CURRENT, N_GWS + 1)],
+            "history": hist,
+            "history_past": [{"season_name": "2024/25", "start_cost": e["now_cost"],
+                              "total_points": rnd.randint(0, 200), "minutes": rnd.randint(0, 3400)}],
+        }
+    squad, clubs = [], {}
+    for pos, n in ((1, 2), (2, 5), (3, 5), (4, 3)):
+        for e in elements:
+            if sum(1 for s in squad if s["element_type"] == pos) == n:
+                break
+            if e["element_type"] == pos and e["now_cost"] < 70 and clubs.get(e["team"], 0) < 3:
+                squad.append(e)
+                clubs[e["team"]] = clubs.get(e["team"], 0) + 1
+    # XI: 1 GK, 4 DEF, 4 MID, 2 FWD, then the bench
+    xi = [squad[0], *squad[2:6], *squad[7:11], *squad[12:14]]
+    bench = [squad[1], squad[6], squad[11], squad[14]]
+    picks = {"picks": [{"element": e["id"], "position": k + 1, "multiplier": 2 if k == 0 else 1,
+                        "is_captain": k == 0, "is_vice_captain": k == 1} for k, e in enumerate(xi + bench)],
+             "active_chip": None}
+    bootstrap = {"events": events, "teams": teams, "elements": elements, "total_players": 10_000_000}
+    return bootstrap, fixtures, summaries, picks, {"id": 1, "bank": 5, "summary_overall_points": 500}
+
+
+class CountingClient:
+    """
+    In-memory API: counts calls and time per endpoint (thread-safe, the
+    planner fetches concurrently). Summaries are decoded from JSON on every
+    call, like a real response, so whatever a run keeps alive is traced.
+    """
+
+    def __init__(self, league):
+        self._bootstrap, self._fixtures, summaries, self._picks, self._entry = league
+        self._summaries = {k: json.dumps(v) for k, v in summaries.items()}
+        self.calls, self.seconds = {}, {}
+        self._lock = threading.Lock()
+
+    def _hit(self, name, fn):
+        t = time.perf_counter()
+        out = fn()
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t
+        return out
+
+    def bootstrap(self):
+        return self._hit("bootstrap", lambda: self._bootstrap)
+
+    def fixtures(self, event=None):
+        return self._hit("fixtures", lambda: [f for f in self._fixtures if event is None or f["event"] == event])
+
+    def entry(self, team_id):
+        return self._hit("entry", lambda: self._entry)
+
+    def entry_picks(self, team_id, event):
+        return self._hit("entry_picks", lambda: self._picks)
+
+    def element_summary(self, element_id):
+        return self._hit("element_summary", lambda: json.loads(self._summaries[element_id]))
+
+    def my_team(self, team_id):
+        return self._hit("my_team", lambda: {"picks": self._picks["picks"]})
+
+
+def _timed_stages(monkeypatch, module, names, stages):
+    for name in names:
+        fn = getattr(module, name)
+
+        @functools.wraps(fn)
+        def wrapper(*a, __fn=fn, __name=name, **kw):
+            t = time.perf_counter()
+            try:
+                return __fn(*a, **kw)
+            finally:
+                calls, secs = stages.get(__name, (0, 0.0))
+                stages[__name] = (calls + 1, secs + time.perf_counter() - t)
+
+        monkeypatch.setattr(module, name, wrapper)
+
+
+def _run(main):
+    out = io.StringIO()
+    tracemalloc.start()
+    t = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(out):
+            main()
+        wall = time.perf_counter() - t
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    return wall, peak, out.getvalue()
+
+
+def _check(label, client, stages, wall, peak, calls_budget, wall_budget, peak_budget):
+    lines = [f"{label}: wall {wall:.2f}s (budget {wall_budget}s), peak {peak:.1f} MB (budget {peak_budget} MB)",
+             "  endpoint                    calls  budget   seconds"]
+    failed = wall > wall_budget or peak > peak_budget
+    for name in sorted(set(calls_budget) | set(client.calls)):
+        n, cap = client.calls.get(name, 0), calls_budget.get(name, 0)
+        failed |= n > cap
+        flag = "  <-- over" if n > cap else ""
+        lines.append(f"  {name:<26} {n:>6} {cap:>7} {client.seconds.get(name, 0.0):>9.3f}{flag}")
+    lines.append("  stage                       calls   seconds")
+    for name, (n, secs) in sorted(stages.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"  {name:<26} {n:>6} {secs:>9.3f}")
+    report = "\n".join(lines)
+    print(report)
+    if failed:
+        pytest.fail(report, pytrace=False)
+
+
+@pytest.fixture(scope="module")
+def league():
+    return synthetic_league()
+
+
+def test_planner_end_to_end_budget(league, monkeypatch, tmp_path):
+    client = CountingClient(league)
+    monkeypatch.setattr(planner, "build_client", lambda: client)
+    monkeypatch.setattr(planner, "PRIORS_PATH", str(tmp_path / "priors.npz"))   # refit from history_past
+    monkeypatch.setattr(planner, "TIER_PRIORS", None)
+    monkeypatch.setattr(planner, "FIXTURE_OUTCOMES", None)
+    monkeypatch.setattr(planner, "TEAM_FORM_PATH", str(tmp_path / "team_form.npz"))
+    monkeypatch.setattr(planner, "PRICE_WATCH_FILE", None)
+    monkeypatch.setattr(planner, "LEAGUE_ID", None)
+    monkeypatch.setattr(planner, "EXPORT_DIR", str(tmp_path / "plan"))
+    monkeypatch.setattr(planner, "CHIPS_AVAILABLE", ["wildcard", "freehit", "bboost", "3xc"])
+    stages = {}
+    _timed_stages(monkeypatch, planner, PLANNER_STAGES, stages)
+
+    wall, peak, out = _run(lambda: planner.main(["plan"]))
+
+    assert "Captain suggestion" in out
+    _check("planner", client, stages, wall, peak, PLANNER_CALLS, PLANNER_WALL_S, PLANNER_PEAK_MB)
+
+
+def test_advisor_end_to_end_budget(league, monkeypatch):
+    client = CountingClient(league)
+    monkeypatch.setattr(advisor, "build_client", lambda snapshot_dir: client)
+    stages = {}
+    _timed_stages(monkeypatch, advisor, ADVISOR_STAGES, stages)
+
+    wall, peak, out = _run(advisor.main)
+
+    assert "Captain suggestion" in out
+    _check("advisor", client, stages, wall, peak, ADVISOR_CALLS, ADVISOR_WALL_S, ADVISOR_PEAK_MB)
@@ -0,0 +1,73 @@
+# tests/test_price_changes.py
+from price_changes import PriceChangeTracker
+from planner import (
+    PlayerProj,
+    build_fixtures_index,
+    compute_strength_means,
+    propose_transfers,
+)
+
+
+def _boot(rows, total_players=1_000_000):
+    """rows: (id, transfers_in_event, transfers_out_event, selected_by_percent, now_cost)"""
+    return {
+        "total_players": total_players,
+        "elements": [
+            {"id": i, "transfers_in_event": tin, "transfers_out_event": tout,
+             "selected_by_percent": str(own), "now_cost": cost, "status": "a"}
+            for (i, tin, tout, own, cost) in rows
+        ],
+    }
+
+
+def test_tracker_flags_riser_and_faller():
+    t = PriceChangeTracker(hours_ahead=6)
+    t.observe(_boot([(1, 10000, 500, 5.0, 60), (2, 200, 300, 5.0, 60), (3, 100, 9000, 5.0, 60)]), ts=0)
+    t.observe(_boot([(1, 40000, 600, 5.0, 60), (2, 250, 320, 5.0, 60), (3, 150, 30000, 5.0, 60)]), ts=3600)
+    pred = t.predict()
+
+    assert list(pred["ids"]) == [1, 2, 3]
+    assert pred["rise_prob"][0] > 0.9
+    assert pred["fall_prob"][2] > 0.9
+    assert abs(pred["risk"][1]) < 0.1
+    assert t.expected_change_by_id()[1] > 0.05
+
+
+def test_price_change_resets_progress(tmp_path):
+    path = str(tmp_path / "watch.npz")
+    t = PriceChangeTracker()
+    t.observe(_boot([(1, 90000, 0, 5.0, 60)]), ts=0)
+    t.save(path)
+
+    # price went up between polls: net transfers so far are spent
+    t = PriceChangeTracker.load(path)
+    t.observe(_boot([(1, 90000, 0, 5.0, 61)]), ts=60)
+    assert t.predict()["progress"][0] == 0.0
+
+
+def test_propose_transfers_prefers_rising_target_on_ties(tiny_league):
+    client = tiny_league.client
+    teams_by_id = {t["id"]: t for t in tiny_league.teams}
+    strength_means = compute_strength_means(tiny_league.teams)
+    # three GWs so the buy clears planner's minimum horizon xPts
+    fixtures = [dict(tiny_league.fixtures[0], id=9000 + gw, event=gw) for gw in (2, 3, 4)]
+    fixtures_idx = build_fixtures_index(fixtures)
+    gw_range = [2, 3, 4]
+
+    # A clone of AltFwd with the same projection; only the price outlook differs
+    bootstrap = dict(tiny_league.bootstrap)
+    clone = dict(next(e for e in tiny_league.elements if e["id"] == 203), id=204, web_name="AltFwd2")
+    bootstrap["elements"] = tiny_league.elements + [clone]
+    client._summaries[204] = client._summaries[203]
+
+    el = next(e for e in tiny_league.elements if e["id"] == 102)
+    weak = PlayerProj(el["id"], el["web_name"], 4, el["team"], 7.0, {2: 0.0, 3: 0.0, 4: 0.0}, 0.0, True)
+
+    kwargs = dict(bootstrap=bootstrap, current=[weak], bank_m=0.0, gw=2, gw_range=gw_range,
+                  client=client, fixtures_idx=fixtures_idx, team_by_id=teams_by_id,
+                  strength_means=strength_means, shortlist=10, max_swaps=1)
+    first = propose_transfers(**kwargs)
+    rising = propose_transfers(**kwargs, price_risk={204: 0.08})
+
+    assert first and first[0][1].id == 203
+    assert rising and rising[0][1].id == 204
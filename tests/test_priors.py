@@ -0,0 +1,80 @@
+# tests/test_priors.py
+import numpy as np
+
+import planner
+import priors
+from planner import build_fixtures_index, compute_strength_means, project_player_points_by_gw
+
+BASE = {1: 3.5, 2: 3.0, 3: 4.8, 4: 5.2}
+
+
+def _bootstrap(year="2025"):
+    elements = [
+        {"id": 1, "element_type": 2, "now_cost": 40},
+        {"id": 2, "element_type": 2, "now_cost": 45},
+        {"id": 3, "element_type": 2, "now_cost": 65},
+        {"id": 4, "element_type": 3, "now_cost": 120},
+    ]
+    return {"events": [{"id": 1, "deadline_time": f"{year}-08-15T17:30:00Z"}], "elements": elements}
+
+
+PAST = {
+    1: [{"season_name": "2024/25", "start_cost": 40, "total_points": 60, "minutes": 1800},
+        {"season_name": "2023/24", "start_cost": 40, "total_points": 5, "minutes": 100}],   # too few minutes
+    2: [{"season_name": "2024/25", "start_cost": 45, "total_points": 90, "minutes": 2700, "starts": 30}],
+    3: [{"season_name": "2024/25", "start_cost": 65, "total_points": 180, "minutes": 3150, "starts": 35}],
+    4: [{"season_name": "2024/25", "start_cost": 125, "total_points": 240, "minutes": 3000}],
+}
+
+
+def test_fit_matches_pooled_shrunk_rate_per_cell():
+    boot = _bootstrap()
+    rows = priors.ingest(boot["elements"], (({"history_past": PAST[e["id"]]}) for e in boot["elements"]))
+    assert len(rows["pos"]) == 5
+    tp = priors.fit_priors(rows, BASE, "2025/26")
+
+    k = priors.PRIOR_STRENGTH
+    # per appearance: no starts -> minutes / 85; starts + leftover minutes as 20-minute cameos
+    assert np.isclose(tp.lookup(2, 4.0), (60 + k * 3.0) / (1800 / 85 + k))   # tier 0: < £4.5m
+    assert np.isclose(tp.lookup(2, 4.5), (90 + k * 3.0) / (37.5 + k))        # tier 1: 30 + 150 / 20
+    assert np.isclose(tp.lookup(2, 6.5), (180 + k * 3.0) / (43.75 + k))      # top tier: 35 + 175 / 20
+    assert np.isclose(tp.lookup(2, 5.2), 3.0)                            # no evidence: baseline
+    assert tp.lookup(2, 6.5) > tp.lookup(2, 4.0)
+    assert np.allclose(tp.lookup_many(np.array([2, 3]), np.array([4.0, 12.0])),
+                       [tp.lookup(2, 4.0), tp.lookup(3, 12.0)])
+
+
+def test_store_is_reused_within_a_season_and_refit_for_a_new_one(tmp_path):
+    path = str(tmp_path / "priors.npz")
+    calls = []
+
+    def summary(eid):
+        calls.append(eid)
+        return {"history_past": PAST[eid]}
+
+    first = priors.load_or_fit(path, _bootstrap("2025"), summary, BASE)
+    assert len(calls) == 4 and first.season == "2025/26"
+    again = priors.load_or_fit(path, _bootstrap("2025"), summary, BASE)
+    assert len(calls) == 4
+    assert np.allclose(np.nan_to_num(again.table), np.nan_to_num(first.table))
+    priors.load_or_fit(path, _bootstrap("2026"), summary, BASE)
+    assert len(calls) == 8
+
+
+def test_projection_regresses_toward_price_tier_prior(tiny_league, monkeypatch):
+    teams_by_id = {t["id"]: t for t in tiny_league.teams}
+    means = compute_strength_means(tiny_league.teams)
+    idx = build_fixtures_index(tiny_league.fixtures)
+    cheap = next(e for e in tiny_league.elements if e["id"] == 101)       # £4.5m DEF
+    pricey = dict(cheap, now_cost=65)
+
+    flat = [project_player_points_by_gw(tiny_league.client, el, idx, [2], teams_by_id, means)[2]
+            for el in (cheap, pricey)]
+    assert flat[0] == flat[1]
+
+    table = np.full((5, 5), 3.0)
+    table[2, :5] = [2.0, 2.5, 3.0, 3.5, 6.0]
+    monkeypatch.setattr(planner, "TIER_PRIORS", priors.TierPriors("2025/26", priors.TIER_EDGES, table, table))
+    tiered = [project_player_points_by_gw(tiny_league.client, el, idx, [2], teams_by_id, means)[2]
+              for el in (cheap, pricey)]
+    assert tiered[1] > flat[1] > tiered[0]
@@ -0,0 +1,73 @@
+# tests/test_replay_server.py
+import json
+import os
+import time
+
+import pytest
+import requests
+
+from fpl_client import FPLClient
+from replay_server import Faults, ReplayServer
+
+
+@pytest.fixture()
+def snapshot(tmp_path):
+    def put(name, obj):
+        path = tmp_path / name
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_text(json.dumps(obj))
+
+    put("bootstrap-static.json", {"events": [{"id": 1}], "teams": [], "elements": [{"id": 7}]})
+    put("fixtures.json", [{"id": 1, "event": 1}, {"id": 2, "event": 2}])
+    put("entry.json", {"id": 42, "summary_overall_points": 100})
+    put("picks.json", {"picks": [{"element": 7, "position": 1}], "active_chip": None})
+    put("element_summaries/7.json", {"history": [{"minutes": 90, "total_points": 6}], "padding": "x" * 60000})
+    return str(tmp_path)
+
+
+def test_serves_client_url_shapes(snapshot):
+    with ReplayServer(snapshot) as srv:
+        c = FPLClient(base_url=srv.url)
+        assert c.bootstrap()["elements"] == [{"id": 7}]
+        assert [f["id"] for f in c.fixtures(event=2)] == [2]
+        assert c.entry(42)["id"] == 42
+        assert c.entry_picks(42, 1)["picks"][0]["element"] == 7
+        assert c.element_summary(7)["history"][0]["total_points"] == 6
+        assert c.my_team(42)["picks"][0]["element"] == 7
+        with pytest.raises(requests.HTTPError):
+            c.event_live(3)                            # no live/3.json in the snapshot
+        with pytest.raises(requests.HTTPError):
+            c.element_summary(8)                       # nor a made-up history for a missing summary
+        # one keep-alive connection for every request
+        assert srv.stats["connections"] == 1
+        assert srv.stats["requests"] == 8 and srv.stats["not_found"] == 2
+
+
+def test_injected_errors_are_retried(snapshot):
+    faults = Faults(error_rate=0.4, retry_after=0.01, seed=3)
+    with ReplayServer(snapshot, faults) as srv:
+        c = FPLClient(base_url=srv.url, retries=8, backoff=0.001)
+        for _ in range(20):
+            assert c.bootstrap()["events"] == [{"id": 1}]
+        assert srv.stats["errors"] > 0
+        assert srv.stats["requests"] == 20 + srv.stats["errors"]
+
+    faults = Faults(error_rate=1.0, error_codes=(503,))
+    with ReplayServer(snapshot, faults) as srv:
+        c = FPLClient(base_url=srv.url, retries=2, backoff=0.001)
+        with pytest.raises(requests.HTTPError):
+            c.bootstrap()
+        assert srv.stats["requests"] == 3
+
+
+def test_latency_and_bandwidth_shape_response_time(snapshot):
+    with ReplayServer(snapshot, Faults(latency=0.05, bandwidth=600000)) as srv:
+        c = FPLClient(base_url=srv.url)
+        t = time.perf_counter()
+        c.element_summary(7)                          # ~60 KB at 600 KB/s ≈ 0.1 s, plus latency
+        assert time.perf_counter() - t >= 0.14
+
+    with ReplayServer(snapshot, Faults(latency=2.0)) as srv:
+        c = FPLClient(base_url=srv.url, retries=0, timeout=0.2)
+        with pytest.raises(requests.Timeout):
+            c.entry(42)
@@ -0,0 +1,50 @@
+# tests/test_rotation.py
+import itertools
+
+import numpy as np
+
+from rotation import pair_points, rotation_pairs
+
+
+def test_pair_points_match_brute_force():
+    rng = np.random.default_rng(2)
+    x = rng.gamma(2.0, 1.5, size=(37, 6))
+    pts, plays = pair_points(x, block=8)
+    for i, j in itertools.combinations(range(len(x)), 2):
+        assert np.isclose(pts[i, j], np.maximum(x[i], x[j]).sum())
+        assert plays[i, j] == (x[i] >= x[j]).sum()
+
+
+def test_complementary_fixtures_win():
+    # 0 and 1 alternate good weeks; 2 is steady; 3 is better than 2 every week (no rotation)
+    x = np.array([
+        [6, 1, 6, 1, 6, 1],
+        [1, 6, 1, 6, 1, 6],
+        [3, 3, 3, 3, 3, 3],
+        [3.5, 3.5, 3.5, 3.5, 3.5, 3.5],
+    ], dtype=float)
+    ids = [10, 11, 12, 13]
+    pairs = rotation_pairs(ids, x, cost=[4.5, 4.5, 4.5, 4.5], team=[1, 2, 3, 4], by="points")
+    best = pairs[0]
+    assert (best.a, best.b) == (10, 11)
+    assert best.points == 36 and best.gain == 36 - 21
+    assert best.a_starts.tolist() == [True, False] * 3
+    # a starter + someone who never plays isn't a rotation
+    assert all({p.a, p.b} != {12, 13} for p in pairs)
+
+
+def test_price_weighting_and_constraints():
+    x = np.array([
+        [5, 1, 5, 1],
+        [1, 5, 1, 5],
+        [1, 5.5, 1, 5.5],
+    ], dtype=float)
+    ids, team = [1, 2, 3], [1, 2, 3]
+    cost = [4.0, 4.0, 6.0]
+    by_value = rotation_pairs(ids, x, cost, team, by="value")
+    by_points = rotation_pairs(ids, x, cost, team, by="points")
+    assert (by_value[0].a, by_value[0].b) == (1, 2)          # 20 pts for £8m
+    assert (by_points[0].a, by_points[0].b) == (1, 3)        # 21 pts for £10m
+    assert {(p.a, p.b) for p in rotation_pairs(ids, x, cost, team, max_cost=9.0)} == {(1, 2)}
+    assert rotation_pairs(ids, x, cost, [1, 1, 1]) == []     # one club
+    assert len(rotation_pairs(ids, x, cost, [1, 1, 1], distinct_clubs=False)) == 3
@@ -0,0 +1,89 @@
+# tests/test_scenarios.py
+import scenarios as sc
+from planner import PlayerProj, build_fixtures_index, compute_strength_means, propose_transfers
+
+XMAPS = {101: {2: 3.0}, 102: {2: 4.0}, 201: {2: 2.0}, 202: {2: 8.0}, 203: {2: 9.0}}
+
+
+def _ctx(tiny_league, xmaps=XMAPS):
+    els = {e["id"]: e for e in tiny_league.elements}
+
+    def proj(i):
+        e = els[i]
+        return PlayerProj(i, e["web_name"], e["element_type"], e["team"], e["now_cost"] / 10.0,
+                          xmaps[i], sum(xmaps[i].values()), True)
+
+    return dict(
+        bootstrap=tiny_league.bootstrap, current=[proj(101), proj(102)], bank_m=0.0, gw=2, gw_range=[2],
+        client=None, fixtures_idx=build_fixtures_index(tiny_league.fixtures),
+        team_by_id={t["id"]: t for t in tiny_league.teams},
+        strength_means=compute_strength_means(tiny_league.teams),
+        free_transfers=2, shortlist=5, max_swaps=2, xmaps=xmaps,
+    )
+
+
+def _pairs(moves):
+    return sorted((s.id, b.id) for s, b, *_ in moves)
+
+
+def test_resolve_players_and_clubs_by_name_or_id(tiny_league):
+    boot = tiny_league.bootstrap
+    assert sc.resolve_players(boot, ["hotstrk", 202, "999", "nobody"]) == [102, 202]
+    assert sc.resolve_clubs(boot, ["AWY", "home fc", 3]) == [2, 1]
+
+
+def test_lock_avoid_and_forced_sells_constrain_transfers(tiny_league):
+    ctx = _ctx(tiny_league)
+    assert _pairs(propose_transfers(**ctx)) == [(101, 202), (102, 203)]
+    assert _pairs(propose_transfers(**ctx, avoid=[203])) == [(101, 202)]
+    assert _pairs(propose_transfers(**ctx, locked=[101])) == [(102, 203)]
+    assert _pairs(propose_transfers(**ctx, avoid_clubs=[2])) == []
+
+    # a forced sale goes through even when the only replacement loses points
+    worse = {**XMAPS, 202: {2: 1.0}}
+    moves = propose_transfers(**_ctx(tiny_league, worse), force_sell=[101])
+    assert _pairs(moves) == [(101, 202), (102, 203)]
+    assert moves[0][0].id == 101 and moves[0][2] < 0
+
+
+def test_unmet_forced_sell_is_reported_and_buys_keep_p_play(tiny_league):
+    ctx = _ctx(tiny_league)
+    moves = propose_transfers(**ctx, p_play={202: {2: 0.5, 3: 0.9}})
+    assert {b.id: b.p_play for _, b, *_ in moves} == {202: 0.5, 203: 1.0}
+    assert [b.p_play_in(3) for _, b, *_ in moves] == [0.9, 1.0]
+
+    # every replacement for 101 is at the avoided club
+    res = sc.evaluate(sc.Scenario("stuck", avoid_clubs=[2], sell=[101]), propose_transfers, ctx)
+    assert res.moves == [] and [p.id for p in res.unmet] == [101]
+    assert "Unmet sell" in sc.render_side_by_side([res]) and "SolidDef" in sc.render_side_by_side([res])
+    assert sc.evaluate(sc.Scenario("ok", sell=[101]), propose_transfers, ctx).unmet == []
+
+
+POS = [1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4]
+SQUAD = [PlayerProj(i, f"P{i}", p, i, 5.0, {1: float(i % 7), 2: float(i % 5)}, 0.0, True) for i, p in enumerate(POS)]
+
+
+def _fake_plan(current, gw_range, locked, avoid, avoid_clubs, force_sell):
+    """Stand-in transfer search: each forced sale becomes a +3/GW same-position buy."""
+    moves = []
+    for k, pid in enumerate(force_sell):
+        sell = current[pid]
+        buy = PlayerProj(100 + pid, f"B{pid}", sell.pos, 99, 5.0,
+                         {gw: x + 3.0 for gw, x in sell.xpts_by_gw.items()}, 0.0, True)
+        moves.append((sell, buy, 6.0, 6.0 - 4 * k, k > 0))
+    return moves
+
+
+def test_scenarios_run_in_parallel_and_match_serial():
+    ctx = {"current": SQUAD, "gw_range": [1, 2]}
+    scens = [sc.Scenario("roll"), sc.Scenario("one", sell=[13]), sc.Scenario("two", sell=[13, 3])]
+    serial = sc.run_scenarios(scens, _fake_plan, ctx, workers=1)
+    parallel = sc.run_scenarios(scens, _fake_plan, ctx, workers=3)
+
+    assert [r.scenario.name for r in parallel] == ["roll", "one", "two"]
+    assert [(r.score, r.hits, r.net_gain) for r in parallel] == [(r.score, r.hits, r.net_gain) for r in serial]
+    assert parallel[1].xi_total > parallel[0].xi_total
+    assert parallel[2].hits == 4
+
+    table = sc.render_side_by_side(parallel)
+    assert "P13 -> B13" in table and "roll" in table
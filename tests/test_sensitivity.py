@@ -0,0 +1,99 @@
+# tests/test_sensitivity.py
+import numpy as np
+
+import models
+import sensitivity
+from features import project_features
+from planner import PlayerProj
+
+
+def _features():
+    rppa = np.array([6.0, 2.0, 3.0, 1.0])
+    prior = np.array([3.0, 4.0, 3.0, 5.0])
+    ms = np.array([1.0, 0.9, 0.5, 1.0])
+    S = np.array([[[1.1, 0.0], [0.9, 0.0]],
+                  [[1.0, 1.2], [0.0, 0.0]],        # DGW then blank
+                  [[0.8, 0.0], [1.0, 0.0]],
+                  [[1.0, 0.0], [1.0, 0.0]]])
+    mask = S > 0
+    return rppa, prior, ms, S, mask
+
+
+def test_batched_projection_matches_scalar_formula():
+    rppa, prior, ms, S, mask = _features()
+    regs, mbs = np.array([0.0, 0.5, 1.0]), np.array([0.0, 2.0, 3.0])
+    grid = project_features(rppa, prior, ms, S, mask, regs, mbs)
+    assert grid.shape == (3, 4, 2)
+    for k, (r, mb) in enumerate(zip(regs, mbs)):
+        single = project_features(rppa, prior, ms, S, mask, r, mb)
+        assert single.shape == (4, 2)
+        assert np.allclose(grid[k], single)
+        for p in range(4):
+            base = (1 - r) * rppa[p] + r * prior[p]
+            for g in range(2):
+                expect = sum(max(base * ms[p] * s, mb) for s, m in zip(S[p, g], mask[p, g]) if m)
+                assert np.isclose(single[p, g], expect)
+
+
+def _model_features(rppa, prior, gws=2):
+    """models.Features with recent points per appearance `rppa` (one 90-minute match each), one fixture per GW."""
+    n = len(rppa)
+    points, minutes = np.zeros((n, models.RECENT_N)), np.zeros((n, models.RECENT_N))
+    points[:, -1], minutes[:, -1] = rppa, 90
+    ones = np.ones((n, gws))
+    return models.Features(id=np.arange(1, n + 1), pos=np.full(n, 2), gw=np.arange(1, gws + 1),
+                           points=points, minutes=minutes, form=np.ones(n), avail=ones, ms=ones, p60=ones,
+                           p_play=ones, prior=np.asarray(prior, dtype=float), S=np.ones((n, gws, 1)),
+                           mask=np.ones((n, gws, 1), dtype=bool), fdr=np.full((n, gws, 1), 3.0))
+
+
+def test_grid_rebuilds_the_configured_models(monkeypatch):
+    f = _model_features(np.array([1.0, 4.0, 6.0]), [2.0, 2.0, 2.0])
+    regs, mbs = [0.0, 1.0], [0.0, 0.0]
+    evaluated = []
+    evaluate = models.evaluate
+    monkeypatch.setattr(models, "evaluate", lambda ms, *a: evaluated.extend(ms) or evaluate(ms, *a))
+    grid = sensitivity.grid_xpts(f, {"regression": 1.0, "form": 1.0}, regs, mbs, workers=1)
+    assert grid.shape == (2, 3, 2) and [m.name for m in evaluated] == ["regression", "form"]   # one call each
+    form = models.build("form")[0][0].project(f)
+    for k, (r, mb) in enumerate(zip(regs, mbs)):
+        reg = models.build("regression", regression=r, min_baseline=mb)[0][0].project(f)
+        assert np.allclose(grid[k], (reg + form) / 2)
+
+
+def test_grid_finds_where_the_best_move_flips():
+    # squad: ids 1 (DEF) and 2 (MID); market: 3 (DEF, form player), 4 (DEF, strong prior)
+    rppa = np.array([1.0, 4.0, 6.0, 1.0])
+    prior = np.array([1.0, 4.0, 2.0, 6.0])
+    table = {"id": np.array([1, 2, 3, 4]), "features": _model_features(rppa, prior)}
+    elements = {1: {"element_type": 2, "team": 1, "now_cost": 45}, 2: {"element_type": 3, "team": 1, "now_cost": 60},
+                3: {"element_type": 2, "team": 2, "now_cost": 45}, 4: {"element_type": 2, "team": 3, "now_cost": 45}}
+    squad = [PlayerProj(1, "Out", 2, 1, 4.5, {}, 0.0, True), PlayerProj(2, "Mid", 3, 1, 6.0, {}, 0.0, True)]
+    buy3 = PlayerProj(3, "Form", 2, 2, 4.5, {}, 0.0, True)
+
+    res = sensitivity.run_grid(table, elements, squad, 0.0, [(squad[0], buy3, 0, 0, False)],
+                               regression=[0.0, 0.5, 1.0], min_baseline=[0.0], hit_penalty=[4],
+                               free_transfers=1, min_raw_gain=2.0, min_net_gain=0.5)
+    # form player wins when recent form dominates, prior player when the prior does
+    assert res.best_buy[:, 0].tolist() == [3, 3, 4]
+    assert (res.best_sell == 1).all()
+    assert np.allclose(res.move_gain[0, :, 0], [10.0, 6.0, 2.0])
+    assert res.move_holds[0, 0, :, 0].tolist() == [True, True, True]
+
+    res = sensitivity.run_grid(table, elements, squad, 0.0, [(squad[0], buy3, 0, 0, False)],
+                               regression=[0.0, 1.0], min_baseline=[0.0], hit_penalty=[4],
+                               free_transfers=0, min_raw_gain=2.0, min_net_gain=0.5)
+    assert res.move_holds[0, 0, :, 0].tolist() == [True, False]   # a -4 only pays if form is real
+    out = sensitivity.render(res, {1: "Out", 3: "Form", 4: "Prior"}, [(squad[0], buy3, 0, 0, True)], 0)
+    assert "flips inside the grid" in out and "hit -4: 1/2" in out
+
+
+def test_legal_swaps_respect_budget_clubs_and_lists():
+    table = {"id": np.array([1, 2, 3, 4, 5])}
+    elements = {1: {"element_type": 2, "team": 1, "now_cost": 45}, 2: {"element_type": 2, "team": 1, "now_cost": 50},
+                3: {"element_type": 2, "team": 1, "now_cost": 45}, 4: {"element_type": 2, "team": 2, "now_cost": 60},
+                5: {"element_type": 2, "team": 3, "now_cost": 45}}
+    squad = [PlayerProj(i, str(i), 2, 1, elements[i]["now_cost"] / 10, {}, 0.0, True) for i in (1, 2, 3)]
+    sell, buy, legal = sensitivity.legal_swaps(table, elements, squad, bank=1.0, avoid_clubs=[3])
+    assert buy.tolist() == [3, 4]                        # rows of ids 4 and 5
+    assert legal.tolist() == [[False, False], [True, False], [False, False]]
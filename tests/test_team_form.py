@@ -0,0 +1,87 @@
+# tests/test_team_form.py
+import numpy as np
+
+import team_form
+from history import pack_summary
+from team_form import aggregate, fit, load_or_update
+
+TEAMS = [{"id": t, "short_name": f"T{t}", "strength_attack_home": 1200, "strength_attack_away": 1180,
+          "strength_defence_home": 1210, "strength_defence_away": 1190} for t in range(1, 5)]
+
+
+def _season(rounds, attack, defence=None):
+    """Round robin (venues swap each cycle) where t scores 1.4 * attack[t] / defence[opp]; goals = xG."""
+    defence = defence or {t: 1.0 for t in attack}
+    pairs = [(1, 2), (3, 4), (1, 3), (2, 4), (1, 4), (2, 3)]
+    fixtures, hist = [], {t: [] for t in attack}
+    for g in range(1, rounds + 1):
+        for h, a in pairs[(g - 1) * 2 % 6:(g - 1) * 2 % 6 + 2]:
+            if (g - 1) // 3 % 2:
+                h, a = a, h
+            fid = len(fixtures) + 1
+            fixtures.append({"id": fid, "event": g, "team_h": h, "team_a": a, "finished": True})
+            for t, o, home in ((h, a, True), (a, h, False)):
+                x = 1.4 * attack[t] / defence[o]
+                hist[t].append({"fixture": fid, "round": g, "was_home": home, "minutes": 90,
+                                "goals_scored": x, "expected_goals": f"{x:.4f}"})
+    return fixtures, hist
+
+
+def test_group_by_matches_per_fixture_sums():
+    fixtures = [{"id": 7, "event": 1, "team_h": 1, "team_a": 2, "finished": True},
+                {"id": 8, "event": 1, "team_h": 3, "team_a": 4, "finished": True, "team_h_score": 3, "team_a_score": 1},
+                {"id": 9, "event": 2, "team_h": 1, "team_a": 3, "finished": False}]
+    hists = [
+        [{"fixture": 7, "was_home": True, "minutes": 90, "goals_scored": 1, "expected_goals": "0.80"},
+         {"fixture": 9, "was_home": True, "minutes": 0, "goals_scored": 0}],
+        [{"fixture": 7, "was_home": True, "minutes": 30, "goals_scored": 1, "expected_goals": "0.40"}],
+        [{"fixture": 7, "was_home": False, "minutes": 90, "goals_scored": 0, "expected_goals": "0.30"},
+         {"fixture": 8, "was_home": False, "minutes": 0, "goals_scored": 0, "expected_goals": "0.90"}],
+    ]
+    packed = [pack_summary({"history": h}, team_form.FIELDS)["history"] for h in hists]
+    for rows in (aggregate(hists, fixtures), aggregate(packed, fixtures)):
+        assert rows["fixture"].tolist() == [7, 7, 8, 8]
+        assert rows["team"].tolist() == [1, 2, 3, 4] and rows["opp"].tolist() == [2, 1, 4, 3]
+        assert rows["goals"].tolist() == [2, 0, 3, 1]                  # fixture 8 from its score
+        assert np.allclose(rows["xg"][:2], [1.2, 0.3])
+        assert np.isnan(rows["xg"][2:]).all()                          # nobody with minutes in 8
+
+
+def test_fit_ranks_by_form_and_moves_strengths():
+    true_att, true_def = {1: 1.6, 2: 1.0, 3: 0.9, 4: 0.6}, {1: 1.5, 2: 0.8, 3: 1.0, 4: 0.9}
+    fixtures, hist = _season(12, true_att, true_def)
+    form = fit(aggregate(hist.values(), fixtures), TEAMS)
+    # opponent-adjusted: the order of the ratings that generated the goals comes back
+    assert np.argsort(form.attack).tolist() == [3, 2, 1, 0]
+    assert np.argsort(form.defence).tolist() == [1, 3, 2, 0]
+    rated = {t["id"]: t for t in form.apply(TEAMS)}
+    assert rated[1]["strength_attack_home"] > TEAMS[0]["strength_attack_home"]
+    assert rated[4]["strength_attack_away"] < TEAMS[3]["strength_attack_away"]
+    assert rated[1]["short_name"] == "T1" and TEAMS[0]["strength_attack_home"] == 1200   # copies
+    # no evidence: the static ratings stand
+    blank = fit(team_form._empty(), TEAMS).apply(TEAMS)
+    assert [t["strength_attack_home"] for t in blank] == [1200] * 4
+
+
+def test_store_only_adds_newly_finished_fixtures(tmp_path):
+    path = str(tmp_path / "form.npz")
+    fixtures, hist = _season(4, {1: 2, 2: 1, 3: 1, 4: 1})
+    for f in fixtures:
+        f["finished"] = f["event"] <= 3
+    calls = []
+
+    def histories():
+        calls.append(1)
+        return list(hist.values())
+
+    load_or_update(path, fixtures, TEAMS, histories)
+    assert len(team_form.load(path)[0]["fixture"]) == 12 and len(calls) == 1
+    load_or_update(path, fixtures, TEAMS, histories)                # nothing new: no history pass
+    assert len(calls) == 1
+    for f in fixtures:
+        f["finished"] = True
+    full = load_or_update(path, fixtures, TEAMS, histories)
+    store, seen = team_form.load(path)
+    assert len(calls) == 2 and len(store["fixture"]) == 16 and len(seen) == 8
+    again = fit(aggregate(hist.values(), fixtures), TEAMS)
+    assert np.allclose(full.attack, again.attack) and np.allclose(full.defence, again.defence)
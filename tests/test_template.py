@@ -0,0 +1,82 @@
+# tests/test_template.py
+import multiprocessing as mp
+import time
+
+import requests
+
+from template import TemplateQueue, differentials, load, work
+
+
+def _picks(*elements, captain=None, bench=()):
+    return [{"element": e, "multiplier": 0 if e in bench else (2 if e == captain else 1),
+             "is_captain": e == captain} for e in elements]
+
+
+class FakeClient:
+    def __init__(self, squads, missing=()):
+        self.squads, self.missing, self.calls = squads, set(missing), 0
+
+    def entry_picks(self, entry, event):
+        self.calls += 1
+        if entry in self.missing:
+            resp = requests.Response()
+            resp.status_code = 404
+            raise requests.HTTPError(response=resp)
+        return {"picks": self.squads[entry]}
+
+
+def test_lost_lease_is_not_counted_twice(tmp_path):
+    q = TemplateQueue(str(tmp_path / "t.sqlite"), lease=0.05)
+    assert q.seed(5, [(101, 1), (102, 2)]) == 2
+    assert q.claim("a", 1) == [101]
+    time.sleep(0.1)                                  # a's lease runs out
+    assert q.claim("b", 5) == [101, 102]
+    assert q.complete("b", 101, _picks(1, 2, captain=1))
+    assert not q.complete("a", 101, _picks(1, 2, captain=1))   # late, discarded
+    q.fail("b", 102, permanent=True)
+    assert q.progress() == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+    t = q.ownership()
+    assert t.n == 1 and t.eo_of(1) == 2.0 and t.own_of(2) == 1.0
+
+    assert q.seed(6, [(101, 1)]) == 1                # new GW: fresh sample
+    assert q.ownership().n == 0 and q.progress()["pending"] == 1
+
+
+def _drain(path, squads, out):
+    out.put(work(TemplateQueue(path), FakeClient(squads), threads=2, batch=3))
+
+
+def test_workers_across_processes_count_each_entry_once(tmp_path):
+    path = str(tmp_path / "t.sqlite")
+    squads = {e: _picks(e % 3, 10, 11, captain=10, bench=(11,)) for e in range(1, 41)}
+    TemplateQueue(path).seed(7, [(e, e) for e in squads])
+    ctx = mp.get_context("fork")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=_drain, args=(path, squads, out)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    counted = sum(out.get(timeout=30) for _ in procs)
+    for p in procs:
+        p.join()
+
+    t = load(path)
+    assert counted == t.n == 40
+    assert t.own_of(10) == 1.0 and t.eo_of(10) == 2.0
+    assert t.own_of(11) == 1.0 and t.eo_of(11) == 0.0 and t.start[list(t.element).index(11)] == 0.0
+    assert abs(t.own_of(0) - 13 / 40) < 1e-9
+
+
+def test_missing_entry_fails_once_and_differentials(tmp_path):
+    path = str(tmp_path / "t.sqlite")
+    assert load(path) is None
+    q = TemplateQueue(path)
+    q.seed(3, [(1, 1), (2, 2), (3, 3)])
+    client = FakeClient({1: _picks(7, 8, captain=7), 2: _picks(7, 9, captain=7)}, missing={3})
+    assert work(q, client, threads=1) == 2
+    assert client.calls == 3 and q.progress()["failed"] == 1   # the 404 is not retried
+
+    t = load(path)
+    assert t.eo_of(7) == 2.0 and t.eo_of(8) == 0.5
+    yours, threats = differentials(t, {7: 6.0, 8: 4.0, 9: 5.0, 20: 9.0}, squad_ids=[8, 20], top=3)
+    assert [e for e, _, _ in yours] == [20, 8]       # 9 * (1 - 0), 4 * (1 - 0.5)
+    assert [e for e, _, _ in threats] == [7, 9]      # 6 * 2, 5 * 0.5
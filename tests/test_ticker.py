@@ -0,0 +1,71 @@
+# tests/test_ticker.py
+import numpy as np
+
+import ticker
+from planner import compute_strength_means, fixture_strength_scalar
+
+TEAMS = [
+    {"id": t, "short_name": f"T{t}", "strength_attack_home": 1000 + 60 * t, "strength_attack_away": 980 + 60 * t,
+     "strength_defence_home": 1010 + 50 * t, "strength_defence_away": 990 + 50 * t}
+    for t in range(1, 7)
+]
+
+
+def _fixtures():
+    rng = np.random.default_rng(5)
+    out, fid = [], 1
+    for gw in range(1, 13):
+        order = rng.permutation(6) + 1
+        pairs = [(order[0], order[1]), (order[2], order[3]), (order[4], order[5])]
+        if gw == 4:
+            pairs = pairs[:2]                      # blank for two clubs
+        if gw == 7:
+            pairs.append((order[1], order[0]))     # DGW for two clubs
+        for h, a in pairs:
+            out.append({"id": fid, "event": gw, "team_h": int(h), "team_a": int(a)})
+            fid += 1
+    return out
+
+
+def _ticker():
+    teams_by_id = {t["id"]: t for t in TEAMS}
+    means = compute_strength_means(TEAMS)
+    fn = lambda f, p: fixture_strength_scalar(f, p, teams_by_id, means)
+    return ticker.build_ticker(_fixtures(), list(teams_by_id), range(1, 13), fn), fn
+
+
+def _brute(fixtures, fn, team, gws, pos):
+    return sum(fn(f, {"team": team, "element_type": pos}) for f in fixtures
+               if f["event"] in gws and team in (f["team_h"], f["team_a"]))
+
+
+def test_windows_match_per_fixture_sums_including_blanks_and_doubles():
+    t, fn = _ticker()
+    fixtures = _fixtures()
+    assert t.counts[:, 3].sum() == 4 and t.counts[:, 6].max() == 2
+    for start, n in ((1, 3), (4, 1), (6, 4), (10, 5)):
+        gws = set(range(start, start + n))
+        att, dfn = t.window(start, n, "attack"), t.window(start, n, "defence")
+        for k, team in enumerate(t.team_ids):
+            assert np.isclose(att[k], _brute(fixtures, fn, int(team), gws, 4))
+            assert np.isclose(dfn[k], _brute(fixtures, fn, int(team), gws, 2))
+        ranked = t.ranked(start, n, "attack")
+        assert [s for _, s in ranked] == sorted(att.tolist(), reverse=True)
+
+
+def test_best_runs_match_scanning_every_start():
+    t, _ = _ticker()
+    for n in (1, 3, 5):
+        best, start = t.best_runs(n, "overall", from_gw=2)
+        for k in range(len(t.team_ids)):
+            scans = {g: t.window(g, n, "overall")[k] for g in range(2, 12 - n + 2)}
+            g_best = max(scans, key=scans.get)
+            assert np.isclose(best[k], scans[g_best]) and start[k] == g_best
+
+
+def test_render_lists_every_club_with_opponents():
+    t, _ = _ticker()
+    out = ticker.render(t, 6, 3, "defence", {tm["id"]: tm["short_name"] for tm in TEAMS})
+    lines = out.splitlines()
+    assert len(lines) == 1 + 6 and "GW6" in lines[0] and "GW8" in lines[0]
+    assert any("/" in line for line in lines[1:])          # the GW7 double
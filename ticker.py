@@ -0,0 +1,124 @@
+"""
+Fixture ticker: clubs ranked by their upcoming run.
+
+Every fixture is scored once with fixture_strength_scalar semantics, from
+both sides and for both unit types:
+
+  attack   how kind the opponent's defence is to this club's attackers
+  defence  how kind the opponent's attack is to this club's GK/DEF
+
+and summed into team x GW matrices (DGWs add up, blanks score 0). Prefix
+sums along the GW axis make any window O(1):
+
+  run(t, g, n) = prefix[t, g + n] - prefix[t, g]
+
+so "best N-GW run starting at GW g" for every club, or every club's best
+start anywhere in the season, is a handful of array ops.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+KINDS = ("attack", "defence", "overall")
+
+
+@dataclass
+class Ticker:
+    team_ids: np.ndarray          # (T,)
+    events: np.ndarray            # (E,) GW ids, ascending
+    attack: np.ndarray            # (T, E)
+    defence: np.ndarray           # (T, E)
+    counts: np.ndarray            # (T, E) fixtures per GW
+    opponents: Dict[Tuple[int, int], List[Tuple[int, bool]]]   # (team, gw) -> [(opp, home)]
+
+    def __post_init__(self):
+        self._prefix = {}
+        for kind in KINDS:
+            m = self.matrix(kind)
+            self._prefix[kind] = np.concatenate([np.zeros((len(m), 1)), np.cumsum(m, axis=1)], axis=1)
+        self._col = {int(e): k for k, e in enumerate(self.events)}
+
+    def matrix(self, kind: str) -> np.ndarray:
+        if kind == "attack":
+            return self.attack
+        if kind == "defence":
+            return self.defence
+        return 0.5 * (self.attack + self.defence)
+
+    def window(self, start_gw: int, n: int, kind: str = "overall") -> np.ndarray:
+        """Every club's summed scalar over GWs [start_gw, start_gw + n) — O(1) per club."""
+        s = self._col[start_gw]
+        e = min(s + n, len(self.events))
+        p = self._prefix[kind]
+        return p[:, e] - p[:, s]
+
+    def best_runs(self, n: int, kind: str = "overall", from_gw: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(best window score, its starting GW) per club over every n-GW window from from_gw on."""
+        p = self._prefix[kind]
+        s0 = self._col[from_gw] if from_gw is not None else 0
+        n = min(n, len(self.events) - s0)
+        sums = p[:, s0 + n:] - p[:, s0:len(self.events) - n + 1]
+        k = sums.argmax(1)
+        return sums[np.arange(len(sums)), k], self.events[s0 + k]
+
+    def ranked(self, start_gw: int, n: int, kind: str = "overall") -> List[Tuple[int, float]]:
+        scores = self.window(start_gw, n, kind)
+        order = np.argsort(-scores, kind="stable")
+        return [(int(self.team_ids[i]), float(scores[i])) for i in order]
+
+
+def build_ticker(fixtures: Sequence[Dict[str, Any]], team_ids: Sequence[int], events: Sequence[int],
+                 scalar_fn: Callable[[Dict[str, Any], Dict[str, Any]], float]) -> Ticker:
+    """
+    scalar_fn(fixture, player) is fixture_strength_scalar with teams/means
+    bound; it is asked about a stand-in FWD (attack) and DEF (defence) of each side.
+    """
+    team_ids = np.asarray(sorted(team_ids))
+    events = np.asarray(sorted(events))
+    row = {int(t): k for k, t in enumerate(team_ids)}
+    col = {int(e): k for k, e in enumerate(events)}
+    shape = (len(team_ids), len(events))
+    attack, defence, counts = np.zeros(shape), np.zeros(shape), np.zeros(shape, dtype=np.int64)
+    opponents: Dict[Tuple[int, int], List[Tuple[int, bool]]] = {}
+    for f in fixtures:
+        ev = f.get("event")
+        if ev not in col:
+            continue
+        for side, opp, home in ((f["team_h"], f["team_a"], True), (f["team_a"], f["team_h"], False)):
+            if side not in row:
+                continue
+            r, c = row[side], col[ev]
+            attack[r, c] += scalar_fn(f, {"team": side, "element_type": 4})
+            defence[r, c] += scalar_fn(f, {"team": side, "element_type": 2})
+            counts[r, c] += 1
+            opponents.setdefault((side, ev), []).append((opp, home))
+    return Ticker(team_ids, events, attack, defence, counts, opponents)
+
+
+def render(t: Ticker, start_gw: int, n: int, kind: str, short: Dict[int, str]) -> str:
+    """Ranked clubs for the window with attack/defence/overall scores and opponents per GW."""
+    cols = [int(e) for e in t.events if start_gw <= e < start_gw + n]
+    att, dfn, ovr = (t.window(start_gw, n, k) for k in KINDS)
+    best, best_gw = t.best_runs(n, kind, from_gw=start_gw)
+    score = {"attack": att, "defence": dfn, "overall": ovr}[kind]
+    order = np.argsort(-score, kind="stable")
+
+    cells = {}
+    for i in order:
+        tid = int(t.team_ids[i])
+        for g in cols:
+            opp = t.opponents.get((tid, g), [])
+            cells[tid, g] = "/".join(f"{short.get(o, o)}({'H' if h else 'A'})" for o, h in opp) or "-"
+    w = max([len(c) for c in cells.values()] + [6]) + 2
+
+    head = f"{'#':>3}  {'Club':<5} {'Att':>6} {'Def':>6} {'All':>6}  {'Best run':>12}  "
+    head += "".join(f"{'GW' + str(g):<{w}}" for g in cols)
+    lines = [head]
+    for rank, i in enumerate(order, start=1):
+        tid = int(t.team_ids[i])
+        lines.append(
+            f"{rank:>3}  {short.get(tid, tid):<5} {att[i]:>6.2f} {dfn[i]:>6.2f} {ovr[i]:>6.2f}  "
+            f"{'GW' + str(best_gw[i]):>6} {best[i]:>5.2f}  " + "".join(f"{cells[tid, g]:<{w}}" for g in cols)
+        )
+    return "\n".join(line.rstrip() for line in lines)